@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.sql import func
 
 from database.database import Base
@@ -14,7 +14,15 @@ class ScanJob(Base):
     status = Column(String, nullable=False, default="QUEUED", index=True)
     filename = Column(String, nullable=False)
     file_type = Column(String, nullable=False)
+    tier = Column(String, nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     error_message = Column(String, nullable=True)
+    payload_json = Column(Text, nullable=True)
+    lease_owner = Column(String, nullable=True, index=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    progress_json = Column(Text, nullable=True)
+    cancel_requested_at = Column(DateTime(timezone=True), nullable=True)
@@ -27,6 +27,8 @@ from sklearn.model_selection import cross_val_score
 import matplotlib.pyplot as plt
 import os
 
+from models.pii_features import FEATURE_COLUMNS, ensure_model_feature_schema, extract_column_features
+
 
 def evaluate_model(y_true, y_pred):
     """Calculate and print basic evaluation metrics"""
@@ -79,10 +81,20 @@ def cross_validate_model(model, X, y, cv=5):
     return scores
 
 
-# Dummy test values
-y_test = [0, 1, 0, 1, 1]  # replace with actual test result labels
-y_pred = [0, 1, 0, 0, 1]  # replace with model predictions
+def evaluate_column_dataset(model, column_df: pd.DataFrame):
+    """Score a trained model on a labelled column dataset using the shared feature module"""
+    ensure_model_feature_schema(model)
+    features = extract_column_features(column_df)
+    y_true = column_df["pii"].map({"yes": 0, "no": 1})
+    y_pred = model.predict(features[FEATURE_COLUMNS])
+    return evaluate_model(y_true, y_pred)
+
+
+if __name__ == "__main__":
+    # Dummy test values
+    y_test = [0, 1, 0, 1, 1]  # replace with actual test result labels
+    y_pred = [0, 1, 0, 0, 1]  # replace with model predictions
 
-# Calculate metrics and plot confusion matrix
-evaluate_model(y_test, y_pred)
-plot_confusion_matrix(y_test, y_pred)
+    # Calculate metrics and plot confusion matrix
+    evaluate_model(y_test, y_pred)
+    plot_confusion_matrix(y_test, y_pred)
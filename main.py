@@ -1,7 +1,7 @@
 import logging
 import uuid
 from logging.handlers import RotatingFileHandler
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import Depends, FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -26,7 +26,9 @@ from routers.scans import router as scans_router
 from database.models.company import Company  # noqa: F401
 from database.models.user import User 
 
+from dependencies.tier_guard import require_company_admin
 import services.startup_validation as startup_validation
+from services.prediction_batcher import get_prediction_batch_stats
 from services.request_context import (
     ProductionHTTPSMiddleware,
     RequestContextMiddleware,
@@ -86,8 +88,11 @@ def _initialize_application_state(app: FastAPI):
     startup_validation._validate_assets()
     model = startup_validation._validate_model_loading()
     startup_validation._validate_pdf_support()
+    startup_validation._validate_columnar_support()
     logger.info("Startup validation completed successfully.")
-    app.state.pii_model = model
+    # Scans resolve the active model from the scan service registry so a hot-swapped artifact is
+    # picked up without a restart; app.state.pii_model remains only as an explicit override.
+    app.state.pii_model = None
     return model
 
 
@@ -220,6 +225,11 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics/prediction-batches")
+def prediction_batch_metrics(current_user: dict = Depends(require_company_admin)):
+    return get_prediction_batch_stats()
+
+
 @app.get("/ready")
 def ready():
     try:
@@ -0,0 +1,38 @@
+"""add durable queue payload and lease columns to scan jobs
+
+Revision ID: 20260318_0008_scan_job_queue
+Revises: 20260314_0007_test_execution_runs
+Create Date: 2026-03-18 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260318_0008_scan_job_queue"
+down_revision = "20260314_0007_test_execution_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("scan_jobs", recreate="always") as batch_op:
+        batch_op.add_column(sa.Column("payload_json", sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column("lease_owner", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+        batch_op.create_index("ix_scan_jobs_lease_owner", ["lease_owner"])
+        batch_op.create_index("ix_scan_jobs_lease_expires_at", ["lease_expires_at"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("scan_jobs", recreate="always") as batch_op:
+        batch_op.drop_index("ix_scan_jobs_lease_expires_at")
+        batch_op.drop_index("ix_scan_jobs_lease_owner")
+        batch_op.drop_column("attempts")
+        batch_op.drop_column("heartbeat_at")
+        batch_op.drop_column("lease_expires_at")
+        batch_op.drop_column("lease_owner")
+        batch_op.drop_column("payload_json")
@@ -0,0 +1,28 @@
+"""record the submitting tier on scan jobs for fair-share scheduling
+
+Revision ID: 20260320_0009_scan_job_tier
+Revises: 20260318_0008_scan_job_queue
+Create Date: 2026-03-20 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260320_0009_scan_job_tier"
+down_revision = "20260318_0008_scan_job_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("scan_jobs", recreate="always") as batch_op:
+        batch_op.add_column(sa.Column("tier", sa.String(), nullable=True))
+        batch_op.create_index("ix_scan_jobs_tier", ["tier"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("scan_jobs", recreate="always") as batch_op:
+        batch_op.drop_index("ix_scan_jobs_tier")
+        batch_op.drop_column("tier")
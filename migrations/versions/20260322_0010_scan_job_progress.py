@@ -0,0 +1,26 @@
+"""store the latest progress snapshot on scan jobs
+
+Revision ID: 20260322_0010_scan_job_progress
+Revises: 20260320_0009_scan_job_tier
+Create Date: 2026-03-22 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260322_0010_scan_job_progress"
+down_revision = "20260320_0009_scan_job_tier"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("scan_jobs", recreate="always") as batch_op:
+        batch_op.add_column(sa.Column("progress_json", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("scan_jobs", recreate="always") as batch_op:
+        batch_op.drop_column("progress_json")
@@ -0,0 +1,26 @@
+"""record cancellation requests on scan jobs
+
+Revision ID: 20260324_0011_scan_job_cancellation
+Revises: 20260322_0010_scan_job_progress
+Create Date: 2026-03-24 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260324_0011_scan_job_cancellation"
+down_revision = "20260322_0010_scan_job_progress"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("scan_jobs", recreate="always") as batch_op:
+        batch_op.add_column(sa.Column("cancel_requested_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("scan_jobs", recreate="always") as batch_op:
+        batch_op.drop_column("cancel_requested_at")
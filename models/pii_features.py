@@ -14,33 +14,336 @@
 # Bo.k.harris@gmail.com
 # ──────────────────────────────────────────────────────────────────────
 
-import pandas as pd
-import numpy as np
-import re
+"""Column-level features shared by model training, evaluation and scan-time inference.
+
+Every model feature is computed here from one registry of compiled patterns and keyword
+dictionaries. ``feature_schema()`` fingerprints that registry; the fingerprint is
+stamped onto trained boosters so inference can refuse an artifact whose features
+were computed differently.
+
+The model features reproduce exactly what ``models/xgboost_model.pkl`` was trained on
+(dictionaries, regexes and match modes). Change them only together with a retrain.
+The explainable detection signals used by the scan service may match more loosely;
+they are not model inputs.
+"""
+
 import ast
+import hashlib
+import json
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.pii_patterns import EMAIL_RE, IP_RE, PHONE_RE, SSN_RE
+
+logger = logging.getLogger(__name__)
+
+FEATURE_SCHEMA_VERSION = 3
+FEATURE_SCHEMA_ATTR = "pii_feature_schema"
+FEATURE_COLUMNS = [
+    "length",
+    "num_underscores",
+    "num_digits",
+    "has_at",
+    "has_email_keyword",
+    "pct_email_like",
+    "pct_phone_like",
+    "pct_ssn_like",
+    "pct_ip_like",
+    "avg_digits_per_val",
+    "avg_val_len",
+    "has_dob_pattern",
+    "has_gender_term",
+    "has_street_suffix",
+    "has_city_name",
+    "has_known_name",
+    "has_zip_pattern",
+    "has_phone_pattern",
+]
+
+DOB_RE = re.compile(r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})|(\d{4}[/-]\d{1,2}[/-]\d{1,2})")
+ZIP_CODE_RE = re.compile(r"\b\d{5}(?:-\d{4})?\b")
+
+GENDER_TERMS = frozenset(
+    {
+        "abimegender", "adamasgender", "agender", "agenderfluid", "agenderflux", "alexigender",
+        "aliusgender", "amaregender", "ambigender", "ambonec", "amicagender", "androgyne", "androgynous",
+        "anesigender", "angenital", "anogender", "anongender", "antegender", "anxiegender", "apagender",
+        "apconsugender", "aporagender", "astergender", "astralgender", "autigender", "autogender",
+        "axigender", "bakla", "bigender", "binary", "biogender", "blurgender", "boyflux",
+        "burstgender", "calabai", "calalai", "cassflux", "cassgender", "cavusgender", "cendgender",
+        "ceterofluid", "ceterogender", "cis female", "cis male", "cis man", "cis woman", "cisgender",
+        "cloudgender", "collgender", "colorgender", "commogender", "condigender", "deliciagender",
+        "demiboy", "demifluid", "demiflux", "demigender", "demigirl", "demiguy", "demiman", "demiwoman",
+        "domgender", "duragender", "egogender", "epicene", "esspigender", "exgender", "existigender",
+        "fa'afafine", "female", "female to male", "femfluid", "femgender", "femme", "fluidflux", "ftm",
+        "gemigender", "gender bender", "gender blank", "gender gifted", "gender neutral",
+        "gender nonconforming", "gender questioning", "gender variant", "gender witched", "genderflow",
+        "genderfluid", "genderfuzz", "genderless", "genderpuck", "genderqueer", "girlflux",
+        "graygender", "healgender", "hijra", "intergender", "intersex", "ipsogender", "kathoey", "male",
+        "male to female", "man", "man of trans experience", "maverique", "meta-gender", "mirrorgender",
+        "mtf", "muxe", "māhū", "neutrois", "non-binary", "non-binary transgender", "nonbinary", "nullo",
+        "omnigender", "other", "pangender", "person of transgendered experience", "polyagender",
+        "polygender", "queer", "questioning", "sekhet", "third gender", "trans", "trans female",
+        "trans male", "trans man", "trans person", "trans woman", "trans*", "transfeminine", "transgender",
+        "transgender female", "transgender male", "transgender man", "transgender person",
+        "transgender woman", "transmasculine", "transsexual", "transsexual female", "transsexual male",
+        "transsexual man", "transsexual person", "transsexual woman", "travesti", "trigender", "tumtum",
+        "two-spirit", "vakasalewalewa", "waria", "winkte", "woman", "woman of trans experience", "x-gender",
+        "x-jendā", "xenogender",
+    }
+)
+
+STREET_SUFFIXES = frozenset(
+    {
+        "alley", "aly", "annex", "anx", "arc", "arcade", "ave", "avenue", "bayou", "bch", "beach", "bend",
+        "bg", "blf", "blfs", "bluff", "bluffs", "blvd", "bnd", "bottom", "boulevard", "br", "branch", "brg",
+        "bridge", "brk", "brks", "brook", "brooks", "btm", "burg", "byp", "bypass", "byu", "camp", "canyon",
+        "cape", "causeway", "center", "centers", "cir", "circle", "circles", "cirs", "clb", "clf", "clfs",
+        "cliff", "cliffs", "club", "cmn", "cmns", "common", "commons", "cor", "corner", "corners", "cors",
+        "course", "court", "courts", "cove", "coves", "cp", "cpe", "creek", "cres", "crescent", "crest",
+        "crk", "crossing", "crossroad", "crse", "crst", "cswy", "ct", "ctr", "ctrs", "cts", "curv", "curve",
+        "cv", "cvs", "cyn", "dale", "dam", "divide", "dl", "dm", "dr", "drive", "drives", "drs", "dv",
+        "est", "estate", "estates", "ests", "expressway", "expy", "ext", "extension", "extensions", "exts",
+        "fall", "falls", "ferry", "field", "fields", "flat", "flats", "fld", "flds", "fls", "flt", "flts",
+        "ford", "fords", "forest", "forge", "forges", "fork", "forks", "fort", "frd", "frds", "freeway",
+        "frg", "frgs", "frk", "frks", "frst", "fry", "ft", "fwy", "garden", "gardens", "gateway", "gdn",
+        "gdns", "glen", "glens", "gln", "glns", "green", "greens", "grn", "grns", "grove", "groves", "grv",
+        "grvs", "gtwy", "harbor", "harbors", "haven", "hbr", "hbrs", "heights", "highway", "hill", "hills",
+        "hl", "hls", "hollow", "holw", "hts", "hvn", "hwy", "inlet", "inlt", "is", "island", "islands",
+        "isle", "iss", "jct", "jcts", "junction", "junctions", "key", "keys", "knl", "knls", "knoll",
+        "knolls", "ky", "kys", "lake", "lakes", "land", "landing", "lane", "lck", "lcks", "ldg", "lf",
+        "lgt", "lgts", "light", "lights", "lk", "lks", "ln", "lndg", "loaf", "lock", "locks", "lodge",
+        "loop", "mall", "manor", "manors", "mdw", "mdws", "meadow", "meadows", "mews", "mill", "mills",
+        "mission", "ml", "mls", "mnr", "mnrs", "motorway", "mount", "mountain", "mountains", "msn", "mt",
+        "mtn", "mtns", "mtwy", "nck", "neck", "opas", "orch", "orchard", "oval", "overpass", "par", "park",
+        "parks", "parkway", "parkways", "pass", "passage", "path", "pike", "pine", "pines", "pkwy", "pkwys",
+        "pl", "place", "plain", "plains", "plaza", "pln", "plns", "plz", "pne", "pnes", "point", "points",
+        "port", "ports", "pr", "prairie", "prt", "prts", "psge", "pt", "pts", "radial", "radl", "ramp",
+        "ranch", "rapid", "rapids", "rd", "rdg", "rdgs", "rds", "rest", "ridge", "ridges", "riv", "river",
+        "rnch", "road", "roads", "route", "row", "rpd", "rpds", "rst", "rte", "rue", "run", "shl", "shls",
+        "shoal", "shoals", "shore", "shores", "shr", "shrs", "skwy", "skyway", "smt", "spg", "spgs",
+        "spring", "springs", "spur", "spurs", "sq", "sqs", "square", "squares", "st", "sta", "station",
+        "stra", "stravenue", "stream", "street", "streets", "strm", "sts", "summit", "ter", "terrace",
+        "throughway", "tpke", "trace", "track", "trafficway", "trail", "trailer", "trak", "trce", "trfy",
+        "trl", "trlr", "trwy", "tunl", "tunnel", "turnpike", "un", "underpass", "union", "unions", "uns",
+        "upas", "valley", "valleys", "via", "viaduct", "view", "views", "village", "villages", "ville",
+        "vis", "vista", "vl", "vlg", "vlgs", "vly", "vlys", "vw", "vws", "walk", "walks", "wall", "way",
+        "ways", "well", "wells", "wl", "wls", "xing", "xrd",
+    }
+)
+
+CITY_NAMES = frozenset({"los angeles", "miami", "new york"})
+KNOWN_NAMES = frozenset({"alice", "bob", "charlie", "jane", "john"})
+
+# Detection signals also recognise the terms the pre-model scan heuristics used.
+SIGNAL_GENDER_TERMS = GENDER_TERMS | {"boy", "girl"}
+SIGNAL_CITY_NAMES = CITY_NAMES | {"chicago", "houston", "phoenix"}
+SIGNAL_KNOWN_NAMES = KNOWN_NAMES | {"doe", "smith"}
+
+TOKEN_STRIP_CHARS = ".,;:!?\"()[]{}<>"
+
+
+class FeatureSchemaMismatchError(RuntimeError):
+    pass
+
+
+# Match modes. The first three are the training-time definitions of the model features.
+MATCH_VALUE = "value"  # the whitespace-stripped value is a term
+MATCH_RAW_VALUE = "raw_value"  # the value, unstripped, is a term
+MATCH_WORDS = "words"  # some whitespace-separated word is a term
+MATCH_CLEAN_VALUE = "clean_value"  # the value, stripped of whitespace and punctuation, is a term
+MATCH_NGRAMS = "ngrams"  # some punctuation-stripped word n-gram is a term
+
+
+class KeywordMatcher:
+    """Hashed dictionary lookup against a lowercased value in one of the ``MATCH_*`` modes."""
+
+    def __init__(self, terms: frozenset[str], *, mode: str):
+        self.terms = terms
+        self.mode = mode
+        self.max_words = max((len(term.split()) for term in terms), default=1)
+
+    def matches(self, lowered_text: str) -> bool:
+        if self.mode == MATCH_VALUE:
+            return lowered_text.strip() in self.terms
+        if self.mode == MATCH_RAW_VALUE:
+            return lowered_text in self.terms
+        if self.mode == MATCH_WORDS:
+            return any(word in self.terms for word in lowered_text.split())
+        if self.mode == MATCH_CLEAN_VALUE:
+            return lowered_text.strip().strip(TOKEN_STRIP_CHARS) in self.terms
+        tokens = [token.strip(TOKEN_STRIP_CHARS) for token in lowered_text.split()]
+        tokens = [token for token in tokens if token]
+        for width in range(1, min(self.max_words, len(tokens)) + 1):
+            for start in range(len(tokens) - width + 1):
+                if " ".join(tokens[start : start + width]) in self.terms:
+                    return True
+        return False
 
-#Patterns
-EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
-PHONE_RE = re.compile(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
-SSN_RE = re.compile(r"\d{3}-\d{2}-\d{4}")
-IP_RE = re.compile(r"(?:\d{1,3}\.){3}\d{1,3}")
+
+FEATURE_PATTERNS: dict[str, re.Pattern] = {
+    "email": EMAIL_RE,
+    "phone": PHONE_RE,
+    "ssn": SSN_RE,
+    "ip": IP_RE,
+    "dob": DOB_RE,
+    "zip": ZIP_CODE_RE,
+}
+FEATURE_KEYWORDS: dict[str, KeywordMatcher] = {
+    "gender": KeywordMatcher(GENDER_TERMS, mode=MATCH_VALUE),
+    "street_suffix": KeywordMatcher(STREET_SUFFIXES, mode=MATCH_VALUE),
+    "city": KeywordMatcher(CITY_NAMES, mode=MATCH_RAW_VALUE),
+    "known_name": KeywordMatcher(KNOWN_NAMES, mode=MATCH_WORDS),
+}
+# Gender and city columns hold the term itself, and several gender terms are everyday words,
+# so those signals match whole values; street suffixes and names appear inside longer values.
+SIGNAL_KEYWORDS: dict[str, KeywordMatcher] = {
+    "gender": KeywordMatcher(SIGNAL_GENDER_TERMS, mode=MATCH_CLEAN_VALUE),
+    "street_suffix": KeywordMatcher(STREET_SUFFIXES, mode=MATCH_NGRAMS),
+    "city": KeywordMatcher(SIGNAL_CITY_NAMES, mode=MATCH_CLEAN_VALUE),
+    "known_name": KeywordMatcher(SIGNAL_KNOWN_NAMES, mode=MATCH_NGRAMS),
+}
+
+
+def feature_schema() -> dict[str, object]:
+    definition = {
+        "version": FEATURE_SCHEMA_VERSION,
+        "features": FEATURE_COLUMNS,
+        "patterns": {name: pattern.pattern for name, pattern in sorted(FEATURE_PATTERNS.items())},
+        "keywords": {
+            name: {"terms": sorted(matcher.terms), "mode": matcher.mode}
+            for name, matcher in sorted(FEATURE_KEYWORDS.items())
+        },
+    }
+    fingerprint = hashlib.sha256(json.dumps(definition, sort_keys=True).encode("utf-8")).hexdigest()
+    return {"version": FEATURE_SCHEMA_VERSION, "fingerprint": fingerprint}
+
+
+def contains_pattern(name: str, values: list[str]) -> bool:
+    pattern = FEATURE_PATTERNS[name]
+    return any(pattern.search(str(value)) for value in values)
+
+
+def contains_keyword(name: str, values: list[str]) -> bool:
+    """Detection signal for the scan service; model features use ``FEATURE_KEYWORDS`` instead."""
+    matcher = SIGNAL_KEYWORDS[name]
+    return any(matcher.matches(str(value).lower()) for value in values)
+
+
+def _pattern_hits(pattern: re.Pattern, texts: list[str]) -> np.ndarray:
+    return np.fromiter((pattern.search(text) is not None for text in texts), dtype=bool, count=len(texts))
+
+
+def _keyword_hits(matcher: KeywordMatcher, lowered: list[str]) -> np.ndarray:
+    return np.fromiter((matcher.matches(text) for text in lowered), dtype=bool, count=len(lowered))
+
+
+def build_feature_frame(columns: list[str], parsed_values: list[list[str]]) -> pd.DataFrame:
+    """Compute every feature for every column from one flat pass over all sampled values.
+
+    Per-value results are reduced back to columns with ``np.bincount``. Columns without
+    samples score 0 for every value-derived feature.
+    """
+    column_count = len(columns)
+    sample_sizes = np.fromiter((len(values) for values in parsed_values), dtype=np.int64, count=column_count)
+    owners = np.repeat(np.arange(column_count), sample_sizes)
+    texts = [str(value) for values in parsed_values for value in values]
+    lowered = [text.lower() for text in texts]
+    has_samples = sample_sizes > 0
+    safe_sizes = np.where(has_samples, sample_sizes, 1)
+
+    def per_column_mean(per_value: np.ndarray) -> np.ndarray:
+        totals = np.bincount(owners, weights=per_value, minlength=column_count)
+        return np.where(has_samples, totals / safe_sizes, 0.0)
+
+    def per_column_any(per_value: np.ndarray) -> np.ndarray:
+        return np.bincount(owners, weights=per_value, minlength=column_count) > 0
+
+    phone_hits = _pattern_hits(PHONE_RE, texts)
+    digit_counts = np.fromiter((sum(map(str.isdigit, text)) for text in texts), dtype=np.int64, count=len(texts))
+    value_lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+
+    parsed_column = np.empty(column_count, dtype=object)
+    parsed_column[:] = parsed_values
+    return pd.DataFrame(
+        {
+            "column": columns,
+            "length": np.array([len(column) for column in columns], dtype=np.int64),
+            "num_underscores": np.array([column.count("_") for column in columns], dtype=np.int64),
+            "num_digits": np.array([sum(map(str.isdigit, column)) for column in columns], dtype=np.int64),
+            "has_at": np.array([int("@" in column) for column in columns], dtype=np.int64),
+            "has_email_keyword": np.array([int("email" in column.lower()) for column in columns], dtype=np.int64),
+            "parsed_values": parsed_column,
+            "pct_email_like": per_column_mean(_pattern_hits(EMAIL_RE, texts)),
+            "pct_phone_like": per_column_mean(phone_hits),
+            "pct_ssn_like": per_column_mean(_pattern_hits(SSN_RE, texts)),
+            "pct_ip_like": per_column_mean(_pattern_hits(IP_RE, texts)),
+            "avg_digits_per_val": per_column_mean(digit_counts),
+            "avg_val_len": per_column_mean(value_lengths),
+            "has_dob_pattern": per_column_any(_pattern_hits(DOB_RE, texts)),
+            "has_gender_term": per_column_any(_keyword_hits(FEATURE_KEYWORDS["gender"], lowered)),
+            "has_street_suffix": per_column_any(_keyword_hits(FEATURE_KEYWORDS["street_suffix"], lowered)),
+            "has_city_name": per_column_any(_keyword_hits(FEATURE_KEYWORDS["city"], lowered)),
+            "has_known_name": per_column_any(_keyword_hits(FEATURE_KEYWORDS["known_name"], lowered)),
+            "has_zip_pattern": per_column_any(_pattern_hits(ZIP_CODE_RE, texts)),
+            "has_phone_pattern": per_column_any(phone_hits),
+        }
+    )
 
 
 def extract_column_features(df):
-    df["length"] = df["column"].apply(len)
-    df["num_underscores"] = df["column"].apply(lambda x: x.count("_"))
-    df["num_digits"] = df["column"].apply(lambda x: sum(c.isdigit() for c in x))
-    df["has_at"] = df["column"].apply(lambda x: int("@" in x))
-    df["has_email_keyword"] = df["column"].apply(lambda x: int("email" in x.lower()))
-    df["parsed_values"] = df["value_samples"].apply(ast.literal_eval)
-    
-    def pct_match(regex, values):
-        return np.mean([bool(regex.search(str(v))) for v in values])
-    
-    df["pct_email_like"] = df["parsed_values"].apply(lambda v: pct_match(EMAIL_RE, v))
-    df["pct_phone_like"] = df["parsed_values"].apply(lambda v: pct_match(PHONE_RE, v))
-    df["pct_ssn_like"] = df["parsed_values"].apply(lambda v: pct_match(SSN_RE, v))
-    df["pct_ip_like"] = df["parsed_values"].apply(lambda v: pct_match(IP_RE,v ))
-    df["avg_digits_per_val"] = df["parsed_values"].apply(lambda v: np.mean([sum(c.isdigit() for c in str(i))for i in v]))
-    df["avg_val_len"] = df["parsed_values"].apply(lambda v: np.mean([len(str(i)) for i in v]))
-    return df
\ No newline at end of file
+    """Add the model features to a labelled dataset with ``column`` and ``value_samples`` columns."""
+    parsed_values = [
+        list(values) if isinstance(values, (list, tuple)) else ast.literal_eval(values)
+        for values in df["value_samples"]
+    ]
+    features = build_feature_frame(df["column"].astype(str).tolist(), parsed_values)
+    features.index = df.index
+    result = df.drop(columns=[column for column in features.columns if column != "column" and column in df.columns])
+    return pd.concat([result, features.drop(columns=["column"])], axis=1)
+
+
+def _model_booster(model):
+    get_booster = getattr(model, "get_booster", None)
+    if callable(get_booster):
+        return get_booster()
+    if callable(getattr(model, "attr", None)) and callable(getattr(model, "set_attr", None)):
+        return model
+    return None
+
+
+def stamp_model_feature_schema(model) -> None:
+    booster = _model_booster(model)
+    if booster is None:
+        raise TypeError("Only XGBoost models can carry a feature schema stamp.")
+    booster.set_attr(**{FEATURE_SCHEMA_ATTR: json.dumps(feature_schema(), sort_keys=True)})
+
+
+def read_model_feature_schema(model) -> dict[str, object] | None:
+    booster = _model_booster(model)
+    if booster is None:
+        return None
+    stamp = booster.attr(FEATURE_SCHEMA_ATTR)
+    return json.loads(stamp) if stamp else None
+
+
+def ensure_model_feature_schema(model) -> None:
+    """Refuse models trained against a different feature definition than this module computes."""
+    if _model_booster(model) is None:
+        return
+    stamp = read_model_feature_schema(model)
+    if stamp is None:
+        logger.warning(
+            "Model artifact has no feature schema stamp; retrain with models/train_xgboost_model.py to enable verification."
+        )
+        return
+    expected = feature_schema()
+    if stamp != expected:
+        raise FeatureSchemaMismatchError(
+            "Model feature schema mismatch: artifact has version "
+            f"{stamp.get('version')} ({str(stamp.get('fingerprint'))[:12]}), runtime computes version "
+            f"{expected['version']} ({str(expected['fingerprint'])[:12]}). Retrain the model."
+        )
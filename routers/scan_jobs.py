@@ -1,19 +1,47 @@
 from __future__ import annotations
 
+import json
+import os
+import time
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy import desc
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from database.database import get_db
 from database.models.scan_job import ScanJob
 from database.models.scan_results import ScanResult
-from dependencies.tier_guard import get_current_user_context
-from services.scan_job_service import get_scan_job, serialize_scan_job
+from dependencies.tier_guard import get_current_user_context, require_company_admin
+from services.scan_job_service import (
+    JOB_CANCELED,
+    JOB_COMPLETED,
+    JOB_FAILED,
+    get_scan_job,
+    job_progress_detail,
+    queue_metrics,
+    request_scan_job_cancellation,
+    serialize_scan_job,
+)
+from services.scan_job_events import scan_job_notifier
+from services.scan_progress import get_progress
 from utils.api_errors import error_payload
 from utils.rbac import ROLE_ORG_ADMIN, ROLE_SECURITY_ADMIN, has_any_role
 
 router = APIRouter(prefix="/scan-jobs", tags=["Scan Jobs"])
 
+# Jobs finishing in this process wake waiters through the notification bus. The job row is
+# still read every few seconds, because workers in other processes can only report through it.
+PROGRESS_STREAM_TICK_SECONDS = max(0.05, float(os.getenv("SCAN_PROGRESS_STREAM_TICK_SECONDS", "0.5")))
+PROGRESS_STREAM_DB_POLL_SECONDS = max(0.05, float(os.getenv("SCAN_PROGRESS_STREAM_DB_POLL_SECONDS", "5")))
+PROGRESS_STREAM_KEEPALIVE_SECONDS = 15.0
+PROGRESS_STREAM_MAX_SECONDS = max(1.0, float(os.getenv("SCAN_PROGRESS_STREAM_MAX_SECONDS", "600")))
+JOB_WAIT_DEFAULT_SECONDS = 25.0
+JOB_WAIT_MAX_SECONDS = 60.0
+TERMINAL_JOB_STATUSES = {JOB_COMPLETED, JOB_FAILED, JOB_CANCELED}
+TERMINAL_STREAM_EVENTS = {JOB_COMPLETED: "completed", JOB_FAILED: "failed", JOB_CANCELED: "canceled"}
+
 
 def _build_job_query(db: Session, current_user: dict):
     query = db.query(ScanJob)
@@ -22,6 +50,17 @@ def _build_job_query(db: Session, current_user: dict):
     return query.filter(ScanJob.user_id == current_user["user_id"])
 
 
+def _load_authorized_job(db: Session, job_id: int, current_user: dict) -> ScanJob:
+    job = get_scan_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail=error_payload(detail="Scan job not found", error_code="scan_not_found"),
+        )
+    _authorize_job_access(job, current_user)
+    return job
+
+
 def _authorize_job_access(job: ScanJob, current_user: dict) -> None:
     is_owner = job.user_id == current_user["user_id"]
     is_company_admin = (
@@ -49,20 +88,131 @@ def list_scan_jobs(
     return {"jobs": [serialize_scan_job(job, scan=scans_by_id.get(job.scan_result_id)) for job in jobs]}
 
 
+@router.get("/queue")
+def get_scan_queue_metrics(
+    current_user: dict = Depends(require_company_admin),
+    db: Session = Depends(get_db),
+):
+    # Aggregated per tier across tenants, so only admins see it; no individual jobs or tenants are exposed.
+    return queue_metrics(db)
+
+
 @router.get("/{job_id}")
 def get_scan_job_status(
     job_id: int,
     current_user: dict = Depends(get_current_user_context),
     db: Session = Depends(get_db),
 ):
-    job = get_scan_job(db, job_id)
-    if not job:
+    job = _load_authorized_job(db, job_id, current_user)
+    return _serialize_with_scan(db, job)
+
+
+@router.post("/{job_id}/cancel")
+def cancel_scan_job(
+    job_id: int,
+    current_user: dict = Depends(get_current_user_context),
+    db: Session = Depends(get_db),
+):
+    """Cancel a queued job, or ask a running one to stop; poll the job until it reports CANCELED."""
+    job = _load_authorized_job(db, job_id, current_user)
+    if job.status in TERMINAL_JOB_STATUSES:
         raise HTTPException(
-            status_code=404,
-            detail=error_payload(detail="Scan job not found", error_code="scan_not_found"),
+            status_code=409,
+            detail=error_payload(detail=f"Scan job is already {job.status.lower()}.", error_code="scan_job_finished"),
         )
-    _authorize_job_access(job, current_user)
+    job = request_scan_job_cancellation(db, job)
+    return _serialize_with_scan(db, job)
+
+
+def _serialize_with_scan(db: Session, job: ScanJob) -> dict:
     scan = None
     if job.scan_result_id is not None:
         scan = db.query(ScanResult).filter(ScanResult.id == job.scan_result_id).first()
     return serialize_scan_job(job, scan=scan)
+
+
+def _sse_event(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def _read_job_state(bind, job_id: int) -> tuple[str, dict | None, dict]:
+    with Session(bind=bind) as session:
+        job = get_scan_job(session, job_id)
+        if job is None:
+            return JOB_FAILED, None, {"job_id": job_id, "status": JOB_FAILED}
+        return job.status, job_progress_detail(job), _serialize_with_scan(session, job)
+
+
+async def _progress_events(bind, job_id: int):
+    started = time.monotonic()
+    last_db_poll = float("-inf")
+    last_sent = started
+    last_progress = None
+    persisted_progress = None
+    status = None
+    while time.monotonic() - started < PROGRESS_STREAM_MAX_SECONDS:
+        now = time.monotonic()
+        if now - last_db_poll >= PROGRESS_STREAM_DB_POLL_SECONDS:
+            last_db_poll = now
+            status, persisted_progress, job_payload = await run_in_threadpool(_read_job_state, bind, job_id)
+            if status in TERMINAL_JOB_STATUSES:
+                yield _sse_event(TERMINAL_STREAM_EVENTS[status], job_payload)
+                return
+        progress = get_progress(job_id) or persisted_progress
+        if progress is not None and progress != last_progress:
+            last_progress = progress
+            last_sent = now
+            yield _sse_event("progress", {"job_id": job_id, "status": status, "progress": progress})
+        elif now - last_sent >= PROGRESS_STREAM_KEEPALIVE_SECONDS:
+            last_sent = now
+            yield ": keepalive\n\n"
+        if await scan_job_notifier.wait(job_id, PROGRESS_STREAM_TICK_SECONDS) is not None:
+            last_db_poll = float("-inf")
+    yield _sse_event("timeout", {"job_id": job_id})
+
+
+def _authorize_and_release_session(db: Session, job_id: int, current_user: dict):
+    # Long-lived responses re-read the job in short sessions of their own; holding the request
+    # session's pooled connection for the whole wait would starve the pool.
+    _load_authorized_job(db, job_id, current_user)
+    bind = db.get_bind()
+    db.close()
+    return bind
+
+
+async def _wait_for_job_payload(bind, job_id: int, timeout: float) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        status, _, job_payload = await run_in_threadpool(_read_job_state, bind, job_id)
+        remaining = deadline - time.monotonic()
+        if status in TERMINAL_JOB_STATUSES or remaining <= 0:
+            return job_payload
+        await scan_job_notifier.wait(job_id, min(remaining, PROGRESS_STREAM_DB_POLL_SECONDS))
+
+
+@router.get("/{job_id}/wait")
+async def wait_for_scan_job(
+    job_id: int,
+    timeout: float = JOB_WAIT_DEFAULT_SECONDS,
+    current_user: dict = Depends(get_current_user_context),
+    db: Session = Depends(get_db),
+):
+    """Long-poll: respond as soon as the job finishes, or with its current state after ``timeout`` seconds."""
+    bind = await run_in_threadpool(_authorize_and_release_session, db, job_id, current_user)
+    timeout = min(max(timeout, 0.0), JOB_WAIT_MAX_SECONDS)
+    return await _wait_for_job_payload(bind, job_id, timeout)
+
+
+@router.get("/{job_id}/events")
+def stream_scan_job_progress(
+    job_id: int,
+    current_user: dict = Depends(get_current_user_context),
+    db: Session = Depends(get_db),
+):
+    """Server-sent ``progress`` events, ending with one ``completed``, ``failed`` or ``canceled`` event."""
+    bind = _authorize_and_release_session(db, job_id, current_user)
+    return StreamingResponse(
+        _progress_events(bind, job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
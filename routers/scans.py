@@ -5,7 +5,7 @@ import re
 import tempfile
 import time
 import uuid
-import zipfile
+from dataclasses import asdict, dataclass
 from functools import partial
 from mimetypes import guess_type
 from pathlib import Path
@@ -14,7 +14,6 @@ from urllib.parse import quote
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, Response, UploadFile
 from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-import pandas as pd
 from pydantic import BaseModel, Field
 from sqlalchemy import desc
 from sqlalchemy.orm import Session
@@ -24,9 +23,39 @@ from database.models.company_settings import CompanySettings
 from database.models.scan_results import ScanResult
 from dependencies.tier_guard import get_current_user_context
 from services.audit_service import list_audit_events, record_audit_event, serialize_audit_event
-from services.scan_job_service import create_scan_job, enqueue_scan_job, process_scan_job, should_run_async
+from services.scan_job_service import (
+    create_scan_job,
+    enqueue_scan_job,
+    exceeds_sync_time_budget,
+    process_scan_job,
+    should_run_async,
+)
 from services.retention_service import apply_retention_state, apply_retention_state_bulk
-from services.scan_service import ScanLimitError, parse_scan_result_metadata
+from services.scan_cancellation import ScanCanceledError
+from services.compressed_input import (
+    ARCHIVE_MAX_COMPRESSION_RATIO,
+    ARCHIVE_MAX_ENTRIES,
+    ARCHIVE_MAX_ENTRY_BYTES,
+    ARCHIVE_MAX_TOTAL_UNCOMPRESSED_BYTES,
+    COMPRESSION_BY_EXTENSION,
+    ZIP,
+    ArchiveLimits,
+    compressed_member_name,
+    compression_for_filename,
+    open_scan_source,
+    read_decompressed_sample,
+    sniff_compressed,
+    strip_compression_suffix,
+    validate_safe_archive,
+)
+from services.scan_formats import get_scan_format, is_text_payload, resolve_scan_format
+from services.scan_service import (
+    ScanLimitError,
+    estimate_payload_bytes,
+    estimate_scan_seconds,
+    parse_scan_result_metadata,
+    probe_scan_source,
+)
 from services.security_service import extract_request_security_context, register_scan_activity
 from utils.report_cache import cache_html_report, cache_pdf_report
 from utils.security_events import record_security_event
@@ -42,21 +71,7 @@ router = APIRouter(prefix="/scans", tags=["Scans"])
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 REDACTED_BASE_DIR = (BASE_DIR / "redacted").resolve()
-ARCHIVE_MAX_ENTRIES = max(1, int(os.getenv("SCAN_ARCHIVE_MAX_ENTRIES", "4000")))
-ARCHIVE_MAX_TOTAL_UNCOMPRESSED_BYTES = max(
-    1,
-    int(os.getenv("SCAN_ARCHIVE_MAX_UNCOMPRESSED_BYTES", str(100 * 1024 * 1024))),
-)
-ARCHIVE_MAX_ENTRY_BYTES = max(
-    1,
-    int(os.getenv("SCAN_ARCHIVE_MAX_ENTRY_BYTES", str(25 * 1024 * 1024))),
-)
-ARCHIVE_MAX_COMPRESSION_RATIO = max(
-    1.0,
-    float(os.getenv("SCAN_ARCHIVE_MAX_COMPRESSION_RATIO", "100.0")),
-)
 XML_UNSAFE_DIRECTIVE_RE = re.compile(br"<!DOCTYPE|<!ENTITY", re.IGNORECASE)
-SPREADSHEET_FORMULA_RE = re.compile(r"^\s*[=+\-@]")
 
 
 class ScanResultPayload(BaseModel):
@@ -74,6 +89,21 @@ class ScanResultPayload(BaseModel):
     detection_results: list[dict[str, object]] = Field(default_factory=list)
 
 
+class ScanProbePayload(BaseModel):
+    filename: str
+    file_type: str
+    size_bytes: int
+    columns: list[str] = Field(default_factory=list)
+    pii_columns: list[str] = Field(default_factory=list)
+    detection_results: list[dict[str, object]] = Field(default_factory=list)
+    sampled_rows: int
+    estimated_rows: int
+    row_count_exact: bool
+    within_limits: bool
+    estimated_scan_seconds: float
+    recommended_mode: str
+
+
 def _scan_pipeline_filename(filename: str) -> str:
     path = Path(filename)
     if path.suffix.lower() == ".xls":
@@ -82,121 +112,64 @@ def _scan_pipeline_filename(filename: str) -> str:
 
 
 def _validate_safe_archive(*, source_path: str) -> None:
-    try:
-        with zipfile.ZipFile(source_path) as archive:
-            entries = [entry for entry in archive.infolist() if not entry.is_dir()]
-    except zipfile.BadZipFile as exc:
-        raise ValueError("Archive is malformed or unsupported.") from exc
-
-    if not entries:
-        raise ValueError("Archive is malformed or unsupported.")
-    if len(entries) > ARCHIVE_MAX_ENTRIES:
-        raise ValueError("Compressed archive exceeds safe processing limits.")
-
-    total_uncompressed = 0
-    for entry in entries:
-        entry_path = Path(entry.filename)
-        file_size = max(int(entry.file_size or 0), 0)
-        compressed_size = max(int(entry.compress_size or 0), 0)
-
-        if entry_path.is_absolute() or ".." in entry_path.parts:
-            raise ValueError("Archive contains unsafe paths.")
-        if file_size > ARCHIVE_MAX_ENTRY_BYTES:
-            raise ValueError("Compressed archive exceeds safe processing limits.")
-
-        total_uncompressed += file_size
-        if total_uncompressed > ARCHIVE_MAX_TOTAL_UNCOMPRESSED_BYTES:
-            raise ValueError("Compressed archive exceeds safe processing limits.")
-
-        if compressed_size == 0 and file_size > 0:
-            raise ValueError("Compressed archive exceeds safe processing limits.")
-        if compressed_size and (file_size / compressed_size) > ARCHIVE_MAX_COMPRESSION_RATIO:
-            raise ValueError("Compressed archive exceeds safe processing limits.")
+    validate_safe_archive(
+        source_path,
+        limits=ArchiveLimits(
+            max_entries=ARCHIVE_MAX_ENTRIES,
+            max_total_uncompressed_bytes=ARCHIVE_MAX_TOTAL_UNCOMPRESSED_BYTES,
+            max_entry_bytes=ARCHIVE_MAX_ENTRY_BYTES,
+            max_compression_ratio=ARCHIVE_MAX_COMPRESSION_RATIO,
+        ),
+    )
 
 
 def _validate_safe_xml_upload(*, source_path: str) -> None:
-    with open(source_path, "rb") as handle:
+    with open_scan_source(source_path) as handle:
         header = handle.read(8192)
     if XML_UNSAFE_DIRECTIVE_RE.search(header):
         raise ValueError("XML DTD and entity declarations are not allowed.")
 
 
-def _sanitize_spreadsheet_cell(value):
-    if value is None:
-        return value
-    if isinstance(value, float) and pd.isna(value):
-        return value
-    text = value if isinstance(value, str) else str(value)
-    if SPREADSHEET_FORMULA_RE.match(text):
-        return f"'{text}"
-    return value
-
-
-def _sanitize_dataframe_for_spreadsheet(frame: pd.DataFrame) -> pd.DataFrame:
-    return frame.apply(lambda column: column.map(_sanitize_spreadsheet_cell))
+def _is_text_payload(file_bytes: bytes) -> bool:
+    return is_text_payload(file_bytes)
 
 
-def _sanitize_redacted_output_file(*, file_path: str) -> str:
-    path = Path(file_path)
-    ext = path.suffix.lower()
-    if ext not in {".csv", ".tsv", ".xlsx", ".xls"}:
-        return str(path)
+def _passes_content_signature_check(*, sample_bytes: bytes, source_path: str, ext: str) -> bool:
+    return resolve_scan_format(ext=ext, sample_bytes=sample_bytes, source_path=source_path) is not None
 
-    if ext in {".csv", ".tsv"}:
-        separator = "\t" if ext == ".tsv" else ","
-        frame = pd.read_csv(path, dtype=str, keep_default_na=False, sep=separator)
-        sanitized = _sanitize_dataframe_for_spreadsheet(frame)
-        sanitized.to_csv(path, index=False, sep=separator)
-        return str(path)
 
-    frame = pd.read_excel(path, dtype=str).fillna("")
-    sanitized = _sanitize_dataframe_for_spreadsheet(frame)
-    output_path = path if ext == ".xlsx" else path.with_suffix(".xlsx")
-    sanitized.to_excel(output_path, index=False)
-    if output_path != path and path.exists():
-        path.unlink()
-    return str(output_path)
+def _is_supported_upload_extension(ext: str, *, compression: str | None) -> bool:
+    if compression is None:
+        return ext in SUPPORTED_EXTENSIONS
+    if compression == ZIP and not ext:
+        # "export.zip" names no format; the archive entry decides once the upload is on disk.
+        return True
+    return ext in SUPPORTED_EXTENSIONS and get_scan_format(ext).accepts_compressed
 
 
-def _is_text_payload(file_bytes: bytes) -> bool:
-    if not file_bytes:
-        return False
-    sample = file_bytes[:2048]
-    if b"\x00" in sample:
-        return False
-    try:
-        sample.decode("utf-8")
-        return True
-    except UnicodeDecodeError:
-        try:
-            sample.decode("latin-1")
-            return True
-        except UnicodeDecodeError:
-            return False
+def _unsupported_file_type_error(detail: str = "Unsupported file type.") -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=error_payload(detail=detail, error_code="unsupported_file_type"),
+    )
 
 
-def _passes_content_signature_check(*, sample_bytes: bytes, source_path: str, ext: str) -> bool:
-    if not sample_bytes:
-        return False
-
-    lowered_ext = ext.lower()
-    if lowered_ext == ".pdf":
-        return sample_bytes.startswith(b"%PDF-")
-    if lowered_ext in {".xlsx", ".docx"}:
-        return zipfile.is_zipfile(source_path)
-    if lowered_ext == ".xls":
-        return sample_bytes.startswith(b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1")
-    if lowered_ext == ".json":
-        stripped = sample_bytes.lstrip()
-        return stripped.startswith(b"{") or stripped.startswith(b"[")
-    if lowered_ext == ".xml":
-        return sample_bytes.lstrip().startswith(b"<")
-    if lowered_ext == ".html":
-        lowered = sample_bytes[:4096].lower()
-        return b"<html" in lowered or b"<!doctype html" in lowered
-    if lowered_ext in {".csv", ".tsv", ".txt", ".log"}:
-        return _is_text_payload(sample_bytes)
-    return False
+def _inspect_compressed_upload(
+    *,
+    temp_path: str,
+    filename: str,
+    compression: str,
+    sample_bytes: bytes,
+) -> tuple[str, bytes]:
+    """Return the extension of the compressed payload and a decompressed sample for signature checks."""
+    if not sniff_compressed(sample_bytes, compression):
+        raise _unsupported_file_type_error("Unsupported or invalid file signature.")
+    if compression == ZIP:
+        _validate_safe_archive(source_path=temp_path)
+    ext = os.path.splitext(compressed_member_name(temp_path, compression, filename))[1].lower()
+    if not ext or not _is_supported_upload_extension(ext, compression=compression):
+        raise _unsupported_file_type_error()
+    return ext, read_decompressed_sample(temp_path, compression)
 
 
 async def _stream_upload_to_tempfile(
@@ -244,6 +217,103 @@ async def _stream_upload_to_tempfile(
     return temp_path, total_size, bytes(sample)
 
 
+@dataclass(frozen=True)
+class _UploadTarget:
+    upload_ext: str
+    compression: str | None
+    ext: str
+    max_file_size_bytes: int
+    max_file_size_mb: int
+    allowed_extensions: set[str] | None
+
+
+def _resolve_upload_target(*, file: UploadFile, request: Request, db: Session, user_info: dict) -> _UploadTarget:
+    """Checks that only need the filename, headers and plan, run before any bytes are read."""
+    if not isinstance(user_info, dict):
+        error_id = str(uuid.uuid4())
+        logger.error("Invalid user_info injected into scans route | error_id=%s | type=%r", error_id, type(user_info))
+        raise HTTPException(
+            status_code=500,
+            detail=error_payload(
+                detail="Invalid authentication context.",
+                error_code="internal_error",
+                error_id=error_id,
+            ),
+        )
+    if not file.filename:
+        raise HTTPException(
+            status_code=400,
+            detail=error_payload(detail="Missing filename.", error_code="validation_error"),
+        )
+
+    upload_ext = os.path.splitext(file.filename)[1].lower()
+    compression = compression_for_filename(file.filename)
+    ext = os.path.splitext(strip_compression_suffix(file.filename))[1].lower() if compression else upload_ext
+    if not _is_supported_upload_extension(ext, compression=compression):
+        raise _unsupported_file_type_error()
+
+    plan = get_plan_features(user_info.get("tier"))
+    max_file_size_mb = int(plan["max_file_size_mb"])
+    max_file_size_bytes = max_file_size_mb * 1024 * 1024
+    content_length = request.headers.get("content-length")
+    if content_length:
+        try:
+            if int(content_length) > max_file_size_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=error_payload(
+                        detail=f"File exceeds {max_file_size_mb}MB plan limit.",
+                        error_code="file_too_large",
+                    ),
+                )
+        except ValueError:
+            pass
+
+    allowed_extensions = _company_allowed_extensions(db, user_info.get("company_id"))
+    if allowed_extensions is not None and ext and ext not in allowed_extensions:
+        raise _unsupported_file_type_error("File type is not allowed by company policy.")
+    return _UploadTarget(
+        upload_ext=upload_ext,
+        compression=compression,
+        ext=ext,
+        max_file_size_bytes=max_file_size_bytes,
+        max_file_size_mb=max_file_size_mb,
+        allowed_extensions=allowed_extensions,
+    )
+
+
+async def _receive_validated_upload(file: UploadFile, *, target: _UploadTarget) -> tuple[str, int, str]:
+    """Spool the upload to disk and check its content; returns the temp path, size and payload extension."""
+    temp_path, total_size, file_signature_sample = await _stream_upload_to_tempfile(
+        file,
+        suffix=target.upload_ext,
+        max_file_size_bytes=target.max_file_size_bytes,
+        max_file_size_mb=target.max_file_size_mb,
+    )
+    ext = target.ext
+    try:
+        if target.compression is not None:
+            ext, file_signature_sample = _inspect_compressed_upload(
+                temp_path=temp_path,
+                filename=file.filename,
+                compression=target.compression,
+                sample_bytes=file_signature_sample,
+            )
+            if target.allowed_extensions is not None and ext not in target.allowed_extensions:
+                raise _unsupported_file_type_error("File type is not allowed by company policy.")
+        if not _passes_content_signature_check(sample_bytes=file_signature_sample, source_path=temp_path, ext=ext):
+            raise _unsupported_file_type_error("Unsupported or invalid file signature.")
+        if ext in {".xlsx", ".docx"}:
+            _validate_safe_archive(source_path=temp_path)
+        if ext == ".xml":
+            _validate_safe_xml_upload(source_path=temp_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return temp_path, total_size, ext
+
+
 def _company_allowed_extensions(db: Session, company_id: int | None) -> set[str] | None:
     if company_id is None:
         return None
@@ -375,6 +445,11 @@ def _get_scan_or_404(db: Session, scan_id: int) -> ScanResult:
     return scan
 
 
+def _redacted_download_name(scan_filename: str, path: Path) -> str:
+    suffix = "".join(path.suffixes[-2:]) if compression_for_filename(path.name) else path.suffix
+    return f"{Path(strip_compression_suffix(scan_filename)).stem}_redacted{suffix}"
+
+
 def _resolve_redacted_file_path(stored_path: str) -> Path:
     raw_path = Path(stored_path)
     candidate = raw_path.resolve() if raw_path.is_absolute() else (BASE_DIR / raw_path).resolve()
@@ -400,58 +475,11 @@ async def create_scan(
     user_info: dict = Depends(get_current_user_context),
     db: Session = Depends(get_db),
     aggressive: bool = False,
+    compress_output: bool = False,
 ):
-    if not isinstance(user_info, dict):
-        error_id = str(uuid.uuid4())
-        logger.error("Invalid user_info injected into scans route | error_id=%s | type=%r", error_id, type(user_info))
-        raise HTTPException(
-            status_code=500,
-            detail=error_payload(
-                detail="Invalid authentication context.",
-                error_code="internal_error",
-                error_id=error_id,
-            ),
-        )
-    if not file.filename:
-        raise HTTPException(
-            status_code=400,
-            detail=error_payload(detail="Missing filename.", error_code="validation_error"),
-        )
-
-    ext = os.path.splitext(file.filename)[1].lower()
+    target = _resolve_upload_target(file=file, request=request, db=db, user_info=user_info)
+    ext = target.ext
     pipeline_filename = _scan_pipeline_filename(file.filename)
-    if ext not in SUPPORTED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=error_payload(detail="Unsupported file type.", error_code="unsupported_file_type"),
-        )
-
-    plan = get_plan_features(user_info.get("tier"))
-    max_file_size_mb = int(plan["max_file_size_mb"])
-    max_file_size_bytes = max_file_size_mb * 1024 * 1024
-    content_length = request.headers.get("content-length")
-    if content_length:
-        try:
-            if int(content_length) > max_file_size_bytes:
-                raise HTTPException(
-                    status_code=413,
-                    detail=error_payload(
-                        detail=f"File exceeds {max_file_size_mb}MB plan limit.",
-                        error_code="file_too_large",
-                    ),
-                )
-        except ValueError:
-            pass
-
-    allowed_extensions = _company_allowed_extensions(db, user_info.get("company_id"))
-    if allowed_extensions is not None and ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=error_payload(
-                detail="File type is not allowed by company policy.",
-                error_code="unsupported_file_type",
-            ),
-        )
 
     user_id = user_info.get("user_id")
     if user_id is None:
@@ -467,24 +495,7 @@ async def create_scan(
     request_context = extract_request_security_context(request)
     started_at = time.perf_counter()
     try:
-        temp_path, total_size, file_signature_sample = await _stream_upload_to_tempfile(
-            file,
-            suffix=ext,
-            max_file_size_bytes=max_file_size_bytes,
-            max_file_size_mb=max_file_size_mb,
-        )
-        if not _passes_content_signature_check(sample_bytes=file_signature_sample, source_path=temp_path, ext=ext):
-            raise HTTPException(
-                status_code=400,
-                detail=error_payload(
-                    detail="Unsupported or invalid file signature.",
-                    error_code="unsupported_file_type",
-                ),
-            )
-        if ext in {".xlsx", ".docx"}:
-            _validate_safe_archive(source_path=temp_path)
-        if ext == ".xml":
-            _validate_safe_xml_upload(source_path=temp_path)
+        temp_path, total_size, ext = await _receive_validated_upload(file, target=target)
 
         record_audit_event(
             db,
@@ -531,6 +542,7 @@ async def create_scan(
             user_id=int(user_id),
             filename=file.filename,
             file_type=ext.lstrip("."),
+            tier=user_info.get("tier"),
         )
         job_context = {
             "user_id": int(user_id),
@@ -538,7 +550,9 @@ async def create_scan(
             "tier": user_info.get("tier"),
         }
 
-        if should_run_async(total_size):
+        payload_bytes, _ = estimate_payload_bytes(temp_path)
+        estimated_scan_seconds = estimate_scan_seconds(scan_format=get_scan_format(ext), size_bytes=payload_bytes)
+        if should_run_async(total_size) or exceeds_sync_time_budget(estimated_scan_seconds):
             enqueue_scan_job(
                 background_tasks,
                 job_id=scan_job.id,
@@ -547,9 +561,10 @@ async def create_scan(
                 pipeline_filename=pipeline_filename,
                 context_data=job_context,
                 aggressive=aggressive,
+                compress_output=compress_output,
                 model=getattr(request.app.state, "pii_model", None),
                 cleanup_source=True,
-                sanitize_output_file=_sanitize_redacted_output_file,
+                db_session=db,
             )
             handed_off_to_job_worker = True
             response.status_code = 202
@@ -577,9 +592,9 @@ async def create_scan(
                 pipeline_filename=pipeline_filename,
                 context_data=job_context,
                 aggressive=aggressive,
+                compress_output=compress_output,
                 model=getattr(request.app.state, "pii_model", None),
                 cleanup_source=True,
-                sanitize_output_file=_sanitize_redacted_output_file,
                 db_session=db,
             )
         )
@@ -606,6 +621,12 @@ async def create_scan(
         )
         db.commit()
         return _build_scan_submission_from_job_payload(job_payload)
+    except ScanCanceledError as exc:
+        # The job service has already marked the job CANCELED and released its quota.
+        raise HTTPException(
+            status_code=409,
+            detail=error_payload(detail=exc.detail, error_code="scan_canceled"),
+        ) from exc
     except ScanLimitError as exc:
         if reserved_quota:
             release_scan_quota_reservation(db, user_id)
@@ -772,9 +793,53 @@ async def create_scan(
             os.remove(temp_path)
 
 
+@router.post("/probe", response_model=ScanProbePayload)
+async def probe_scan(
+    request: Request,
+    file: UploadFile = File(...),
+    user_info: dict = Depends(get_current_user_context),
+    db: Session = Depends(get_db),
+):
+    """Preview columns, PII classification, row count and scan time without reserving quota."""
+    target = _resolve_upload_target(file=file, request=request, db=db, user_info=user_info)
+    temp_path = None
+    try:
+        temp_path, total_size, _ = await _receive_validated_upload(file, target=target)
+        probe = await run_in_threadpool(
+            partial(
+                probe_scan_source,
+                source_path=temp_path,
+                filename=_scan_pipeline_filename(file.filename),
+                model=getattr(request.app.state, "pii_model", None),
+            )
+        )
+    except ScanLimitError as exc:
+        raise HTTPException(
+            status_code=exc.status_code,
+            detail=error_payload(detail=exc.detail, error_code=exc.error_code.lower()),
+        ) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=error_payload(detail=str(exc), error_code="validation_error"),
+        ) from exc
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    run_async = should_run_async(total_size) or exceeds_sync_time_budget(probe.estimated_scan_seconds)
+    return ScanProbePayload(
+        **{**asdict(probe), "filename": file.filename},
+        recommended_mode="async" if run_async else "sync",
+    )
+
+
 @router.get("/supported-file-types")
 def get_supported_file_types():
-    return {"supported_extensions": SUPPORTED_EXTENSIONS_SORTED}
+    return {
+        "supported_extensions": SUPPORTED_EXTENSIONS_SORTED,
+        "compressed_extensions": sorted(COMPRESSION_BY_EXTENSION),
+    }
 
 
 @router.get("")
@@ -917,7 +982,7 @@ def download_redacted_file(
         )
 
     mime, _ = guess_type(str(path))
-    download_name = f"{Path(scan.filename).stem}_redacted{path.suffix}"
+    download_name = _redacted_download_name(scan.filename, path)
     record_audit_event(
         db,
         company_id=scan.company_id,
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import pandas as pd
+
+PARQUET = "parquet"
+ARROW_IPC = "arrow"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ValueError("Parquet and Arrow scans require the optional pyarrow package.") from exc
+    return pa, pq
+
+
+def columnar_support_available() -> bool:
+    try:
+        _require_pyarrow()
+    except ValueError:
+        return False
+    return True
+
+
+def _open_ipc_reader(pa, source):
+    try:
+        return pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source)
+
+
+def read_columnar_schema(source_path: str | bytes, kind: str):
+    pa, pq = _require_pyarrow()
+    if isinstance(source_path, bytes):
+        if kind == PARQUET:
+            return pq.read_schema(pa.BufferReader(source_path))
+        return _open_ipc_reader(pa, pa.BufferReader(source_path)).schema
+    if kind == PARQUET:
+        return pq.read_schema(source_path, memory_map=True)
+    with pa.memory_map(source_path, "r") as source:
+        return _open_ipc_reader(pa, source).schema
+
+
+def columnar_row_count(source_path: str, kind: str) -> int:
+    """Row count from Parquet footer metadata or Arrow batch headers, without decoding column data."""
+    pa, pq = _require_pyarrow()
+    if kind == PARQUET:
+        parquet_file = pq.ParquetFile(source_path, memory_map=True)
+        try:
+            return parquet_file.metadata.num_rows
+        finally:
+            parquet_file.close()
+    with pa.memory_map(source_path, "r") as source:
+        reader = _open_ipc_reader(pa, source)
+        if isinstance(reader, pa.ipc.RecordBatchFileReader):
+            return sum(reader.get_batch(index).num_rows for index in range(reader.num_record_batches))
+        return sum(batch.num_rows for batch in reader)
+
+
+def _is_string_type(pa, data_type) -> bool:
+    if pa.types.is_dictionary(data_type):
+        data_type = data_type.value_type
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type) or pa.types.is_string_view(data_type)
+
+
+def string_column_names(source_path: str | bytes, kind: str) -> set[str]:
+    """Only string-typed columns are redaction candidates; redacted text cannot be cast back into other types."""
+    pa, _ = _require_pyarrow()
+    return {field.name for field in read_columnar_schema(source_path, kind) if _is_string_type(pa, field.type)}
+
+
+def _batch_to_frame(batch) -> pd.DataFrame:
+    # split_blocks keeps each column in its own block, so null-free numeric columns stay views of the Arrow buffers.
+    return batch.to_pandas(split_blocks=True)
+
+
+def iter_columnar_frames(source_path: str, kind: str, *, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most ``chunk_rows`` rows, reading Parquet one row group at a time."""
+    pa, pq = _require_pyarrow()
+    chunk_rows = max(1, int(chunk_rows))
+    if kind == PARQUET:
+        parquet_file = pq.ParquetFile(source_path, memory_map=True)
+        try:
+            for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+                yield _batch_to_frame(batch)
+        finally:
+            parquet_file.close()
+        return
+
+    with pa.memory_map(source_path, "r") as source:
+        reader = _open_ipc_reader(pa, source)
+        batches = (
+            (reader.get_batch(index) for index in range(reader.num_record_batches))
+            if isinstance(reader, pa.ipc.RecordBatchFileReader)
+            else iter(reader)
+        )
+        for batch in batches:
+            for offset in range(0, batch.num_rows, chunk_rows):
+                yield _batch_to_frame(batch.slice(offset, chunk_rows))
+
+
+def read_columnar_bytes(source_bytes: bytes, kind: str) -> pd.DataFrame:
+    pa, pq = _require_pyarrow()
+    if kind == PARQUET:
+        return pq.read_table(pa.BufferReader(source_bytes)).to_pandas()
+    return _open_ipc_reader(pa, pa.BufferReader(source_bytes)).read_all().to_pandas()
+
+
+@contextmanager
+def columnar_chunk_sink(output_path: str, kind: str, *, schema=None) -> Iterator[Callable[[pd.DataFrame], None]]:
+    """Write frames back in the source's columnar format.
+
+    With the source ``schema`` every column keeps its original type; without one the schema is
+    inferred from the first frame.
+    """
+    pa, pq = _require_pyarrow()
+    writer = None
+    sink: Optional[object] = None
+
+    def write(frame: pd.DataFrame) -> None:
+        nonlocal writer, sink, schema
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        if writer is None:
+            schema = table.schema
+            if kind == PARQUET:
+                writer = pq.ParquetWriter(output_path, schema)
+            else:
+                sink = pa.OSFile(output_path, "wb")
+                writer = pa.ipc.new_file(sink, schema)
+        writer.write_table(table)
+
+    try:
+        yield write
+        if writer is None and schema is not None:
+            write(schema.empty_table().to_pandas())
+    finally:
+        if writer is not None:
+            writer.close()
+        if sink is not None:
+            sink.close()
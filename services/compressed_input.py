@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import os
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+GZIP = "gzip"
+BZIP2 = "bz2"
+ZSTD = "zstd"
+ZIP = "zip"
+
+COMPRESSION_BY_EXTENSION = {".gz": GZIP, ".bz2": BZIP2, ".zst": ZSTD, ".zip": ZIP}
+COMPRESSION_SIGNATURES = {
+    GZIP: (b"\x1f\x8b",),
+    BZIP2: (b"BZh",),
+    ZSTD: (b"\x28\xb5\x2f\xfd",),
+    ZIP: (b"PK\x03\x04", b"PK\x05\x06"),
+}
+# Zip members cannot be appended to after the fact, so redacted output of a zip upload is gzip-compressed.
+OUTPUT_EXTENSION_BY_COMPRESSION = {GZIP: ".gz", BZIP2: ".bz2", ZSTD: ".zst", ZIP: ".gz"}
+
+ARCHIVE_MAX_ENTRIES = max(1, int(os.getenv("SCAN_ARCHIVE_MAX_ENTRIES", "4000")))
+ARCHIVE_MAX_TOTAL_UNCOMPRESSED_BYTES = max(
+    1,
+    int(os.getenv("SCAN_ARCHIVE_MAX_UNCOMPRESSED_BYTES", str(100 * 1024 * 1024))),
+)
+ARCHIVE_MAX_ENTRY_BYTES = max(
+    1,
+    int(os.getenv("SCAN_ARCHIVE_MAX_ENTRY_BYTES", str(25 * 1024 * 1024))),
+)
+ARCHIVE_MAX_COMPRESSION_RATIO = max(
+    1.0,
+    float(os.getenv("SCAN_ARCHIVE_MAX_COMPRESSION_RATIO", "100.0")),
+)
+ARCHIVE_LIMIT_MESSAGE = "Compressed archive exceeds safe processing limits."
+DECOMPRESSED_SIZE_SAMPLE_BYTES = max(
+    1,
+    int(os.getenv("SCAN_DECOMPRESSED_SIZE_SAMPLE_BYTES", str(1024 * 1024))),
+)
+
+CompressedSource = Union[str, BinaryIO]
+
+
+@dataclass(frozen=True)
+class ArchiveLimits:
+    max_entries: int = ARCHIVE_MAX_ENTRIES
+    max_total_uncompressed_bytes: int = ARCHIVE_MAX_TOTAL_UNCOMPRESSED_BYTES
+    max_entry_bytes: int = ARCHIVE_MAX_ENTRY_BYTES
+    max_compression_ratio: float = ARCHIVE_MAX_COMPRESSION_RATIO
+
+
+def compression_for_filename(filename: str) -> Optional[str]:
+    return COMPRESSION_BY_EXTENSION.get(Path(filename or "").suffix.lower())
+
+
+def strip_compression_suffix(filename: str) -> str:
+    path = Path(filename or "")
+    return str(path.with_suffix("")) if compression_for_filename(filename) else str(path)
+
+
+def sniff_compressed(sample_bytes: bytes, compression: str) -> bool:
+    return any(sample_bytes.startswith(signature) for signature in COMPRESSION_SIGNATURES.get(compression, ()))
+
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ValueError("Zstandard uploads require the optional zstandard package.") from exc
+    return zstandard
+
+
+def validate_safe_archive(source: CompressedSource, *, limits: ArchiveLimits | None = None) -> list[zipfile.ZipInfo]:
+    """Reject zip archives whose declared entries are unsafe; returns the file entries."""
+    limits = limits or ArchiveLimits()
+    try:
+        with zipfile.ZipFile(source) as archive:
+            entries = [entry for entry in archive.infolist() if not entry.is_dir()]
+    except zipfile.BadZipFile as exc:
+        raise ValueError("Archive is malformed or unsupported.") from exc
+
+    if not entries:
+        raise ValueError("Archive is malformed or unsupported.")
+    if len(entries) > limits.max_entries:
+        raise ValueError(ARCHIVE_LIMIT_MESSAGE)
+
+    total_uncompressed = 0
+    for entry in entries:
+        entry_path = Path(entry.filename)
+        file_size = max(int(entry.file_size or 0), 0)
+        compressed_size = max(int(entry.compress_size or 0), 0)
+
+        if entry_path.is_absolute() or ".." in entry_path.parts:
+            raise ValueError("Archive contains unsafe paths.")
+        if file_size > limits.max_entry_bytes:
+            raise ValueError(ARCHIVE_LIMIT_MESSAGE)
+
+        total_uncompressed += file_size
+        if total_uncompressed > limits.max_total_uncompressed_bytes:
+            raise ValueError(ARCHIVE_LIMIT_MESSAGE)
+
+        if compressed_size == 0 and file_size > 0:
+            raise ValueError(ARCHIVE_LIMIT_MESSAGE)
+        if compressed_size and (file_size / compressed_size) > limits.max_compression_ratio:
+            raise ValueError(ARCHIVE_LIMIT_MESSAGE)
+    return entries
+
+
+def _single_zip_entry(source: CompressedSource, limits: ArchiveLimits) -> zipfile.ZipInfo:
+    entries = validate_safe_archive(source, limits=limits)
+    if len(entries) != 1:
+        raise ValueError("Compressed uploads must contain exactly one file.")
+    return entries[0]
+
+
+def compressed_member_name(source: CompressedSource, compression: str, filename: str) -> str:
+    """Name of the file inside a compressed upload; zip entries carry their own name."""
+    if compression == ZIP:
+        return Path(_single_zip_entry(source, ArchiveLimits()).filename).name
+    return Path(strip_compression_suffix(filename)).name
+
+
+class _BoundedDecompressedReader(io.RawIOBase):
+    """Apply the zip entry guards to a single decompressed stream while it is being read.
+
+    gzip, bzip2 and zstd frames do not reliably declare their uncompressed size, so the entry size
+    and compression ratio limits are checked against the bytes actually produced.
+    """
+
+    def __init__(self, stream, *, compressed_size: int, limits: ArchiveLimits, owned=()):
+        self._stream = stream
+        self._owned = owned
+        self._produced = 0
+        self._max_bytes = min(limits.max_entry_bytes, limits.max_total_uncompressed_bytes)
+        self._max_ratio_bytes = compressed_size * limits.max_compression_ratio
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        count = len(data)
+        buffer[:count] = data
+        self._produced += count
+        if self._produced > self._max_bytes or self._produced > self._max_ratio_bytes:
+            raise ValueError(ARCHIVE_LIMIT_MESSAGE)
+        return count
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._stream.close()
+            finally:
+                for handle in self._owned:
+                    handle.close()
+        super().close()
+
+
+def _source_size(source: CompressedSource) -> int:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    position = source.tell()
+    size = source.seek(0, io.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def open_decompressed(
+    source: CompressedSource,
+    compression: str,
+    *,
+    limits: ArchiveLimits | None = None,
+) -> BinaryIO:
+    """Open a compressed upload as a bounded, streaming binary reader over its single payload."""
+    limits = limits or ArchiveLimits()
+    owned: tuple = ()
+    if compression == ZIP:
+        entry = _single_zip_entry(source, limits)
+        archive = zipfile.ZipFile(source)
+        stream = archive.open(entry)
+        compressed_size = int(entry.compress_size or 0)
+        owned = (archive,)
+    elif compression in (GZIP, BZIP2, ZSTD):
+        compressed_size = _source_size(source)
+        if compression == GZIP:
+            stream = gzip.open(source, "rb")
+        elif compression == BZIP2:
+            stream = bz2.open(source, "rb")
+        else:
+            zstandard = _require_zstandard()
+            handle = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+            # Multi-frame files (pzstd output, appended frames) are one logical payload.
+            stream = zstandard.ZstdDecompressor().stream_reader(handle, read_across_frames=True)
+            owned = (handle,) if handle is not source else ()
+    else:
+        raise ValueError(f"Unsupported compression: {compression}")
+    reader = _BoundedDecompressedReader(stream, compressed_size=compressed_size, limits=limits, owned=owned)
+    return io.BufferedReader(reader)
+
+
+def read_decompressed_sample(source: CompressedSource, compression: str, size: int = 4096) -> bytes:
+    with open_decompressed(source, compression) as handle:
+        return handle.read(size)
+
+
+def estimate_decompressed_size(
+    source_path: str,
+    compression: str,
+    *,
+    sample_bytes: int = DECOMPRESSED_SIZE_SAMPLE_BYTES,
+) -> tuple[int, bool]:
+    """Decompressed payload size of a compressed upload, and whether that size is exact.
+
+    Zip entries declare their size. gzip, bzip2 and zstd payloads are decompressed for a leading
+    sample and the compressed size is scaled by the ratio measured on it.
+    """
+    if compression == ZIP:
+        return int(_single_zip_entry(source_path, ArchiveLimits()).file_size or 0), True
+    compressed_size = os.path.getsize(source_path)
+    with open(source_path, "rb") as raw:
+        with open_decompressed(raw, compression) as handle:
+            produced = len(handle.read(sample_bytes))
+            if not handle.read(1):
+                return produced, True
+            consumed = max(1, raw.tell())
+    return max(produced, round(compressed_size * produced / consumed)), False
+
+
+def open_scan_source(source_path: str) -> BinaryIO:
+    """Open an upload for reading, decompressing it when its suffix names a compression format."""
+    compression = compression_for_filename(source_path)
+    if compression is None:
+        return open(source_path, "rb")
+    return open_decompressed(source_path, compression)
+
+
+def open_text_output(output_path: str, mode: str = "w", *, newline: Optional[str] = None):
+    """Open a redacted output for text writing, compressing it when its suffix names a compression format."""
+    compression = compression_for_filename(output_path)
+    if compression is None:
+        return open(output_path, mode, encoding="utf-8", newline=newline)
+    text_mode = f"{mode}t"
+    if compression == GZIP:
+        return gzip.open(output_path, text_mode, encoding="utf-8", newline=newline)
+    if compression == BZIP2:
+        return bz2.open(output_path, text_mode, encoding="utf-8", newline=newline)
+    if compression == ZSTD:
+        return _require_zstandard().open(output_path, text_mode, encoding="utf-8", newline=newline)
+    raise ValueError(f"Unsupported output compression: {compression}")
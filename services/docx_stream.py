@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterator, Union
+from xml.sax.saxutils import escape
+
+WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+PACKAGE_RELATIONSHIPS_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_DOCUMENT_RELATIONSHIP = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+DEFAULT_DOCUMENT_PART = "word/document.xml"
+
+_W = f"{{{WORD_NAMESPACE}}}"
+XML_INVALID_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+PACKAGE_RELATIONSHIPS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{PACKAGE_RELATIONSHIPS_NAMESPACE}">'
+    f'<Relationship Id="rId1" Type="{OFFICE_DOCUMENT_RELATIONSHIP}" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+
+def _main_document_part(archive: zipfile.ZipFile) -> str:
+    try:
+        relationships = ET.fromstring(archive.read("_rels/.rels"))
+    except (KeyError, ET.ParseError):
+        return DEFAULT_DOCUMENT_PART
+    for relationship in relationships:
+        if relationship.get("Type") == OFFICE_DOCUMENT_RELATIONSHIP and relationship.get("Target"):
+            return posixpath.normpath(relationship.get("Target").lstrip("/"))
+    return DEFAULT_DOCUMENT_PART
+
+
+def _run_text(run: ET.Element) -> str:
+    # Same mapping python-docx uses for Run.text.
+    parts: list[str] = []
+    for child in run:
+        tag = child.tag
+        if tag == f"{_W}t":
+            parts.append(child.text or "")
+        elif tag in {f"{_W}tab", f"{_W}ptab"}:
+            parts.append("\t")
+        elif tag == f"{_W}cr":
+            parts.append("\n")
+        elif tag == f"{_W}br":
+            if child.get(f"{_W}type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == f"{_W}noBreakHyphen":
+            parts.append("-")
+    return "".join(parts)
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    parts: list[str] = []
+    for child in paragraph:
+        if child.tag == f"{_W}r":
+            parts.append(_run_text(child))
+        elif child.tag == f"{_W}hyperlink":
+            parts.extend(_run_text(run) for run in child if run.tag == f"{_W}r")
+    return "".join(parts)
+
+
+def iter_docx_text_blocks(source: Union[str, BinaryIO]) -> Iterator[str]:
+    """Yield non-empty body paragraphs and top-level table cells in document order.
+
+    The main document part is read with ``iterparse`` and each body element is released once it
+    has been read, so memory stays flat regardless of document length.
+    """
+    with zipfile.ZipFile(source) as archive:
+        with archive.open(_main_document_part(archive)) as part:
+            stack: list[str] = []
+            body: ET.Element | None = None
+            for event, elem in ET.iterparse(part, events=("start", "end")):
+                if event == "start":
+                    stack.append(elem.tag)
+                    if elem.tag == f"{_W}body" and body is None:
+                        body = elem
+                    continue
+                stack.pop()
+                if body is None:
+                    continue
+                parent = stack[-1] if stack else None
+                if elem.tag == f"{_W}p" and parent == f"{_W}body":
+                    text = _paragraph_text(elem)
+                    if text.strip():
+                        yield text
+                elif elem.tag == f"{_W}tc" and stack[-3:-1] == [f"{_W}body", f"{_W}tbl"]:
+                    text = "\n".join(_paragraph_text(paragraph) for paragraph in elem if paragraph.tag == f"{_W}p")
+                    if text.strip():
+                        yield text
+                if parent == f"{_W}body":
+                    body.remove(elem)
+
+
+def _paragraph_xml(text: str) -> str:
+    # Mirrors Document.add_paragraph: tabs become <w:tab/> and line breaks become <w:br/>.
+    runs: list[str] = []
+    for line_index, line in enumerate(re.split(r"\r\n|\r|\n", XML_INVALID_CHARS_RE.sub("", text))):
+        if line_index:
+            runs.append("<w:br/>")
+        for tab_index, segment in enumerate(line.split("\t")):
+            if tab_index:
+                runs.append("<w:tab/>")
+            if segment:
+                runs.append(f'<w:t xml:space="preserve">{escape(segment)}</w:t>')
+    return f"<w:p><w:r>{''.join(runs)}</w:r></w:p>"
+
+
+@contextmanager
+def docx_paragraph_writer(output_path: str) -> Iterator[Callable[[str], None]]:
+    """Write a minimal WordprocessingML package, streaming one paragraph per call."""
+    with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES_XML)
+        archive.writestr("_rels/.rels", PACKAGE_RELATIONSHIPS_XML)
+        with archive.open(DEFAULT_DOCUMENT_PART, "w", force_zip64=True) as raw_part:
+
+            def write(text: str) -> None:
+                raw_part.write(_paragraph_xml(text).encode("utf-8"))
+
+            raw_part.write(
+                (
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<w:document xmlns:w="{WORD_NAMESPACE}"><w:body>'
+                ).encode("utf-8")
+            )
+            yield write
+            raw_part.write(b"</w:body></w:document>")
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import warnings
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Iterator, Union
+
+with warnings.catch_warnings():
+    warnings.filterwarnings("ignore", message="PyPDF2 is deprecated.*", category=DeprecationWarning)
+    from PyPDF2 import PdfReader
+
+logger = logging.getLogger(__name__)
+
+PDF_POOL_START_METHOD = (os.getenv("SCAN_PDF_START_METHOD") or "spawn").strip().lower()
+PDF_INFLIGHT_PER_WORKER = 2
+
+_pool_lock = threading.Lock()
+_pools: dict[int, Executor] = {}
+
+PdfSource = Union[str, BinaryIO]
+
+
+def open_pdf_reader(source: PdfSource) -> PdfReader:
+    reader = PdfReader(source)
+    if reader.is_encrypted:
+        try:
+            reader.decrypt("")
+        except Exception as exc:
+            raise ValueError("PDF is encrypted or requires a password.") from exc
+    return reader
+
+
+def count_pdf_pages(source_path: str) -> int:
+    """Read only the page tree so limits can be enforced before any text is extracted."""
+    return len(open_pdf_reader(source_path).pages)
+
+
+def _extract_page_texts(reader: PdfReader, start: int, stop: int) -> list[str]:
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def _extract_page_range_task(source_path: str, start: int, stop: int) -> list[str]:
+    return _extract_page_texts(open_pdf_reader(source_path), start, stop)
+
+
+def get_pdf_page_pool(workers: int) -> Executor:
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(PDF_POOL_START_METHOD),
+            )
+            _pools[workers] = pool
+            logger.info("Started PDF page worker pool workers=%s start_method=%s", workers, PDF_POOL_START_METHOD)
+        return pool
+
+
+def _discard_pdf_page_pool(workers: int) -> None:
+    with _pool_lock:
+        pool = _pools.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pdf_page_pools() -> None:
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _result_or_raise(future: Future, *, workers: int) -> list[str]:
+    try:
+        return future.result()
+    except BrokenProcessPool as exc:
+        _discard_pdf_page_pool(workers)
+        raise RuntimeError("PDF page worker pool terminated unexpectedly.") from exc
+
+
+def iter_pdf_page_texts(
+    source_path: str,
+    *,
+    page_count: int,
+    pages_per_chunk: int,
+    workers: int = 1,
+) -> Iterator[list[str]]:
+    """Yield page text in document order, ``pages_per_chunk`` pages at a time.
+
+    With more than one worker, page ranges are extracted in worker processes that each open the
+    file themselves, keeping a bounded window in flight.
+    """
+    pages_per_chunk = max(1, int(pages_per_chunk))
+    ranges = [(start, min(start + pages_per_chunk, page_count)) for start in range(0, page_count, pages_per_chunk)]
+    if workers <= 1 or len(ranges) <= 1:
+        reader = open_pdf_reader(source_path)
+        for start, stop in ranges:
+            yield _extract_page_texts(reader, start, stop)
+        return
+
+    pool = get_pdf_page_pool(workers)
+    max_inflight = max(1, workers * PDF_INFLIGHT_PER_WORKER)
+    inflight: deque[Future] = deque()
+    try:
+        for start, stop in ranges:
+            inflight.append(pool.submit(_extract_page_range_task, source_path, start, stop))
+            if len(inflight) >= max_inflight:
+                yield _result_or_raise(inflight.popleft(), workers=workers)
+        while inflight:
+            yield _result_or_raise(inflight.popleft(), workers=workers)
+    finally:
+        for future in inflight:
+            future.cancel()
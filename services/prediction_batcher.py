@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PREDICT_BATCH_WAIT_MS = max(0.0, float(os.getenv("SCAN_PREDICT_BATCH_WAIT_MS", "2")))
+PREDICT_MAX_BATCH_ROWS = max(1, int(os.getenv("SCAN_PREDICT_MAX_BATCH_ROWS", "4096")))
+# Upper bound on waiting for the dispatcher, so a wedged batch fails the scan instead of hanging it.
+PREDICT_RESULT_TIMEOUT_SECONDS = max(0.1, float(os.getenv("SCAN_PREDICT_RESULT_TIMEOUT_SECONDS", "60")))
+BATCH_HISTOGRAM_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+def _booster_for(model):
+    get_booster = getattr(model, "get_booster", None)
+    if not callable(get_booster):
+        return None
+    try:
+        return get_booster()
+    except Exception:
+        return None
+
+
+def _iteration_range(model) -> tuple[int, int]:
+    try:
+        return 0, int(model.best_iteration) + 1
+    except (AttributeError, TypeError, ValueError):
+        return 0, 0
+
+
+def _labels_from_scores(model, scores: np.ndarray) -> np.ndarray:
+    # Mirrors XGBClassifier.predict so batched labels match the per-scan call exactly.
+    if scores.ndim > 1 and getattr(model, "n_classes_", 2) != 2:
+        return np.argmax(scores, axis=1)
+    if getattr(model, "objective", None) == "multi:softmax":
+        return scores.astype(np.int32)
+    labels = np.zeros(scores.shape[0], dtype=np.int64)
+    labels[scores.reshape(scores.shape[0], -1)[:, -1] > 0.5] = 1
+    return labels
+
+
+def predict_labels_inplace(model, features: np.ndarray) -> np.ndarray:
+    booster = _booster_for(model)
+    scores = booster.inplace_predict(features, iteration_range=_iteration_range(model), validate_features=False)
+    return _labels_from_scores(model, np.asarray(scores))
+
+
+class BatchSizeHistogram:
+    def __init__(self, buckets: tuple[int, ...] = BATCH_HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(buckets) + 1)
+        self._observations = 0
+        self._total = 0
+
+    def observe(self, size: int) -> None:
+        index = next((position for position, bound in enumerate(self.buckets) if size <= bound), len(self.buckets))
+        with self._lock:
+            self._counts[index] += 1
+            self._observations += 1
+            self._total += size
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            counts = list(self._counts)
+            observations = self._observations
+            total = self._total
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "count": observations, "sum": total}
+
+
+@dataclass
+class _PendingPrediction:
+    model: object
+    features: np.ndarray
+    future: Future = field(default_factory=Future)
+
+
+class PredictionBatcher:
+    """Coalesce concurrent predictions for the same booster into one ``inplace_predict`` call."""
+
+    def __init__(
+        self,
+        *,
+        max_wait_ms: float = PREDICT_BATCH_WAIT_MS,
+        max_batch_rows: int = PREDICT_MAX_BATCH_ROWS,
+        result_timeout: float = PREDICT_RESULT_TIMEOUT_SECONDS,
+    ):
+        self.max_wait_seconds = max_wait_ms / 1000.0
+        self.max_batch_rows = max_batch_rows
+        self.result_timeout = result_timeout
+        self.rows_histogram = BatchSizeHistogram()
+        self.requests_histogram = BatchSizeHistogram()
+        self._queue: queue.Queue[_PendingPrediction] = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+
+    def predict(self, model, features: np.ndarray) -> np.ndarray:
+        if self.max_wait_seconds <= 0:
+            self._observe(rows=len(features), requests=1)
+            return predict_labels_inplace(model, features)
+        pending = _PendingPrediction(model=model, features=features)
+        self._ensure_worker()
+        self._queue.put(pending)
+        try:
+            return pending.future.result(timeout=self.result_timeout)
+        except FutureTimeoutError as exc:
+            pending.future.cancel()
+            raise RuntimeError(f"Batched scan model prediction timed out after {self.result_timeout:g}s.") from exc
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "max_wait_ms": self.max_wait_seconds * 1000.0,
+            "max_batch_rows": self.max_batch_rows,
+            "rows_per_batch": self.rows_histogram.snapshot(),
+            "requests_per_batch": self.requests_histogram.snapshot(),
+        }
+
+    def _observe(self, *, rows: int, requests: int) -> None:
+        self.rows_histogram.observe(rows)
+        self.requests_histogram.observe(requests)
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="scan-predict-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            rows = len(batch[0].features)
+            deadline = time.monotonic() + self.max_wait_seconds
+            while rows < self.max_batch_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(pending)
+                rows += len(pending.features)
+            try:
+                self._dispatch(batch)
+            except Exception as exc:
+                # _dispatch fails its own groups; this only guards the thread against the unexpected.
+                logger.exception("Scan prediction batcher failed to dispatch %s requests.", len(batch))
+                self._fail_pending(batch, exc)
+
+    def _dispatch(self, batch: list[_PendingPrediction]) -> None:
+        groups: dict[int, list[_PendingPrediction]] = {}
+        for pending in batch:
+            groups.setdefault(id(pending.model), []).append(pending)
+
+        for group in groups.values():
+            try:
+                matrix = np.ascontiguousarray(np.vstack([pending.features for pending in group]), dtype=np.float32)
+                self._observe(rows=len(matrix), requests=len(group))
+                labels = predict_labels_inplace(group[0].model, matrix)
+                offset = 0
+                for pending in group:
+                    count = len(pending.features)
+                    if not pending.future.done():
+                        pending.future.set_result(labels[offset : offset + count])
+                    offset += count
+            except Exception as exc:
+                logger.exception("Batched scan model prediction failed for %s requests.", len(group))
+                self._fail_pending(group, exc)
+
+    @staticmethod
+    def _fail_pending(batch: list[_PendingPrediction], exc: BaseException) -> None:
+        for pending in batch:
+            if not pending.future.done():
+                pending.future.set_exception(exc)
+
+
+prediction_batcher = PredictionBatcher()
+
+
+def predict_column_labels(model, feature_frame: pd.DataFrame):
+    """Predict one label per feature row, batching across concurrent scans when the model is a booster."""
+    if _booster_for(model) is None:
+        return model.predict(feature_frame)
+    if feature_frame.empty:
+        return np.zeros(0, dtype=np.int64)
+    return prediction_batcher.predict(model, np.ascontiguousarray(feature_frame.to_numpy(dtype=np.float32)))
+
+
+def get_prediction_batch_stats() -> dict[str, object]:
+    return prediction_batcher.stats()
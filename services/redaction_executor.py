@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+import pandas as pd
+
+from services.text_index import SOURCE_RANGE_ATTR, read_line_range
+
+if TYPE_CHECKING:
+    from utils.redaction import RedactionCache
+
+logger = logging.getLogger(__name__)
+
+REDACTION_POOL_START_METHOD = (os.getenv("SCAN_REDACTION_START_METHOD") or "spawn").strip().lower()
+REDACTION_INFLIGHT_PER_WORKER = 2
+# Scans whose cell cache a worker keeps at once; older scans' caches are dropped first.
+WORKER_CACHE_SCANS = 4
+
+_pool_lock = threading.Lock()
+_pools: dict[int, Executor] = {}
+_worker_caches_lock = threading.Lock()
+_worker_caches: OrderedDict[str, RedactionCache] = OrderedDict()
+
+RedactionOutcome = tuple[pd.DataFrame, int, int, dict[str, int]]
+
+
+def _warm_redaction_worker() -> None:
+    # Importing the redaction module builds the Presidio engines and loads the spaCy model;
+    # one throwaway analysis pays the remaining lazy-initialization cost before real work arrives.
+    from utils.redaction import analyzer
+
+    analyzer.analyze(text="Warm up for ada@example.com on 555-123-4567", language="en")
+
+
+def get_redaction_pool(workers: int) -> Executor:
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(REDACTION_POOL_START_METHOD),
+                initializer=_warm_redaction_worker,
+            )
+            _pools[workers] = pool
+            logger.info("Started redaction worker pool workers=%s start_method=%s", workers, REDACTION_POOL_START_METHOD)
+        return pool
+
+
+def _discard_redaction_pool(workers: int) -> None:
+    with _pool_lock:
+        pool = _pools.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_redaction_pools() -> None:
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def merge_type_counts(target: dict[str, int], source: dict[str, int]) -> None:
+    for label, count in source.items():
+        target[label] = target.get(label, 0) + count
+
+
+def _worker_redaction_cache(cache_id: str) -> RedactionCache:
+    from utils import redaction
+
+    if redaction.REDACTION_CACHE_SHARED:
+        return redaction.shared_redaction_cache
+    with _worker_caches_lock:
+        cache = _worker_caches.get(cache_id)
+        if cache is None:
+            cache = redaction.RedactionCache()
+            _worker_caches[cache_id] = cache
+            while len(_worker_caches) > WORKER_CACHE_SCANS:
+                _worker_caches.popitem(last=False)
+        else:
+            _worker_caches.move_to_end(cache_id)
+        return cache
+
+
+def _collect_worker_stats(cache_id: str, task: Callable, *args):
+    # Context variables and module counters do not cross the process boundary, so the worker
+    # collects its cache and tier counters and ships them back with the outcome.
+    from utils.redaction import redaction_stats_scope
+
+    with redaction_stats_scope(_worker_redaction_cache(cache_id)) as stats:
+        outcome = task(*args)
+    return outcome, stats
+
+
+def _redact_series(
+    series: pd.Series,
+    column_name: str,
+    aggressive: bool,
+) -> tuple[pd.Series, int, int, dict[str, int]]:
+    from utils.redaction import scan_and_redact_column_with_details
+
+    redacted_series, redacted_count, total_values, _, type_counts = scan_and_redact_column_with_details(
+        series,
+        column_name,
+        aggressive=aggressive,
+    )
+    return redacted_series, redacted_count, total_values, type_counts
+
+
+def _redact_frame(frame: pd.DataFrame, pii_columns: list[str], aggressive: bool) -> RedactionOutcome:
+    redacted_frame = frame.copy()
+    total_redacted = 0
+    total_values = 0
+    type_counts: dict[str, int] = {}
+    for column in pii_columns:
+        redacted_series, redacted_count, column_total, column_type_counts = _redact_series(
+            frame[column],
+            column,
+            aggressive,
+        )
+        redacted_frame[column] = redacted_series
+        total_redacted += redacted_count
+        total_values += column_total
+        merge_type_counts(type_counts, column_type_counts)
+    return redacted_frame, total_redacted, total_values, type_counts
+
+
+def _redact_series_task(series: pd.Series, column_name: str, aggressive: bool, cache_id: str):
+    return _collect_worker_stats(cache_id, _redact_series, series, column_name, aggressive)
+
+
+def _redact_frame_task(frame: pd.DataFrame, pii_columns: list[str], aggressive: bool, cache_id: str):
+    return _collect_worker_stats(cache_id, _redact_frame, frame, pii_columns, aggressive)
+
+
+def _redact_text_range_task(
+    source_path: str,
+    start: int,
+    stop: int,
+    pii_columns: list[str],
+    aggressive: bool,
+    cache_id: str,
+):
+    # Workers read their own byte range of an indexed text file instead of receiving the lines.
+    frame = pd.DataFrame({"text": read_line_range(source_path, start, stop)})
+    return _collect_worker_stats(cache_id, _redact_frame, frame, pii_columns, aggressive)
+
+
+def _submit_chunk(
+    pool: Executor,
+    chunk: pd.DataFrame,
+    pii_columns: list[str],
+    aggressive: bool,
+    cache_id: str,
+) -> Future:
+    source_range = chunk.attrs.get(SOURCE_RANGE_ATTR)
+    if source_range is not None and chunk.columns.tolist() == ["text"]:
+        source_path, start, stop = source_range
+        return pool.submit(_redact_text_range_task, source_path, start, stop, pii_columns, aggressive, cache_id)
+    # Only the PII columns cross the process boundary; the rest of the chunk stays in the parent.
+    return pool.submit(_redact_frame_task, chunk[pii_columns], pii_columns, aggressive, cache_id)
+
+
+def _merge_redacted_columns(chunk: pd.DataFrame, outcome: RedactionOutcome, pii_columns: list[str]) -> RedactionOutcome:
+    redacted_part, total_redacted, total_values, type_counts = outcome
+    merged = chunk.copy()
+    for column in pii_columns:
+        merged[column] = redacted_part[column].set_axis(merged.index)
+    return merged, total_redacted, total_values, type_counts
+
+
+def _result_or_raise(future: Future, *, workers: int, cache: RedactionCache):
+    from utils.redaction import merge_redaction_stats
+
+    try:
+        outcome, stats = future.result()
+    except BrokenProcessPool as exc:
+        _discard_redaction_pool(workers)
+        raise RuntimeError("Redaction worker pool terminated unexpectedly.") from exc
+    merge_redaction_stats(stats, cache)
+    return outcome
+
+
+def redact_frame_in_parallel(
+    df: pd.DataFrame,
+    pii_columns: list[str],
+    aggressive: bool,
+    *,
+    workers: int,
+    block_rows: int,
+) -> RedactionOutcome:
+    """Fan (column, row block) slices out to the pool and reassemble them in original order."""
+    from utils.redaction import current_redaction_cache
+
+    cache = current_redaction_cache()
+    pool = get_redaction_pool(workers)
+    block_rows = max(1, int(block_rows))
+    futures: list[tuple[str, Future]] = []
+    for column in pii_columns:
+        for start in range(0, max(len(df), 1), block_rows):
+            block = df[column].iloc[start : start + block_rows]
+            futures.append((column, pool.submit(_redact_series_task, block, column, aggressive, cache.cache_id)))
+
+    redacted_df = df.copy()
+    total_redacted = 0
+    total_values = 0
+    type_counts: dict[str, int] = {}
+    column_parts: dict[str, list[pd.Series]] = {column: [] for column in pii_columns}
+    for column, future in futures:
+        redacted_part, redacted_count, part_total, part_type_counts = _result_or_raise(
+            future,
+            workers=workers,
+            cache=cache,
+        )
+        column_parts[column].append(redacted_part)
+        total_redacted += redacted_count
+        total_values += part_total
+        merge_type_counts(type_counts, part_type_counts)
+
+    for column, parts in column_parts.items():
+        redacted_df[column] = pd.concat(parts) if len(parts) > 1 else parts[0]
+    return redacted_df, total_redacted, total_values, type_counts
+
+
+def redact_chunks_in_parallel(
+    chunks: Iterable[pd.DataFrame],
+    pii_columns: list[str],
+    aggressive: bool,
+    *,
+    workers: int,
+) -> Iterator[RedactionOutcome]:
+    """Redact chunks on the pool while keeping a bounded window in flight; results are yielded in input order."""
+    from utils.redaction import current_redaction_cache
+
+    cache = current_redaction_cache()
+    pool = get_redaction_pool(workers)
+    max_inflight = max(1, workers * REDACTION_INFLIGHT_PER_WORKER)
+    inflight: deque[tuple[pd.DataFrame, Future]] = deque()
+
+    def next_result() -> RedactionOutcome:
+        chunk, future = inflight.popleft()
+        outcome = _result_or_raise(future, workers=workers, cache=cache)
+        return _merge_redacted_columns(chunk, outcome, pii_columns)
+
+    try:
+        for chunk in chunks:
+            inflight.append((chunk, _submit_chunk(pool, chunk, pii_columns, aggressive, cache.cache_id)))
+            if len(inflight) >= max_inflight:
+                yield next_result()
+        while inflight:
+            yield next_result()
+    finally:
+        for _, future in inflight:
+            future.cancel()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+# How often a running scan re-reads the shared cancellation flag; requests made in the same
+# process are seen at the next chunk regardless.
+SCAN_CANCEL_POLL_SECONDS = max(0.0, float(os.getenv("SCAN_CANCEL_POLL_SECONDS", "2")))
+
+
+class ScanCanceledError(Exception):
+    """Raised from a scan's chunk loop once its job has been canceled."""
+
+    def __init__(self, detail: str = "Scan was canceled."):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class ScanCancellationToken:
+    """Cooperative cancellation flag checked between chunks of a running scan.
+
+    ``check_requested`` reads a flag other processes can set (the scan_jobs row); it is consulted
+    on the first check and then at most every ``poll_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        check_requested: Callable[[], bool] | None = None,
+        poll_interval: float = SCAN_CANCEL_POLL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._event = threading.Event()
+        self._check_requested = check_requested
+        self._poll_interval = poll_interval
+        self._clock = clock
+        self._last_checked: float | None = None
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def canceled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_canceled(self) -> None:
+        if not self._event.is_set() and self._check_requested is not None:
+            now = self._clock()
+            if self._last_checked is None or now - self._last_checked >= self._poll_interval:
+                self._last_checked = now
+                if self._check_requested():
+                    self._event.set()
+        if self._event.is_set():
+            raise ScanCanceledError()
+
+
+_tokens_lock = threading.Lock()
+_active_tokens: dict[int, ScanCancellationToken] = {}
+
+
+def register_cancellation_token(job_id: int, token: ScanCancellationToken) -> None:
+    with _tokens_lock:
+        _active_tokens[int(job_id)] = token
+
+
+def unregister_cancellation_token(job_id: int) -> None:
+    with _tokens_lock:
+        _active_tokens.pop(int(job_id), None)
+
+
+def signal_cancellation(job_id: int) -> bool:
+    """Cancel a scan running in this process; returns False when it runs elsewhere or not at all."""
+    with _tokens_lock:
+        token: Optional[ScanCancellationToken] = _active_tokens.get(int(job_id))
+    if token is None:
+        return False
+    token.cancel()
+    return True
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import threading
+import zipfile
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Union
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from services.scan_limits import ScanLimits
+
+ChunkWriter = Callable[[pd.DataFrame], None]
+# Called with the output path and, when streaming from disk, the source path (for schema-preserving writers).
+ChunkSinkFactory = Callable[[str, Optional[str]], AbstractContextManager[ChunkWriter]]
+
+OLE2_SIGNATURE = b"\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1"
+PARQUET_SIGNATURE = b"PAR1"
+ARROW_FILE_SIGNATURE = b"ARROW1"
+ARROW_STREAM_CONTINUATION = b"\xff\xff\xff\xff"
+
+
+@dataclass(frozen=True)
+class ScanFormat:
+    """How one upload format is sniffed, parsed, streamed and written back out.
+
+    ``iter_chunks`` and ``open_sink`` together make a format streaming; ``run_scan_pipeline``
+    always prefers that path when the upload is on disk. ``parse`` is the in-memory fallback and
+    ``write_frame`` overrides the default of writing a whole frame through the sink.
+    ``redactable_columns`` limits which classified columns of a source (a path, or the upload bytes
+    on the in-memory path) may be rewritten.
+    ``count_rows`` returns an exact row count from an on-disk source cheaply, or ``None``.
+    ``accepts_compressed`` marks byte-stream formats that may arrive (and be written) gzip, bzip2,
+    zstd or single-entry zip compressed.
+    """
+
+    name: str
+    extensions: tuple[str, ...]
+    sniff: Callable[[bytes, str], bool]
+    parse: Callable[[bytes, "ScanLimits"], pd.DataFrame]
+    iter_chunks: Optional[Callable[[str, "ScanLimits"], Iterator[pd.DataFrame]]] = None
+    open_sink: Optional[ChunkSinkFactory] = None
+    write_frame: Optional[Callable[[pd.DataFrame, str, Optional[int]], None]] = None
+    finalize_output: Optional[Callable[[str, Optional[int]], None]] = None
+    redactable_columns: Optional[Callable[[Union[str, bytes]], set[str]]] = None
+    count_rows: Optional[Callable[[str], Optional[int]]] = None
+    sanitize_formulas: bool = False
+    accepts_compressed: bool = False
+    cost_per_mb: float = 1.0
+
+    @property
+    def streaming(self) -> bool:
+        return self.iter_chunks is not None and self.open_sink is not None
+
+    def estimate_cost(self, size_bytes: int) -> float:
+        """Relative processing cost for an upload of ``size_bytes``; 1.0 is one megabyte of CSV."""
+        return self.cost_per_mb * max(int(size_bytes), 0) / (1024 * 1024)
+
+    def write(self, frame: pd.DataFrame, output_path: str, scan_id: Optional[int] = None) -> None:
+        if self.write_frame is not None:
+            self.write_frame(frame, output_path, scan_id)
+            return
+        if self.open_sink is None:
+            raise ValueError(f"No writer registered for format: {self.name}")
+        with self.open_sink(output_path, None) as write_chunk:
+            write_chunk(frame)
+        if self.finalize_output is not None:
+            self.finalize_output(output_path, scan_id)
+
+
+_registry_lock = threading.Lock()
+_formats_by_extension: dict[str, ScanFormat] = {}
+
+
+def register_scan_format(scan_format: ScanFormat, *, replace: bool = False) -> None:
+    with _registry_lock:
+        for extension in scan_format.extensions:
+            key = extension.lower()
+            if not replace and key in _formats_by_extension:
+                raise ValueError(f"A scan format is already registered for {key}.")
+            _formats_by_extension[key] = scan_format
+
+
+def get_scan_format(ext: str) -> ScanFormat:
+    scan_format = _formats_by_extension.get((ext or "").lower())
+    if scan_format is None:
+        raise ValueError(f"Unsupported format: {ext}")
+    return scan_format
+
+
+def registered_scan_extensions() -> set[str]:
+    return set(_formats_by_extension)
+
+
+def resolve_scan_format(*, ext: str, sample_bytes: bytes, source_path: str) -> Optional[ScanFormat]:
+    """Return the format registered for ``ext`` only if the upload's leading bytes agree with it."""
+    scan_format = _formats_by_extension.get((ext or "").lower())
+    if scan_format is None or not sample_bytes:
+        return None
+    return scan_format if scan_format.sniff(sample_bytes, source_path) else None
+
+
+def is_text_payload(file_bytes: bytes) -> bool:
+    if not file_bytes:
+        return False
+    sample = file_bytes[:2048]
+    if b"\x00" in sample:
+        return False
+    try:
+        sample.decode("utf-8")
+        return True
+    except UnicodeDecodeError:
+        try:
+            sample.decode("latin-1")
+            return True
+        except UnicodeDecodeError:
+            return False
+
+
+def sniff_text(sample_bytes: bytes, source_path: str) -> bool:
+    return is_text_payload(sample_bytes)
+
+
+def sniff_pdf(sample_bytes: bytes, source_path: str) -> bool:
+    return sample_bytes.startswith(b"%PDF-")
+
+
+def sniff_zip_container(sample_bytes: bytes, source_path: str) -> bool:
+    return zipfile.is_zipfile(source_path)
+
+
+def sniff_ole2(sample_bytes: bytes, source_path: str) -> bool:
+    return sample_bytes.startswith(OLE2_SIGNATURE)
+
+
+def sniff_json(sample_bytes: bytes, source_path: str) -> bool:
+    stripped = sample_bytes.lstrip()
+    return stripped.startswith(b"{") or stripped.startswith(b"[")
+
+
+def sniff_xml(sample_bytes: bytes, source_path: str) -> bool:
+    return sample_bytes.lstrip().startswith(b"<")
+
+
+def sniff_html(sample_bytes: bytes, source_path: str) -> bool:
+    lowered = sample_bytes[:4096].lower()
+    return b"<html" in lowered or b"<!doctype html" in lowered
+
+
+def sniff_parquet(sample_bytes: bytes, source_path: str) -> bool:
+    return sample_bytes.startswith(PARQUET_SIGNATURE)
+
+
+def sniff_arrow_ipc(sample_bytes: bytes, source_path: str) -> bool:
+    return sample_bytes.startswith(ARROW_FILE_SIGNATURE) or sample_bytes.startswith(ARROW_STREAM_CONTINUATION)
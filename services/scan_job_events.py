@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# Recently finished jobs are remembered so a waiter that subscribes just after the job finished
+# still returns immediately instead of waiting out its timeout.
+RECENT_FINISHED_JOBS = 4096
+
+
+class ScanJobNotifier:
+    """In-process bus that wakes request handlers waiting for a scan job to finish.
+
+    Jobs finish on worker threads while waiters are coroutines, so waiters are woken through
+    their own event loop with ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, recent_limit: int = RECENT_FINISHED_JOBS):
+        self._lock = threading.Lock()
+        self._waiters: dict[int, list[tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._finished: OrderedDict[int, str] = OrderedDict()
+        self._recent_limit = recent_limit
+
+    def publish(self, job_id: int, status: str) -> None:
+        with self._lock:
+            self._finished[job_id] = status
+            self._finished.move_to_end(job_id)
+            while len(self._finished) > self._recent_limit:
+                self._finished.popitem(last=False)
+            waiters = self._waiters.pop(job_id, [])
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The waiting request's loop has already shut down.
+                continue
+
+    def finished_status(self, job_id: int) -> Optional[str]:
+        with self._lock:
+            return self._finished.get(job_id)
+
+    async def wait(self, job_id: int, timeout: float) -> Optional[str]:
+        """Wait up to ``timeout`` seconds for ``job_id`` to finish; returns its final status or None."""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        with self._lock:
+            status = self._finished.get(job_id)
+            if status is not None:
+                return status
+            self._waiters.setdefault(job_id, []).append((loop, event))
+        try:
+            await asyncio.wait_for(event.wait(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(job_id)
+                if waiters and (loop, event) in waiters:
+                    waiters.remove((loop, event))
+                    if not waiters:
+                        del self._waiters[job_id]
+        return self.finished_status(job_id)
+
+
+scan_job_notifier = ScanJobNotifier()
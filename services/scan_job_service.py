@@ -1,26 +1,50 @@
 from __future__ import annotations
 
+import json
 import logging
 import os
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Callable
 
 from fastapi import BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.orm import Session, object_session
 
 from database.database import SessionLocal
 from database.models.scan_job import ScanJob
 from database.models.scan_results import ScanResult
 from services.audit_service import record_audit_event
+from services.scan_cancellation import (
+    ScanCanceledError,
+    ScanCancellationToken,
+    register_cancellation_token,
+    signal_cancellation,
+    unregister_cancellation_token,
+)
+from services.scan_job_events import scan_job_notifier
+from services.scan_progress import ProgressSnapshot, ScanProgressReporter, clear_progress, get_progress
+from services.scan_scheduler import as_utc, schedule_claim_order
 from services.scan_service import ScanContext, ScanLimitError, parse_scan_result_metadata, run_scan_pipeline
+from utils.plan_features import PLAN_CONFIG, normalize_tier
 from utils.security_events import record_security_event
+from utils.tier_limiter import release_scan_quota_reservation
 
 JOB_QUEUED = "QUEUED"
 JOB_RUNNING = "RUNNING"
 JOB_COMPLETED = "COMPLETED"
 JOB_FAILED = "FAILED"
+JOB_CANCELED = "CANCELED"
+JOB_CANCELED_MESSAGE = "Scan job was canceled."
 ASYNC_SCAN_THRESHOLD_BYTES = max(1, int(os.getenv("SCAN_ASYNC_THRESHOLD_BYTES", str(5 * 1024 * 1024))))
+ASYNC_SCAN_THRESHOLD_SECONDS = max(0.0, float(os.getenv("SCAN_ASYNC_THRESHOLD_SECONDS", "30")))
+# "inline" runs async scans as FastAPI background tasks in the API process; "database" leaves them
+# queued in scan_jobs for a separate scan worker to claim.
+QUEUE_BACKEND_INLINE = "inline"
+QUEUE_BACKEND_DATABASE = "database"
+SCAN_QUEUE_BACKEND = (os.getenv("SCAN_QUEUE_BACKEND") or QUEUE_BACKEND_INLINE).strip().lower()
+SCAN_JOB_LEASE_SECONDS = max(1.0, float(os.getenv("SCAN_JOB_LEASE_SECONDS", "120")))
+SCAN_JOB_MAX_ATTEMPTS = max(1, int(os.getenv("SCAN_JOB_MAX_ATTEMPTS", "3")))
 logger = logging.getLogger(__name__)
 
 
@@ -32,15 +56,72 @@ def should_run_async(file_size_bytes: int) -> bool:
     return int(file_size_bytes) > ASYNC_SCAN_THRESHOLD_BYTES
 
 
+def exceeds_sync_time_budget(estimated_scan_seconds: float) -> bool:
+    """Small uploads of expensive formats can still outlast a synchronous request."""
+    return float(estimated_scan_seconds) > ASYNC_SCAN_THRESHOLD_SECONDS
+
+
 def job_progress(status: str) -> int:
     normalized = (status or "").upper()
-    if normalized in {JOB_COMPLETED, JOB_FAILED}:
+    if normalized in {JOB_COMPLETED, JOB_FAILED, JOB_CANCELED}:
         return 100
     if normalized == JOB_RUNNING:
         return 60
     return 10
 
 
+def job_progress_detail(job: ScanJob) -> ProgressSnapshot | None:
+    """Latest progress snapshot: this process's live store first, then the copy persisted on the row."""
+    live = get_progress(job.id) if job.id is not None else None
+    if live is not None:
+        return live
+    try:
+        return json.loads(job.progress_json) if job.progress_json else None
+    except ValueError:
+        return None
+
+
+def _side_session_factory(db: Session) -> Callable[[], Session]:
+    # Progress and cancellation checks run mid-scan, so like the worker heartbeat they use their own
+    # short-lived sessions and never commit or roll back the job's session.
+    return lambda: Session(bind=db.get_bind())
+
+
+def _persist_progress_callback(session_factory: Callable[[], Session]):
+    def persist(job_id: int, snapshot: ProgressSnapshot) -> None:
+        db = session_factory()
+        try:
+            db.execute(
+                update(ScanJob)
+                .where(ScanJob.id == job_id)
+                .values(progress_json=json.dumps(snapshot))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("Failed to persist progress for scan job %s.", job_id, exc_info=True)
+        finally:
+            db.close()
+
+    return persist
+
+
+def _cancel_requested_callback(session_factory: Callable[[], Session], job_id: int):
+    # Lets a scan notice cancellations requested through another API process.
+    def cancel_requested() -> bool:
+        db = session_factory()
+        try:
+            return db.execute(select(ScanJob.cancel_requested_at).where(ScanJob.id == job_id)).scalar() is not None
+        except Exception:
+            logger.warning("Failed to read cancellation state for scan job %s.", job_id, exc_info=True)
+            return False
+        finally:
+            db.close()
+
+    return cancel_requested
+
+
 def create_scan_job(
     db: Session,
     *,
@@ -48,12 +129,14 @@ def create_scan_job(
     user_id: int,
     filename: str,
     file_type: str,
+    tier: str | None = None,
 ) -> ScanJob:
     job = ScanJob(
         company_id=company_id,
         user_id=user_id,
         filename=filename,
         file_type=file_type,
+        tier=normalize_tier(tier),
         status=JOB_QUEUED,
     )
     db.add(job)
@@ -99,15 +182,21 @@ def serialize_scan_job(
             db.close()
     if result_payload is None:
         result_payload = serialize_scan_result(result_scan)
+    progress_detail = job_progress_detail(job)
+    progress = job_progress(job.status)
+    if progress_detail is not None and job.status == JOB_RUNNING:
+        progress = int(progress_detail.get("percent", progress))
     return {
         "job_id": job.id,
         "company_id": job.company_id,
         "user_id": job.user_id,
         "scan_result_id": job.scan_result_id,
         "status": job.status,
-        "progress": job_progress(job.status),
+        "progress": progress,
+        "progress_detail": progress_detail,
         "filename": job.filename,
         "file_type": job.file_type,
+        "tier": job.tier,
         "created_at": job.created_at.isoformat() if job.created_at else None,
         "started_at": job.started_at.isoformat() if job.started_at else None,
         "completed_at": job.completed_at.isoformat() if job.completed_at else None,
@@ -121,17 +210,73 @@ def _mark_job_running(job: ScanJob) -> None:
     job.started_at = job.started_at or _utcnow()
 
 
+_PENDING_NOTIFICATIONS_KEY = "scan_job_pending_notifications"
+
+
+def _publish_pending_notifications(session: Session) -> None:
+    for job_id, status in session.info.pop(_PENDING_NOTIFICATIONS_KEY, []):
+        scan_job_notifier.publish(job_id, status)
+
+
+def _discard_pending_notifications(session: Session, _previous_transaction) -> None:
+    session.info.pop(_PENDING_NOTIFICATIONS_KEY, None)
+
+
+def _notify_job_finished(job: ScanJob) -> None:
+    # Waiters re-read the row when woken, so publish only once the terminal status is committed.
+    session = object_session(job)
+    if session is None:
+        scan_job_notifier.publish(job.id, job.status)
+        return
+    if not event.contains(session, "after_commit", _publish_pending_notifications):
+        event.listen(session, "after_commit", _publish_pending_notifications)
+        event.listen(session, "after_soft_rollback", _discard_pending_notifications)
+    session.info.setdefault(_PENDING_NOTIFICATIONS_KEY, []).append((job.id, job.status))
+
+
 def _mark_job_completed(job: ScanJob, *, scan_result_id: int) -> None:
     job.status = JOB_COMPLETED
     job.scan_result_id = scan_result_id
     job.completed_at = _utcnow()
     job.error_message = None
+    _notify_job_finished(job)
 
 
 def _mark_job_failed(job: ScanJob, *, error_message: str) -> None:
     job.status = JOB_FAILED
     job.completed_at = _utcnow()
     job.error_message = error_message[:500]
+    _notify_job_finished(job)
+
+
+def _mark_job_canceled(job: ScanJob) -> None:
+    now = _utcnow()
+    job.status = JOB_CANCELED
+    job.cancel_requested_at = job.cancel_requested_at or now
+    job.completed_at = now
+    job.error_message = JOB_CANCELED_MESSAGE
+    _notify_job_finished(job)
+
+
+def _remove_queued_source(job: ScanJob) -> None:
+    source_path = json.loads(job.payload_json or "{}").get("source_path")
+    if source_path and os.path.exists(source_path):
+        os.remove(source_path)
+
+
+def _quota_day(job: ScanJob) -> date | None:
+    # Quota counters are keyed on the server's local date at reservation, which is when the job was created.
+    created_at = as_utc(job.created_at)
+    return created_at.astimezone().date() if created_at is not None else None
+
+
+def _release_canceled_job_quota(db: Session, job: ScanJob) -> None:
+    # Called once, on the transition to CANCELED, so a job never refunds its quota twice.
+    try:
+        release_scan_quota_reservation(db, job.user_id, day=_quota_day(job))
+    except Exception:
+        db.rollback()
+        logger.warning("Failed to release scan quota for canceled scan job %s.", job.id, exc_info=True)
 
 
 def _record_audit_event_best_effort(db: Session, **kwargs) -> None:
@@ -160,23 +305,32 @@ def process_scan_job(
     pipeline_filename: str,
     context_data: dict[str, Any],
     aggressive: bool = False,
+    compress_output: bool = False,
     model: Any = None,
     cleanup_source: bool = True,
-    sanitize_output_file: Callable[..., str] | None = None,
     db_session: Session | None = None,
 ) -> dict[str, Any]:
     db = db_session or SessionLocal()
     owns_session = db_session is None
+    side_sessions = _side_session_factory(db)
+    cancellation = ScanCancellationToken(check_requested=_cancel_requested_callback(side_sessions, job_id))
     try:
         job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
         if not job:
             raise RuntimeError("Scan job not found")
+        if job.status == JOB_CANCELED:
+            # Canceled while queued; the quota was released when it was canceled.
+            return serialize_scan_job(job)
+        if job.cancel_requested_at is not None:
+            raise ScanCanceledError()
 
         _mark_job_running(job)
         db.add(job)
         db.commit()
         db.refresh(job)
 
+        register_cancellation_token(job_id, cancellation)
+        progress_reporter = ScanProgressReporter(job_id, persist=_persist_progress_callback(side_sessions))
         result = run_scan_pipeline(
             source_path=source_path,
             filename=pipeline_filename,
@@ -187,18 +341,18 @@ def process_scan_job(
             ),
             model=model,
             aggressive=aggressive,
+            compress_output=compress_output,
+            progress=progress_reporter,
+            cancellation=cancellation,
         )
-
-        sanitized_output_path = result.redacted_file
-        if sanitize_output_file and result.redacted_file and os.path.exists(result.redacted_file):
-            sanitized_output_path = sanitize_output_file(file_path=result.redacted_file)
+        progress_reporter.finish()
 
         scan = db.query(ScanResult).filter(ScanResult.id == result.scan_id).first()
         result_payload = {
             "scan_id": result.scan_id,
             "filename": original_filename,
             "pii_columns": result.pii_columns,
-            "redacted_file": f"/scans/{result.scan_id}/download" if sanitized_output_path else None,
+            "redacted_file": f"/scans/{result.scan_id}/download" if result.redacted_file else None,
             "risk_score": result.risk_score,
             "redacted_count": result.redacted_count,
             "total_values": result.total_values,
@@ -208,7 +362,7 @@ def process_scan_job(
         if scan:
             scan.filename = original_filename
             scan.file_type = Path(original_filename).suffix.lstrip(".") or scan.file_type
-            scan.redacted_file_path = sanitized_output_path
+            scan.redacted_file_path = result.redacted_file
             db.add(scan)
 
         _mark_job_completed(job, scan_result_id=result.scan_id)
@@ -231,6 +385,16 @@ def process_scan_job(
             event_metadata={"scan_id": result.scan_id, "filename": original_filename},
         )
         return serialized_job
+    except ScanCanceledError:
+        db.rollback()
+        job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+        if job and job.status != JOB_CANCELED:
+            stage = "running" if job.status == JOB_RUNNING else "queued"
+            _mark_job_canceled(job)
+            db.add(job)
+            db.commit()
+            _record_job_canceled(db, job, stage=stage)
+        raise
     except ScanLimitError as exc:
         db.rollback()
         job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
@@ -288,12 +452,73 @@ def process_scan_job(
         )
         raise
     finally:
+        # Terminal jobs are served from the snapshot persisted on the row.
+        unregister_cancellation_token(job_id)
+        clear_progress(job_id)
         if owns_session:
             db.close()
         if cleanup_source and source_path and os.path.exists(source_path):
             os.remove(source_path)
 
 
+def _record_job_canceled(db: Session, job: ScanJob, *, stage: str) -> None:
+    _release_canceled_job_quota(db, job)
+    _record_audit_event_best_effort(
+        db,
+        company_id=job.company_id,
+        user_id=job.user_id,
+        event_type="scan_job_canceled",
+        event_category="scan",
+        description=f"Scan job {job.id} was canceled.",
+        target_type="scan_job",
+        target_id=str(job.id),
+        event_metadata={"stage": stage, "filename": job.filename},
+    )
+
+
+def request_scan_job_cancellation(db: Session, job: ScanJob) -> ScanJob:
+    """Cancel a job that has not started, or ask a running one to stop at its next chunk.
+
+    Queued jobs become CANCELED here and release their quota immediately. Running jobs only get
+    ``cancel_requested_at``; the process running them marks them CANCELED, removes partial output
+    and releases the quota once the scan loop stops.
+    """
+    now = _utcnow()
+    canceled = db.execute(
+        update(ScanJob)
+        .where(ScanJob.id == job.id, ScanJob.status == JOB_QUEUED, ScanJob.lease_owner.is_(None))
+        .values(
+            status=JOB_CANCELED,
+            cancel_requested_at=now,
+            completed_at=now,
+            error_message=JOB_CANCELED_MESSAGE,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    db.refresh(job)
+    if canceled.rowcount == 1:
+        scan_job_notifier.publish(job.id, JOB_CANCELED)
+        _remove_queued_source(job)
+        _record_job_canceled(db, job, stage="queued")
+        return job
+
+    db.execute(
+        update(ScanJob)
+        .where(
+            ScanJob.id == job.id,
+            ScanJob.status.in_([JOB_QUEUED, JOB_RUNNING]),
+            ScanJob.cancel_requested_at.is_(None),
+        )
+        .values(cancel_requested_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    signal_cancellation(job.id)
+    db.refresh(job)
+    return job
+
+
 def _run_job_safely(**kwargs) -> None:
     try:
         process_scan_job(**kwargs)
@@ -301,5 +526,169 @@ def _run_job_safely(**kwargs) -> None:
         return None
 
 
-def enqueue_scan_job(background_tasks: BackgroundTasks, **kwargs) -> None:
+def persist_queued_scan_job(
+    db: Session,
+    *,
+    job_id: int,
+    source_path: str,
+    pipeline_filename: str,
+    context_data: dict[str, Any],
+    aggressive: bool = False,
+    compress_output: bool = False,
+    **_unused: Any,
+) -> None:
+    """Store everything a scan worker needs to run the job; the row itself is the queue entry."""
+    job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+    if not job:
+        raise RuntimeError("Scan job not found")
+    job.payload_json = json.dumps(
+        {
+            "source_path": os.path.abspath(source_path),
+            "pipeline_filename": pipeline_filename,
+            "tier": context_data.get("tier"),
+            "aggressive": bool(aggressive),
+            "compress_output": bool(compress_output),
+        }
+    )
+    job.status = JOB_QUEUED
+    db.add(job)
+    db.commit()
+
+
+def enqueue_scan_job(background_tasks: BackgroundTasks, *, db_session: Session | None = None, **kwargs) -> None:
+    if SCAN_QUEUE_BACKEND == QUEUE_BACKEND_DATABASE:
+        db = db_session or SessionLocal()
+        try:
+            persist_queued_scan_job(db, **kwargs)
+        finally:
+            if db_session is None:
+                db.close()
+        return
     background_tasks.add_task(_run_job_safely, **kwargs)
+
+
+def _claimable_job_filter(now: datetime):
+    # Queued jobs nobody holds, plus jobs whose worker stopped heartbeating mid-scan.
+    return and_(
+        ScanJob.payload_json.is_not(None),
+        or_(
+            and_(ScanJob.status == JOB_QUEUED, ScanJob.lease_owner.is_(None)),
+            and_(ScanJob.status.in_([JOB_QUEUED, JOB_RUNNING]), ScanJob.lease_expires_at < now),
+        ),
+    )
+
+
+def claim_next_scan_job(
+    db: Session,
+    *,
+    worker_id: str,
+    lease_seconds: float = SCAN_JOB_LEASE_SECONDS,
+) -> ScanJob | None:
+    """Lease the next claimable job, in fair-share order, to ``worker_id``.
+
+    Each candidate is taken with a conditional UPDATE that only matches while the row is still
+    claimable, so concurrent workers racing for the same row get exactly one winner. Tenant
+    concurrency caps are checked before the claim, so racing workers can briefly exceed them.
+    """
+    now = _utcnow()
+    candidate_ids = schedule_claim_order(db, _claimable_job_filter(now), now=now)
+    for candidate_id in candidate_ids[:10]:
+        claimed = db.execute(
+            update(ScanJob)
+            .where(ScanJob.id == candidate_id, _claimable_job_filter(now))
+            .values(
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                heartbeat_at=now,
+                attempts=ScanJob.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if claimed.rowcount == 1:
+            return db.query(ScanJob).filter(ScanJob.id == candidate_id).populate_existing().first()
+    return None
+
+
+def renew_scan_job_lease(
+    db: Session,
+    *,
+    job_id: int,
+    worker_id: str,
+    lease_seconds: float = SCAN_JOB_LEASE_SECONDS,
+) -> bool:
+    """Extend a held lease; returns False when another worker has taken the job over."""
+    now = _utcnow()
+    renewed = db.execute(
+        update(ScanJob)
+        .where(ScanJob.id == job_id, ScanJob.lease_owner == worker_id)
+        .values(lease_expires_at=now + timedelta(seconds=lease_seconds), heartbeat_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return renewed.rowcount == 1
+
+
+def release_scan_job_lease(db: Session, *, job_id: int, worker_id: str) -> None:
+    db.execute(
+        update(ScanJob)
+        .where(ScanJob.id == job_id, ScanJob.lease_owner == worker_id)
+        .values(lease_owner=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def queue_metrics(db: Session, *, now: datetime | None = None) -> dict[str, Any]:
+    """Queue depth and wait times per tier, aggregated across tenants."""
+    now = now or _utcnow()
+    tiers: dict[str, dict[str, Any]] = {
+        tier: {"queued": 0, "running": 0, "oldest_wait_seconds": 0.0, "mean_wait_seconds": 0.0}
+        for tier in PLAN_CONFIG
+    }
+    waits: dict[str, list[float]] = {tier: [] for tier in PLAN_CONFIG}
+    rows = (
+        db.query(ScanJob.tier, ScanJob.status, ScanJob.created_at, ScanJob.lease_owner)
+        .filter(ScanJob.status.in_([JOB_QUEUED, JOB_RUNNING]))
+        .all()
+    )
+    for tier, status, created_at, lease_owner in rows:
+        normalized = normalize_tier(tier)
+        if status == JOB_RUNNING or lease_owner is not None:
+            tiers[normalized]["running"] += 1
+            continue
+        tiers[normalized]["queued"] += 1
+        waits[normalized].append(max(0.0, (now - (as_utc(created_at) or now)).total_seconds()))
+    for tier, tier_waits in waits.items():
+        if tier_waits:
+            tiers[tier]["oldest_wait_seconds"] = round(max(tier_waits), 3)
+            tiers[tier]["mean_wait_seconds"] = round(sum(tier_waits) / len(tier_waits), 3)
+    return {"tiers": tiers}
+
+
+def queued_job_arguments(job: ScanJob) -> dict[str, Any]:
+    """Rebuild the ``process_scan_job`` keyword arguments stored by ``persist_queued_scan_job``."""
+    payload = json.loads(job.payload_json or "{}")
+    return {
+        "job_id": job.id,
+        "source_path": payload["source_path"],
+        "original_filename": job.filename,
+        "pipeline_filename": payload.get("pipeline_filename") or job.filename,
+        "context_data": {"user_id": job.user_id, "company_id": job.company_id, "tier": payload.get("tier")},
+        "aggressive": bool(payload.get("aggressive")),
+        "compress_output": bool(payload.get("compress_output")),
+        "cleanup_source": True,
+    }
+
+
+def fail_exhausted_scan_job(db: Session, job: ScanJob) -> bool:
+    """Fail a job that has crashed its worker too many times instead of leasing it again."""
+    if int(job.attempts or 0) <= SCAN_JOB_MAX_ATTEMPTS:
+        return False
+    _mark_job_failed(job, error_message=f"Scan job abandoned after {SCAN_JOB_MAX_ATTEMPTS} worker attempts.")
+    job.lease_owner = None
+    job.lease_expires_at = None
+    db.add(job)
+    db.commit()
+    _remove_queued_source(job)
+    return True
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+SCAN_CHUNK_ROWS = max(100, int(os.getenv("SCAN_CHUNK_ROWS", "1000")))
+SCAN_REDACTION_WORKERS = max(1, int(os.getenv("SCAN_REDACTION_WORKERS", "1")))
+SCAN_SAMPLE_BUFFER_ROWS = max(1, int(os.getenv("SCAN_SAMPLE_BUFFER_ROWS", "10000")))
+MAX_SCAN_ROWS = max(1, int(os.getenv("MAX_SCAN_ROWS", "50000")))
+MAX_SCAN_CELLS = max(1, int(os.getenv("MAX_SCAN_CELLS", "500000")))
+MAX_SCAN_COLUMNS = max(1, int(os.getenv("MAX_SCAN_COLUMNS", "200")))
+MAX_SCAN_PDF_PAGES = max(1, int(os.getenv("MAX_SCAN_PDF_PAGES", "1000")))
+SCAN_PDF_PAGE_WORKERS = max(1, int(os.getenv("SCAN_PDF_PAGE_WORKERS", "1")))
+
+
+@dataclass(frozen=True)
+class ScanLimits:
+    max_rows: int = MAX_SCAN_ROWS
+    max_cells: int = MAX_SCAN_CELLS
+    max_columns: int = MAX_SCAN_COLUMNS
+    chunk_rows: int = SCAN_CHUNK_ROWS
+    redaction_workers: int = SCAN_REDACTION_WORKERS
+    sample_buffer_rows: int = SCAN_SAMPLE_BUFFER_ROWS
+    max_pdf_pages: int = MAX_SCAN_PDF_PAGES
+    pdf_page_workers: int = SCAN_PDF_PAGE_WORKERS
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from services.text_index import SOURCE_RANGE_ATTR
+
+# Reporters publish to the in-process store at most this often, and to the shared persist
+# callback (the scan_jobs row, read by other API processes) at most every persist interval.
+SCAN_PROGRESS_MIN_INTERVAL_SECONDS = max(0.0, float(os.getenv("SCAN_PROGRESS_MIN_INTERVAL_SECONDS", "0.5")))
+SCAN_PROGRESS_PERSIST_SECONDS = max(0.0, float(os.getenv("SCAN_PROGRESS_PERSIST_SECONDS", "5")))
+
+STAGE_QUEUED = "queued"
+STAGE_READING = "reading"
+STAGE_REDACTING = "redacting"
+STAGE_FINALIZING = "finalizing"
+STAGE_DONE = "done"
+
+ProgressSnapshot = dict[str, Any]
+
+_store_lock = threading.Lock()
+_progress_store: dict[int, ProgressSnapshot] = {}
+
+
+def publish_progress(job_id: int, snapshot: ProgressSnapshot) -> None:
+    with _store_lock:
+        _progress_store[int(job_id)] = dict(snapshot)
+
+
+def get_progress(job_id: int) -> Optional[ProgressSnapshot]:
+    with _store_lock:
+        snapshot = _progress_store.get(int(job_id))
+    return dict(snapshot) if snapshot is not None else None
+
+
+def clear_progress(job_id: int) -> None:
+    with _store_lock:
+        _progress_store.pop(int(job_id), None)
+
+
+class ScanProgressReporter:
+    """Track rows, chunks and source bytes for one scan and publish throttled snapshots.
+
+    ``bytes_processed`` is exact for sources read by byte range (indexed text files) and is
+    otherwise projected from the rows read against the estimated row count.
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        *,
+        publish: Callable[[int, ProgressSnapshot], None] = publish_progress,
+        persist: Callable[[int, ProgressSnapshot], None] | None = None,
+        min_interval: float = SCAN_PROGRESS_MIN_INTERVAL_SECONDS,
+        persist_interval: float = SCAN_PROGRESS_PERSIST_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.job_id = job_id
+        self._publish = publish
+        self._persist = persist
+        self._min_interval = min_interval
+        self._persist_interval = persist_interval
+        self._clock = clock
+        self._started = clock()
+        self._redacting_started: float | None = None
+        self._last_published: float | None = None
+        self._last_persisted: float | None = None
+        self.stage = STAGE_QUEUED
+        self.total_bytes = 0
+        self.estimated_total_rows: int | None = None
+        self.rows_exact = False
+        self.rows_processed = 0
+        self.chunks_done = 0
+        self._exact_bytes: int | None = None
+
+    def start(self, *, total_bytes: int) -> None:
+        self.total_bytes = max(0, int(total_bytes))
+        self.stage = STAGE_READING
+        self._emit(force=True)
+
+    def begin_redaction(self, *, estimated_total_rows: int | None, rows_exact: bool = False) -> None:
+        self.estimated_total_rows = estimated_total_rows
+        self.rows_exact = rows_exact
+        self.stage = STAGE_REDACTING
+        self._redacting_started = self._clock()
+        self._emit(force=True)
+
+    def advance(self, *, rows: int, source_byte_stop: int | None = None) -> None:
+        self.rows_processed += int(rows)
+        self.chunks_done += 1
+        if source_byte_stop is not None:
+            self._exact_bytes = int(source_byte_stop)
+        if self.estimated_total_rows is not None and self.rows_processed > self.estimated_total_rows:
+            # The estimate was low; the true total is at least what has been read.
+            self.estimated_total_rows = self.rows_processed
+        self._emit()
+
+    def finalizing(self) -> None:
+        self.stage = STAGE_FINALIZING
+        self._emit(force=True)
+
+    def finish(self) -> None:
+        self.stage = STAGE_DONE
+        self.estimated_total_rows = self.rows_processed
+        self.rows_exact = True
+        self._exact_bytes = self.total_bytes
+        self._emit(force=True)
+
+    def _fraction_done(self) -> float | None:
+        if self.stage == STAGE_DONE:
+            return 1.0
+        if self._exact_bytes is not None and self.total_bytes:
+            return min(1.0, self._exact_bytes / self.total_bytes)
+        if self.estimated_total_rows:
+            return min(1.0, self.rows_processed / self.estimated_total_rows)
+        return None
+
+    def snapshot(self) -> ProgressSnapshot:
+        now = self._clock()
+        fraction = self._fraction_done()
+        if self._exact_bytes is not None:
+            bytes_processed = self._exact_bytes
+        elif fraction is not None:
+            bytes_processed = round(self.total_bytes * fraction)
+        else:
+            bytes_processed = None
+
+        eta_seconds = None
+        if self.stage == STAGE_DONE:
+            eta_seconds = 0.0
+        elif self.stage == STAGE_REDACTING and fraction and self._redacting_started is not None:
+            redacting_elapsed = now - self._redacting_started
+            eta_seconds = round(redacting_elapsed * (1.0 - fraction) / fraction, 1)
+
+        # Reading, redacting and finalizing are weighted 5/90/5 so the percentage never runs backwards.
+        if self.stage == STAGE_DONE:
+            percent = 100
+        elif self.stage == STAGE_FINALIZING:
+            percent = 95
+        elif self.stage == STAGE_REDACTING:
+            percent = 5 + int(90 * (fraction or 0.0))
+        elif self.stage == STAGE_READING:
+            percent = 5
+        else:
+            percent = 0
+        return {
+            "stage": self.stage,
+            "percent": percent,
+            "rows_processed": self.rows_processed,
+            "estimated_total_rows": self.estimated_total_rows,
+            "rows_exact": self.rows_exact,
+            "chunks_done": self.chunks_done,
+            "bytes_processed": bytes_processed,
+            "total_bytes": self.total_bytes,
+            "elapsed_seconds": round(now - self._started, 1),
+            "eta_seconds": eta_seconds,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def _emit(self, *, force: bool = False) -> None:
+        now = self._clock()
+        if not force and self._last_published is not None and now - self._last_published < self._min_interval:
+            return
+        snapshot = self.snapshot()
+        self._last_published = now
+        self._publish(self.job_id, snapshot)
+        if self._persist is None:
+            return
+        if force or self._last_persisted is None or now - self._last_persisted >= self._persist_interval:
+            self._last_persisted = now
+            self._persist(self.job_id, snapshot)
+
+
+def track_source_positions(chunks: Iterable[pd.DataFrame], positions: deque) -> Iterator[pd.DataFrame]:
+    """Pass chunks through, remembering each one's source byte range end (or None) in order."""
+    for chunk in chunks:
+        source_range = chunk.attrs.get(SOURCE_RANGE_ATTR)
+        positions.append(source_range[2] if source_range is not None else None)
+        yield chunk
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+
+from database.models.scan_job import ScanJob
+from utils.plan_features import get_plan_features, normalize_tier
+
+# A queued job's effective weight grows linearly with its wait, gaining its base weight again for
+# every SCAN_SCHEDULER_AGING_SECONDS, so low-weight tenants are delayed behind busier, higher-tier
+# ones but never starved.
+SCAN_SCHEDULER_AGING_SECONDS = max(1.0, float(os.getenv("SCAN_SCHEDULER_AGING_SECONDS", "300")))
+SCAN_SCHEDULER_WINDOW = max(1, int(os.getenv("SCAN_SCHEDULER_WINDOW", "500")))
+# Only the oldest few jobs of each tenant are ranked, so one tenant's backlog cannot fill the
+# window and hide every other tenant's jobs.
+SCAN_SCHEDULER_TENANT_DEPTH = max(1, int(os.getenv("SCAN_SCHEDULER_TENANT_DEPTH", "4")))
+
+
+@dataclass(frozen=True)
+class QueuedScanJob:
+    job_id: int
+    tenant_key: str
+    tier: str
+    created_at: datetime
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def tenant_key(company_id: int | None, user_id: int | None) -> str:
+    # Users without a company are their own tenant.
+    return f"company:{company_id}" if company_id is not None else f"user:{user_id}"
+
+
+def _tenant_score(job: QueuedScanJob, active_jobs: int, now: datetime) -> float:
+    waited_seconds = max(0.0, (now - job.created_at).total_seconds())
+    weight = get_plan_features(job.tier)["scan_priority_weight"]
+    aged_weight = weight * (1.0 + waited_seconds / SCAN_SCHEDULER_AGING_SECONDS)
+    return (active_jobs + 1) / aged_weight
+
+
+def rank_queued_jobs(
+    candidates: Iterable[QueuedScanJob],
+    active_by_tenant: dict[str, int],
+    *,
+    now: datetime,
+) -> list[int]:
+    """Order queued jobs by weighted fair share across tenants.
+
+    Jobs stay FIFO within a tenant. Tenants already at their plan's concurrency cap are skipped.
+    Among the others, the head job with the lowest ``(active + 1) / aged_weight`` runs next, so a
+    tenant with many queued uploads cannot starve tenants with few.
+    """
+    queues: dict[str, list[QueuedScanJob]] = defaultdict(list)
+    for job in sorted(candidates, key=lambda item: (item.created_at, item.job_id)):
+        queues[job.tenant_key].append(job)
+
+    active = Counter(active_by_tenant)
+    ranked: list[int] = []
+    while queues:
+        eligible = [
+            (key, jobs[0])
+            for key, jobs in queues.items()
+            if active[key] < get_plan_features(jobs[0].tier)["max_concurrent_scans"]
+        ]
+        if not eligible:
+            break
+        key, job = min(
+            eligible,
+            key=lambda entry: (_tenant_score(entry[1], active[entry[0]], now), entry[1].created_at, entry[1].job_id),
+        )
+        ranked.append(job.job_id)
+        active[key] += 1
+        queues[key].pop(0)
+        if not queues[key]:
+            del queues[key]
+    return ranked
+
+
+def _leased_filter(now: datetime):
+    return and_(ScanJob.lease_owner.is_not(None), ScanJob.lease_expires_at >= now)
+
+
+def active_jobs_by_tenant(db: Session, *, now: datetime) -> dict[str, int]:
+    rows = (
+        db.query(ScanJob.company_id, ScanJob.user_id, func.count(ScanJob.id))
+        .filter(_leased_filter(now))
+        .group_by(ScanJob.company_id, ScanJob.user_id)
+        .all()
+    )
+    active: Counter[str] = Counter()
+    for company_id, user_id, count in rows:
+        active[tenant_key(company_id, user_id)] += int(count)
+    return dict(active)
+
+
+def schedule_claim_order(db: Session, claimable_filter, *, now: datetime) -> list[int]:
+    """Job ids in the order workers should try to claim them."""
+    tenant_position = (
+        func.row_number()
+        .over(
+            partition_by=(ScanJob.company_id, case((ScanJob.company_id.is_(None), ScanJob.user_id), else_=None)),
+            order_by=(ScanJob.created_at, ScanJob.id),
+        )
+        .label("tenant_position")
+    )
+    heads = (
+        db.query(ScanJob.id, ScanJob.company_id, ScanJob.user_id, ScanJob.tier, ScanJob.created_at, tenant_position)
+        .filter(claimable_filter)
+        .subquery()
+    )
+    rows = (
+        db.query(heads.c.id, heads.c.company_id, heads.c.user_id, heads.c.tier, heads.c.created_at)
+        .filter(heads.c.tenant_position <= SCAN_SCHEDULER_TENANT_DEPTH)
+        .order_by(heads.c.created_at, heads.c.id)
+        .limit(SCAN_SCHEDULER_WINDOW)
+        .all()
+    )
+    candidates = [
+        QueuedScanJob(
+            job_id=job_id,
+            tenant_key=tenant_key(company_id, user_id),
+            tier=normalize_tier(tier),
+            created_at=as_utc(created_at) or now,
+        )
+        for job_id, company_id, user_id, tier, created_at in rows
+    ]
+    return rank_queued_jobs(candidates, active_jobs_by_tenant(db, now=now), now=now)
@@ -1,31 +1,81 @@
+import hashlib
 import html as html_lib
 import io
 import json
 import logging
-import mimetypes
+import mmap
 import os
 import re
+import sys
+import threading
+import time
 import uuid
-import warnings
 import xml.etree.ElementTree as ET
-from dataclasses import asdict, dataclass
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 import joblib
 import numpy as np
 import pandas as pd
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", message="PyPDF2 is deprecated.*", category=DeprecationWarning)
-    from PyPDF2 import PdfReader
-from docx import Document
+from openpyxl import Workbook, load_workbook
 from sqlalchemy.exc import IntegrityError
 
 from database.database import SessionLocal
 from database.models.scan_results import ScanResult
+from models.pii_features import (
+    FEATURE_COLUMNS,
+    build_feature_frame,
+    contains_keyword,
+    contains_pattern,
+    ensure_model_feature_schema,
+)
 from services.retention_service import build_retention_expiration, resolve_retention_days
+from services.scan_formats import (
+    ScanFormat,
+    get_scan_format,
+    register_scan_format,
+    sniff_arrow_ipc,
+    sniff_html,
+    sniff_json,
+    sniff_ole2,
+    sniff_parquet,
+    sniff_pdf,
+    sniff_text,
+    sniff_xml,
+    sniff_zip_container,
+)
 from services.audit_service import record_audit_event
-from utils.constants import SUPPORTED_EXTENSIONS
+from services.columnar_stream import (
+    ARROW_IPC,
+    PARQUET,
+    columnar_chunk_sink,
+    columnar_row_count,
+    iter_columnar_frames,
+    read_columnar_bytes,
+    read_columnar_schema,
+    string_column_names,
+)
+from services.compressed_input import (
+    GZIP,
+    OUTPUT_EXTENSION_BY_COMPRESSION,
+    compressed_member_name,
+    compression_for_filename,
+    estimate_decompressed_size,
+    open_decompressed,
+    open_scan_source,
+    open_text_output,
+)
+from services.docx_stream import docx_paragraph_writer, iter_docx_text_blocks
+from services.pdf_extraction import count_pdf_pages, iter_pdf_page_texts, open_pdf_reader
+from services.prediction_batcher import predict_column_labels
+from services.redaction_executor import merge_type_counts, redact_chunks_in_parallel, redact_frame_in_parallel
+from services.scan_cancellation import ScanCanceledError, ScanCancellationToken
+from services.scan_limits import SCAN_CHUNK_ROWS, ScanLimits
+from services.scan_progress import ScanProgressReporter, track_source_positions
+from services.text_index import SOURCE_LINE_COUNT_ATTR, SOURCE_RANGE_ATTR, build_line_index, iter_line_ranges
 from utils.pii_taxonomy import (
     PII_ADDRESS,
     PII_DATE_OF_BIRTH,
@@ -39,25 +89,29 @@ from utils.pii_taxonomy import (
     get_policy_categories,
     map_legacy_label_to_taxonomy,
 )
-from utils.redaction import scan_and_redact_column_with_details
+from utils.redaction import redaction_cache_scope, scan_and_redact_column_with_details
 
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-MODEL_PATH = BASE_DIR / "models" / "xgboost_model.pkl"
+MODEL_PATH = Path(os.getenv("SCAN_MODEL_PATH") or BASE_DIR / "models" / "xgboost_model.pkl")
+NATIVE_MODEL_SUFFIXES = (".ubj", ".json")
+MODEL_REFRESH_SECONDS = max(0.0, float(os.getenv("SCAN_MODEL_REFRESH_SECONDS", "30")))
+MODEL_CACHE_MAX_ENTRIES = 4
 _xgb_model = None
+_active_model_artifact = None
+_model_lock = threading.Lock()
+_model_cache: "OrderedDict[str, ModelArtifact]" = OrderedDict()
+_model_last_checked = 0.0
 
-EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
-PHONE_RE = re.compile(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
-SSN_RE = re.compile(r"\d{3}-\d{2}-\d{4}")
-IP_RE = re.compile(r"(?:\d{1,3}\.){3}\d{1,3}")
-STREET_SUFFIXES = {"st", "street", "ave", "road", "rd", "blvd", "ln", "lane"}
 MAX_FEATURE_SAMPLE_VALUES = max(3, int(os.getenv("FEATURE_SAMPLE_VALUES", "15")))
-SCAN_CHUNK_ROWS = max(100, int(os.getenv("SCAN_CHUNK_ROWS", "1000")))
-MAX_SCAN_ROWS = max(1, int(os.getenv("MAX_SCAN_ROWS", "50000")))
-MAX_SCAN_CELLS = max(1, int(os.getenv("MAX_SCAN_CELLS", "500000")))
-MAX_SCAN_COLUMNS = max(1, int(os.getenv("MAX_SCAN_COLUMNS", "200")))
+SCAN_PDF_PAGES_PER_CHUNK = max(1, int(os.getenv("SCAN_PDF_PAGES_PER_CHUNK", "8")))
 XML_TAG_INVALID_CHARS_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+SPREADSHEET_FORMULA_RE = re.compile(r"^\s*[=+\-@]")
+JSON_STREAM_READ_CHARS = 1 << 16
+JSON_WHITESPACE = " \t\n\r"
+SCAN_SECONDS_PER_COST_UNIT = max(0.0, float(os.getenv("SCAN_SECONDS_PER_COST_UNIT", "0.5")))
+SCAN_SECONDS_PER_REDACTED_VALUE = max(0.0, float(os.getenv("SCAN_SECONDS_PER_REDACTED_VALUE", "0.002")))
 
 
 @dataclass(frozen=True)
@@ -81,11 +135,28 @@ class ScanPipelineResult:
 
 
 @dataclass(frozen=True)
-class ScanLimits:
-    max_rows: int = MAX_SCAN_ROWS
-    max_cells: int = MAX_SCAN_CELLS
-    max_columns: int = MAX_SCAN_COLUMNS
-    chunk_rows: int = SCAN_CHUNK_ROWS
+class ScanProbeResult:
+    filename: str
+    file_type: str
+    size_bytes: int
+    columns: list[str]
+    pii_columns: list[str]
+    detection_results: list[dict[str, object]]
+    sampled_rows: int
+    estimated_rows: int
+    row_count_exact: bool
+    within_limits: bool
+    estimated_scan_seconds: float
+
+
+@dataclass(frozen=True)
+class ModelArtifact:
+    path: str
+    sha256: str
+    format: str
+    size_bytes: int
+    mtime_ns: int
+    model: object
 
 
 @dataclass(frozen=True)
@@ -106,26 +177,143 @@ class ScanLimitError(ValueError):
         self.status_code = status_code
 
 
-def _load_xgboost_model(model_path: Path = MODEL_PATH):
+def _resolve_model_path(model_path: Path) -> Path:
+    """Prefer a native XGBoost export saved next to a legacy pickle of the same name."""
+    model_path = Path(model_path)
+    if model_path.suffix.lower() in NATIVE_MODEL_SUFFIXES:
+        return model_path
+    for suffix in NATIVE_MODEL_SUFFIXES:
+        candidate = model_path.with_suffix(suffix)
+        if candidate.is_file():
+            return candidate
+    return model_path
+
+
+def _load_native_xgboost_model(buffer: mmap.mmap):
+    """Load a native export from the mapped bytes that were just hashed.
+
+    XGBoost only accepts a path or a ``bytearray``, so the booster is built from one copy of the
+    file; the mapping itself serves the sha256 hash. Loading from that copy rather than the path
+    guarantees the model matches the recorded hash even if the file is replaced concurrently.
+    """
+    import xgboost as xgb
+
+    model = xgb.XGBClassifier()
+    model.load_model(bytearray(buffer))
+    return model
+
+
+def load_model_artifact(model_path: Path = MODEL_PATH) -> ModelArtifact:
+    resolved_path = _resolve_model_path(model_path)
     try:
-        return joblib.load(model_path)
+        stat = resolved_path.stat()
+        with open(resolved_path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            sha256 = hashlib.sha256(mapped).hexdigest()
+            with _model_lock:
+                cached = _model_cache.get(sha256)
+                if cached is not None:
+                    current = (str(resolved_path), stat.st_size, stat.st_mtime_ns)
+                    if (cached.path, cached.size_bytes, cached.mtime_ns) != current:
+                        # Same bytes touched or copied elsewhere: record the current stat so the
+                        # refresh poll stops seeing a change and re-hashing the file every time.
+                        cached = replace(cached, path=current[0], size_bytes=current[1], mtime_ns=current[2])
+                        _model_cache[sha256] = cached
+                    _model_cache.move_to_end(sha256)
+            if cached is not None:
+                return cached
+            if resolved_path.suffix.lower() in NATIVE_MODEL_SUFFIXES:
+                model = _load_native_xgboost_model(mapped)
+                model_format = resolved_path.suffix.lower().lstrip(".")
+            else:
+                model = joblib.load(resolved_path)
+                model_format = "pickle"
     except Exception as exc:
         raise RuntimeError(
             "StartupError: XGBoost model could not be loaded. "
             "Verify model file exists and is compatible with current environment."
         ) from exc
 
+    ensure_model_feature_schema(model)
+    artifact = ModelArtifact(
+        path=str(resolved_path),
+        sha256=sha256,
+        format=model_format,
+        size_bytes=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        model=model,
+    )
+    with _model_lock:
+        _model_cache[sha256] = artifact
+        while len(_model_cache) > MODEL_CACHE_MAX_ENTRIES:
+            _model_cache.popitem(last=False)
+    return artifact
+
+
+def _load_xgboost_model(model_path: Path = MODEL_PATH):
+    return load_model_artifact(model_path).model
+
+
+def _activate_model_artifact(artifact: ModelArtifact) -> None:
+    global _xgb_model, _active_model_artifact, _model_last_checked
+    with _model_lock:
+        previous = _active_model_artifact
+        _xgb_model = artifact.model
+        _active_model_artifact = artifact
+        _model_last_checked = time.monotonic()
+    if previous is None or previous.sha256 != artifact.sha256:
+        logger.info(
+            "Activated scan model path=%s format=%s sha256=%s",
+            artifact.path,
+            artifact.format,
+            artifact.sha256[:12],
+        )
+
 
 def initialize_scan_model(model_path: Path = MODEL_PATH):
-    global _xgb_model
     if _xgb_model is None:
-        _xgb_model = _load_xgboost_model(model_path)
+        _activate_model_artifact(load_model_artifact(model_path))
     return _xgb_model
 
 
+def reload_scan_model(model_path: Path | None = None) -> ModelArtifact:
+    """Load an artifact and swap it in; scans already running keep the model they started with."""
+    if model_path is None:
+        model_path = Path(_active_model_artifact.path) if _active_model_artifact is not None else MODEL_PATH
+    artifact = load_model_artifact(model_path)
+    _activate_model_artifact(artifact)
+    return artifact
+
+
+def refresh_scan_model_if_changed() -> None:
+    global _model_last_checked
+    artifact = _active_model_artifact
+    if artifact is None or time.monotonic() - _model_last_checked < MODEL_REFRESH_SECONDS:
+        return
+    _model_last_checked = time.monotonic()
+    try:
+        stat = os.stat(artifact.path)
+    except OSError:
+        logger.warning("Active scan model artifact is no longer readable at %s; keeping the loaded model.", artifact.path)
+        return
+    if (stat.st_mtime_ns, stat.st_size) == (artifact.mtime_ns, artifact.size_bytes):
+        return
+    try:
+        reload_scan_model(Path(artifact.path))
+    except Exception:
+        logger.exception("Failed to hot-swap scan model from %s; keeping sha256=%s.", artifact.path, artifact.sha256[:12])
+
+
+def get_active_model_artifact() -> ModelArtifact | None:
+    return _active_model_artifact
+
+
 def set_scan_model(model) -> None:
-    global _xgb_model
-    _xgb_model = model
+    global _xgb_model, _active_model_artifact
+    if model is not None:
+        ensure_model_feature_schema(model)
+    with _model_lock:
+        _xgb_model = model
+        _active_model_artifact = None
 
 
 def get_scan_model():
@@ -137,48 +325,43 @@ def get_scan_model():
 
 
 def _contains_dob_pattern(values: list[str]) -> bool:
-    dob_regex = re.compile(r"\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b")
-    return any(dob_regex.search(str(value)) for value in values) if values else False
+    return contains_pattern("dob", values)
 
 
 def _contains_gender_term(values: list[str]) -> bool:
-    gender_terms = {"male", "female", "man", "woman", "boy", "girl"}
-    return any(any(term in str(value).lower() for term in gender_terms) for value in values) if values else False
+    return contains_keyword("gender", values)
 
 
 def _contains_street_suffix(values: list[str]) -> bool:
-    return any(any(suffix in str(value).lower() for suffix in STREET_SUFFIXES) for value in values) if values else False
+    return contains_keyword("street_suffix", values)
 
 
 def _contains_city_name(values: list[str]) -> bool:
-    city_names = {"new york", "los angeles", "chicago", "houston", "phoenix"}
-    return any(any(city in str(value).lower() for city in city_names) for value in values) if values else False
+    return contains_keyword("city", values)
 
 
 def _contains_known_name(values: list[str]) -> bool:
-    known_names = {"john", "jane", "smith", "doe"}
-    return any(any(name in str(value).lower() for name in known_names) for value in values) if values else False
+    return contains_keyword("known_name", values)
 
 
 def _contains_zip_code_pattern(values: list[str]) -> bool:
-    zip_regex = re.compile(r"\b\d{5}(?:-\d{4})?\b")
-    return any(zip_regex.search(str(value)) for value in values) if values else False
+    return contains_pattern("zip", values)
 
 
 def _contains_phone_pattern(values: list[str]) -> bool:
-    return any(PHONE_RE.search(str(value)) for value in values) if values else False
+    return contains_pattern("phone", values)
 
 
 def _contains_email_pattern(values: list[str]) -> bool:
-    return any(EMAIL_RE.search(str(value)) for value in values) if values else False
+    return contains_pattern("email", values)
 
 
 def _contains_ssn_pattern(values: list[str]) -> bool:
-    return any(SSN_RE.search(str(value)) for value in values) if values else False
+    return contains_pattern("ssn", values)
 
 
 def _contains_ip_pattern(values: list[str]) -> bool:
-    return any(IP_RE.search(str(value)) for value in values) if values else False
+    return contains_pattern("ip", values)
 
 
 def _column_sample_values(series: pd.Series) -> list[str]:
@@ -421,15 +604,50 @@ def _enforce_tabular_limits(*, row_count: int, column_count: int, limits: ScanLi
         _raise_scan_limit("Uploaded file exceeds allowed processing limits")
 
 
-def _read_source_bytes(*, file_bytes: bytes | None, source_path: str | None) -> bytes:
+def _read_source_bytes(
+    *,
+    file_bytes: bytes | None,
+    source_path: str | None,
+    compression: str | None = None,
+) -> bytes:
     if file_bytes is not None:
-        return file_bytes
+        if compression is None:
+            return file_bytes
+        with open_decompressed(io.BytesIO(file_bytes), compression) as handle:
+            return handle.read()
     if not source_path:
         raise ValueError("Scan source is required.")
-    with open(source_path, "rb") as handle:
+    with open_scan_source(source_path) as handle:
         return handle.read()
 
 
+def _parse_pdf_bytes(source_bytes: bytes, limits: ScanLimits) -> pd.DataFrame:
+    reader = open_pdf_reader(io.BytesIO(source_bytes))
+    if len(reader.pages) > limits.max_pdf_pages:
+        _raise_scan_limit("Uploaded file exceeds allowed processing limits")
+    return pd.DataFrame({"text": [page.extract_text() or "" for page in reader.pages]})
+
+
+def _parse_text_bytes(source_bytes: bytes, limits: ScanLimits) -> pd.DataFrame:
+    return pd.DataFrame({"text": source_bytes.decode("utf-8", errors="ignore").splitlines()})
+
+
+def _parse_json_bytes(source_bytes: bytes, limits: ScanLimits) -> pd.DataFrame:
+    records = list(_iter_json_records(io.TextIOWrapper(io.BytesIO(source_bytes), encoding="utf-8-sig")))
+    return pd.json_normalize(records)
+
+
+def _parse_html_bytes(source_bytes: bytes, limits: ScanLimits) -> pd.DataFrame:
+    try:
+        tables = pd.read_html(io.BytesIO(source_bytes))
+        return tables[0] if tables else pd.DataFrame({"text": []})
+    except Exception:
+        raw = source_bytes.decode("utf-8", errors="ignore")
+        raw = re.sub(r"(?is)<(script|style).*?>.*?</\1>", "", raw)
+        text = re.sub(r"(?s)<.*?>", "\n", raw)
+        return pd.DataFrame({"text": [ln.strip() for ln in text.splitlines() if ln.strip()]})
+
+
 def _parse_to_dataframe(
     *,
     file_bytes: bytes | None,
@@ -437,60 +655,10 @@ def _parse_to_dataframe(
     filename: str,
     ext: str,
     limits: ScanLimits,
+    compression: str | None = None,
 ) -> pd.DataFrame:
-    source_bytes = _read_source_bytes(file_bytes=file_bytes, source_path=source_path)
-    file_format, _ = mimetypes.guess_type(filename)
-    file_format = file_format or ""
-
-    if ext == ".pdf":
-        reader = PdfReader(io.BytesIO(source_bytes))
-        if reader.is_encrypted:
-            try:
-                reader.decrypt("")
-            except Exception as exc:
-                raise ValueError("PDF is encrypted or requires a password.") from exc
-        texts = [page.extract_text() or "" for page in reader.pages]
-        parsed = pd.DataFrame({"text": texts})
-    elif ext == ".csv" or "csv" in file_format:
-        parsed = pd.read_csv(io.BytesIO(source_bytes))
-    elif ext == ".tsv":
-        parsed = pd.read_csv(io.BytesIO(source_bytes), sep="\t")
-    elif ext in {".xls", ".xlsx"} or "excel" in file_format:
-        parsed = pd.read_excel(io.BytesIO(source_bytes))
-    elif ext == ".json" or "json" in file_format:
-        data = json.load(io.BytesIO(source_bytes))
-        parsed = pd.json_normalize(data)
-    elif ext in {".txt", ".log"} or "plain" in file_format:
-        lines = io.BytesIO(source_bytes).read().decode("utf-8", errors="ignore").splitlines()
-        parsed = pd.DataFrame({"text": lines})
-    elif ext == ".xml" or "xml" in file_format:
-        tree = ET.parse(io.BytesIO(source_bytes))
-        root = tree.getroot()
-        parsed = pd.DataFrame([{child.tag: child.text for child in elem} for elem in root])
-    elif ext == ".docx":
-        doc = Document(io.BytesIO(source_bytes))
-        chunks: list[str] = []
-        for p in doc.paragraphs:
-            if p.text and p.text.strip():
-                chunks.append(p.text)
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text and cell.text.strip():
-                        chunks.append(cell.text)
-        parsed = pd.DataFrame({"text": chunks})
-    elif ext == ".html":
-        try:
-            tables = pd.read_html(io.BytesIO(source_bytes))
-            parsed = tables[0] if tables else pd.DataFrame({"text": []})
-        except Exception:
-            raw = io.BytesIO(source_bytes).read().decode("utf-8", errors="ignore")
-            raw = re.sub(r"(?is)<(script|style).*?>.*?</\1>", "", raw)
-            text = re.sub(r"(?s)<.*?>", "\n", raw)
-            lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-            parsed = pd.DataFrame({"text": lines})
-    else:
-        raise ValueError(f"Unsupported format: {file_format} / {ext}")
+    source_bytes = _read_source_bytes(file_bytes=file_bytes, source_path=source_path, compression=compression)
+    parsed = get_scan_format(ext).parse(source_bytes, limits)
 
     df = parsed if isinstance(parsed, pd.DataFrame) else pd.DataFrame({"text": parsed})
     if df.empty:
@@ -501,14 +669,26 @@ def _parse_to_dataframe(
 
 def _iter_csv_like_chunks(*, source_path: str, ext: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
     separator = "\t" if ext == ".tsv" else ","
-    with open(source_path, "r", encoding="utf-8", errors="ignore", newline="") as handle:
+    with io.TextIOWrapper(open_scan_source(source_path), encoding="utf-8", errors="ignore", newline="") as handle:
         for chunk in pd.read_csv(handle, chunksize=chunk_rows, sep=separator):
             yield chunk
 
 
-def _iter_text_chunks(*, source_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+def _iter_text_chunks(*, source_path: str, chunk_rows: int, max_rows: int | None = None) -> Iterator[pd.DataFrame]:
+    """Yield ``chunk_rows`` lines at a time from an mmap line index, or by reading a compressed stream."""
+    if compression_for_filename(source_path) is None:
+        line_index = build_line_index(source_path, lines_per_range=chunk_rows)
+        if max_rows is not None and line_index.line_count > max_rows:
+            _raise_scan_limit("Uploaded file exceeds allowed processing limits")
+        for (start, stop), lines in zip(line_index.ranges, iter_line_ranges(source_path, line_index.ranges)):
+            chunk = pd.DataFrame({"text": lines})
+            chunk.attrs[SOURCE_RANGE_ATTR] = (source_path, start, stop)
+            chunk.attrs[SOURCE_LINE_COUNT_ATTR] = line_index.line_count
+            yield chunk
+        return
+
     batch: list[str] = []
-    with open(source_path, "r", encoding="utf-8", errors="ignore") as handle:
+    with io.TextIOWrapper(open_scan_source(source_path), encoding="utf-8", errors="ignore") as handle:
         for line in handle:
             batch.append(line.rstrip("\n"))
             if len(batch) >= chunk_rows:
@@ -518,36 +698,255 @@ def _iter_text_chunks(*, source_path: str, chunk_rows: int) -> Iterator[pd.DataF
         yield pd.DataFrame({"text": batch})
 
 
-def _build_feature_dataframe_from_samples(features: list[str], parsed_values: list[list[str]]) -> pd.DataFrame:
-    x = pd.DataFrame(features, columns=["column"])
-    x["length"] = x["column"].apply(len)
-    x["num_underscores"] = x["column"].apply(lambda col: col.count("_"))
-    x["num_digits"] = x["column"].apply(lambda col: sum(c.isdigit() for c in col))
-    x["has_at"] = x["column"].apply(lambda col: int("@" in col))
-    x["has_email_keyword"] = x["column"].apply(lambda col: int("email" in col.lower()))
-    x["parsed_values"] = parsed_values
-
-    def pct_match(regex: re.Pattern, values: list[str]) -> float:
-        return float(np.mean([bool(regex.search(str(v))) for v in values])) if values else 0.0
-
-    x["pct_email_like"] = x["parsed_values"].apply(lambda vals: pct_match(EMAIL_RE, vals))
-    x["pct_phone_like"] = x["parsed_values"].apply(lambda vals: pct_match(PHONE_RE, vals))
-    x["pct_ssn_like"] = x["parsed_values"].apply(lambda vals: pct_match(SSN_RE, vals))
-    x["pct_ip_like"] = x["parsed_values"].apply(lambda vals: pct_match(IP_RE, vals))
-    x["avg_digits_per_val"] = x["parsed_values"].apply(
-        lambda vals: np.mean([sum(c.isdigit() for c in str(item)) for item in vals]) if vals else 0
+def _excel_header(header_row: tuple[object, ...]) -> list[str]:
+    # Match pandas.read_excel naming: blank headers become "Unnamed: <n>" and repeats get ".<k>" suffixes.
+    columns: list[str] = []
+    seen: dict[str, int] = {}
+    for position, value in enumerate(header_row):
+        name = f"Unnamed: {position}" if value is None or str(value).strip() == "" else str(value)
+        if name in seen:
+            seen[name] += 1
+            candidate = f"{name}.{seen[name]}"
+            while candidate in seen:
+                seen[name] += 1
+                candidate = f"{name}.{seen[name]}"
+            seen[candidate] = 0
+            name = candidate
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _iter_xlsx_chunks(*, source_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Stream the first worksheet row by row; blank rows are skipped as read_excel does."""
+    workbook = load_workbook(source_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+        columns = _excel_header(header_row)
+        width = len(columns)
+        batch: list[list[object]] = []
+        for row in rows:
+            values = list(row[:width])
+            if all(value is None or value == "" for value in values):
+                continue
+            values.extend([None] * (width - len(values)))
+            batch.append(values)
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame(batch, columns=columns, dtype=object)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns, dtype=object)
+    finally:
+        workbook.close()
+
+
+def _iter_xml_records(source) -> Iterator[dict[str, Optional[str]]]:
+    """Yield one ``{child tag: text}`` record per child of the root, releasing each element once read."""
+    depth = 0
+    root = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if root is None:
+                root = elem
+            continue
+        depth -= 1
+        if depth == 1:
+            yield {child.tag: child.text for child in elem}
+            root.remove(elem)
+
+
+def _iter_json_records(handle) -> Iterator[dict]:
+    """Decode JSON records incrementally from a text handle.
+
+    A top-level array is unwrapped into its elements; otherwise every top-level value is a record,
+    which covers both a single object and newline-delimited JSON.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    in_array = False
+    array_closed = False
+    expect_separator = False
+    after_separator = False
+    seen_value = False
+
+    def read_more() -> bool:
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        # Grow reads with the pending buffer so one large value is not re-decoded once per small read.
+        data = handle.read(max(JSON_STREAM_READ_CHARS, len(buffer) - position))
+        if not data:
+            eof = True
+            return False
+        buffer = buffer[position:] + data
+        position = 0
+        return True
+
+    while True:
+        while position < len(buffer) and buffer[position] in JSON_WHITESPACE:
+            position += 1
+        if position >= len(buffer):
+            if read_more():
+                continue
+            if in_array and not array_closed:
+                raise ValueError("Malformed JSON file.")
+            return
+
+        char = buffer[position]
+        if array_closed:
+            raise ValueError("Malformed JSON file.")
+        if in_array and char == "]":
+            if after_separator:
+                raise ValueError("Malformed JSON file.")
+            array_closed = True
+            position += 1
+            continue
+        if in_array and expect_separator:
+            if char != ",":
+                raise ValueError("Malformed JSON file.")
+            expect_separator = False
+            after_separator = True
+            position += 1
+            continue
+        if not seen_value and char == "[":
+            in_array = True
+            seen_value = True
+            position += 1
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as exc:
+            if read_more():
+                continue
+            raise ValueError("Malformed JSON file.") from exc
+        if end == len(buffer) and read_more():
+            # A number or literal at the end of the buffer may continue in the next read.
+            continue
+        position = end
+        seen_value = True
+        expect_separator = in_array
+        after_separator = False
+        if not isinstance(value, dict):
+            raise ValueError("JSON records must be objects.")
+        yield value
+
+
+def _flattened_json_keys(record: dict) -> list[str]:
+    # Same key order as pandas.json_normalize: top-level scalars first, then nested paths joined by ".".
+    keys = [str(key) for key, value in record.items() if not isinstance(value, dict)]
+
+    def walk(nested: dict, prefix: str) -> None:
+        for key, value in nested.items():
+            name = f"{prefix}.{key}"
+            if isinstance(value, dict):
+                walk(value, name)
+            else:
+                keys.append(name)
+
+    for key, value in record.items():
+        if isinstance(value, dict):
+            walk(value, str(key))
+    return keys
+
+
+def _iter_record_chunks(
+    *,
+    iter_records: Callable[[], Iterator[dict]],
+    record_columns: Callable[[dict], Iterable[str]],
+    build_frame: Callable[[list[dict], list[str]], pd.DataFrame],
+    limits: ScanLimits,
+) -> Iterator[pd.DataFrame]:
+    # Records may carry different fields, so a cheap first pass fixes the column set (in the
+    # first-seen order pandas would use) before any chunk is classified or written.
+    columns: dict[str, None] = {}
+    record_count = 0
+    for record in iter_records():
+        record_count += 1
+        for column in record_columns(record):
+            columns.setdefault(column)
+        if len(columns) > limits.max_columns or record_count > limits.max_rows:
+            _raise_scan_limit("Uploaded file exceeds allowed processing limits")
+
+    column_names = list(columns)
+    batch: list[dict] = []
+    for record in iter_records():
+        batch.append(record)
+        if len(batch) >= limits.chunk_rows:
+            yield build_frame(batch, column_names)
+            batch = []
+    if batch:
+        yield build_frame(batch, column_names)
+
+
+def _iter_xml_file_records(source_path: str) -> Iterator[dict[str, Optional[str]]]:
+    with open_scan_source(source_path) as handle:
+        yield from _iter_xml_records(handle)
+
+
+def _iter_xml_chunks(*, source_path: str, limits: ScanLimits) -> Iterator[pd.DataFrame]:
+    return _iter_record_chunks(
+        iter_records=lambda: _iter_xml_file_records(source_path),
+        record_columns=lambda record: record.keys(),
+        build_frame=lambda batch, columns: pd.DataFrame(batch, columns=columns),
+        limits=limits,
     )
-    x["avg_val_len"] = x["parsed_values"].apply(
-        lambda vals: np.mean([len(str(item)) for item in vals]) if vals else 0
+
+
+def _iter_json_file_records(source_path: str) -> Iterator[dict]:
+    with io.TextIOWrapper(open_scan_source(source_path), encoding="utf-8-sig") as handle:
+        yield from _iter_json_records(handle)
+
+
+def _iter_json_chunks(*, source_path: str, limits: ScanLimits) -> Iterator[pd.DataFrame]:
+    return _iter_record_chunks(
+        iter_records=lambda: _iter_json_file_records(source_path),
+        record_columns=_flattened_json_keys,
+        build_frame=lambda batch, columns: pd.json_normalize(batch).reindex(columns=columns),
+        limits=limits,
     )
-    x["has_dob_pattern"] = x["parsed_values"].apply(_contains_dob_pattern)
-    x["has_gender_term"] = x["parsed_values"].apply(_contains_gender_term)
-    x["has_street_suffix"] = x["parsed_values"].apply(_contains_street_suffix)
-    x["has_city_name"] = x["parsed_values"].apply(_contains_city_name)
-    x["has_known_name"] = x["parsed_values"].apply(_contains_known_name)
-    x["has_zip_pattern"] = x["parsed_values"].apply(_contains_zip_code_pattern)
-    x["has_phone_pattern"] = x["parsed_values"].apply(_contains_phone_pattern)
-    return x
+
+
+def _iter_pdf_chunks(*, source_path: str, limits: ScanLimits) -> Iterator[pd.DataFrame]:
+    page_count = count_pdf_pages(source_path)
+    if page_count > limits.max_pdf_pages:
+        _raise_scan_limit("Uploaded file exceeds allowed processing limits")
+    for texts in iter_pdf_page_texts(
+        source_path,
+        page_count=page_count,
+        pages_per_chunk=min(SCAN_PDF_PAGES_PER_CHUNK, limits.chunk_rows),
+        workers=limits.pdf_page_workers,
+    ):
+        yield pd.DataFrame({"text": texts})
+
+
+def _iter_docx_chunks(*, source_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    batch: list[str] = []
+    for text in iter_docx_text_blocks(source_path):
+        batch.append(text)
+        if len(batch) >= chunk_rows:
+            yield pd.DataFrame({"text": batch})
+            batch = []
+    if batch:
+        yield pd.DataFrame({"text": batch})
+
+
+def _iter_source_chunks(*, source_path: str, ext: str, limits: ScanLimits) -> Iterator[pd.DataFrame]:
+    scan_format = get_scan_format(ext)
+    if scan_format.iter_chunks is None:
+        raise ValueError(f"Format does not support streaming: {ext}")
+    return scan_format.iter_chunks(source_path, limits)
+
+
+def _build_feature_dataframe_from_samples(features: list[str], parsed_values: list[list[str]]) -> pd.DataFrame:
+    return build_feature_frame(features, parsed_values)
 
 
 def _build_feature_dataframe(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
@@ -567,30 +966,109 @@ def sanitize_xml_tag(column_name: str) -> str:
     return sanitized
 
 
-def _write_redacted_json_output(*, redacted_df: pd.DataFrame, redacted_path: str, scan_id: int | None) -> None:
-    with open(redacted_path, "w", encoding="utf-8") as handle:
-        handle.write('{"scan_id": ')
+def sanitize_spreadsheet_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Prefix cells that a spreadsheet would evaluate as formulas with a quote, one column at a time."""
+    sanitized: pd.DataFrame | None = None
+    for position in range(frame.shape[1]):
+        column = frame.iloc[:, position]
+        present = column.notna().to_numpy()
+        if not present.any():
+            continue
+        text = column[present].astype(str)
+        flagged = text.str.match(SPREADSHEET_FORMULA_RE).to_numpy(dtype=bool)
+        if not flagged.any():
+            continue
+        if sanitized is None:
+            sanitized = frame.copy()
+        values = column.to_numpy(dtype=object, copy=True)
+        values[np.flatnonzero(present)[flagged]] = ("'" + text[flagged]).to_numpy(dtype=object)
+        sanitized.isetitem(position, values)
+    return frame if sanitized is None else sanitized
+
+
+@contextmanager
+def _json_chunk_sink(redacted_path: str) -> Iterator[Callable[[pd.DataFrame], None]]:
+    """Stream ``{"results": [...]`` record by record; ``_finalize_json_output`` closes the object."""
+    first_record = True
+    with open_text_output(redacted_path, "w") as handle:
+        handle.write('{"results": [')
+
+        def write(chunk: pd.DataFrame) -> None:
+            nonlocal first_record
+            columns = chunk.columns.tolist()
+            for row in chunk.itertuples(index=False, name=None):
+                if not first_record:
+                    handle.write(", ")
+                json.dump(dict(zip(columns, row)), handle, ensure_ascii=False)
+                first_record = False
+
+        yield write
+        handle.write("]")
+
+
+def _finalize_json_output(redacted_path: str, scan_id: int | None) -> None:
+    # The scan id only exists once the result is persisted, after streamed records are on disk,
+    # so it is appended as the closing member rather than rewriting the file.
+    with open_text_output(redacted_path, "a") as handle:
+        handle.write(', "scan_id": ')
         json.dump(scan_id, handle)
-        handle.write(', "results": [')
-        first_record = True
-        for row in redacted_df.to_dict(orient="records"):
-            if not first_record:
-                handle.write(", ")
-            json.dump(row, handle, ensure_ascii=False)
-            first_record = False
-        handle.write("]}")
+        handle.write("}")
+
+
+@contextmanager
+def _docx_chunk_sink(redacted_path: str) -> Iterator[Callable[[pd.DataFrame], None]]:
+    with docx_paragraph_writer(redacted_path) as write_paragraph:
+
+        def write(chunk: pd.DataFrame) -> None:
+            if list(chunk.columns) == ["text"]:
+                for text in chunk["text"].fillna("").astype(str).tolist():
+                    write_paragraph(text)
+            else:
+                for row in chunk.itertuples(index=False, name=None):
+                    write_paragraph(" | ".join([str(value) for value in row]))
+
+        yield write
+
+
+def _write_redacted_json_output(*, redacted_df: pd.DataFrame, redacted_path: str, scan_id: int | None) -> None:
+    with _json_chunk_sink(redacted_path) as write_chunk:
+        write_chunk(redacted_df)
+    _finalize_json_output(redacted_path, scan_id)
+
+
+@contextmanager
+def _xml_chunk_sink(redacted_path: str) -> Iterator[Callable[[pd.DataFrame], None]]:
+    """Write ``<results>`` one ``<item>`` at a time instead of building the whole tree first."""
+    with open_text_output(redacted_path, "w") as handle:
+        handle.write("<?xml version='1.0' encoding='utf-8'?>\n<results>")
+
+        def write(chunk: pd.DataFrame) -> None:
+            fields = [(sanitize_xml_tag(col_name), str(col_name)) for col_name in chunk.columns]
+            for row in chunk.itertuples(index=False, name=None):
+                item = ET.Element("item")
+                for (sanitized_tag, original), value in zip(fields, row):
+                    child = ET.SubElement(item, sanitized_tag)
+                    child.set("original", original)
+                    child.text = "" if value is None else str(value)
+                handle.write(ET.tostring(item, encoding="unicode"))
+
+        yield write
+        handle.write("</results>")
 
 
 def _write_redacted_xml_output(*, redacted_df: pd.DataFrame, redacted_path: str) -> None:
-    root = ET.Element("results")
-    for _, row in redacted_df.iterrows():
-        item = ET.SubElement(root, "item")
-        for col_name, value in row.items():
-            sanitized_tag = sanitize_xml_tag(col_name)
-            child = ET.SubElement(item, sanitized_tag)
-            child.set("original", str(col_name))
-            child.text = "" if value is None else str(value)
-    ET.ElementTree(root).write(redacted_path, encoding="utf-8", xml_declaration=True)
+    with _xml_chunk_sink(redacted_path) as write_chunk:
+        write_chunk(redacted_df)
+
+
+def _write_redacted_html_output(redacted_df: pd.DataFrame, redacted_path: str, scan_id: int | None = None) -> None:
+    if list(redacted_df.columns) != ["text"]:
+        html_out = redacted_df.to_html(index=False)
+    else:
+        text_blob = "\n".join(redacted_df["text"].fillna("").astype(str).tolist())
+        html_out = "<pre>" + html_lib.escape(text_blob) + "</pre>"
+    with open(redacted_path, "w", encoding="utf-8") as handle:
+        handle.write(html_out)
 
 
 def _write_redacted_file(
@@ -600,66 +1078,16 @@ def _write_redacted_file(
     *,
     scan_id: int | None = None,
 ) -> None:
-    if ext == ".csv":
-        redacted_df.to_csv(redacted_path, index=False)
-    elif ext == ".tsv":
-        redacted_df.to_csv(redacted_path, index=False, sep="\t")
-    elif ext in {".txt", ".log"}:
-        redacted_df.to_csv(redacted_path, index=False)
-    elif ext in {".xlsx", ".xls"}:
-        redacted_df.to_excel(redacted_path, index=False)
-    elif ext == ".json":
-        _write_redacted_json_output(redacted_df=redacted_df, redacted_path=redacted_path, scan_id=scan_id)
-    elif ext == ".xml":
-        _write_redacted_xml_output(redacted_df=redacted_df, redacted_path=redacted_path)
-    elif ext == ".docx":
-        out = Document()
-        if list(redacted_df.columns) == ["text"]:
-            for text in redacted_df["text"].fillna("").astype(str).tolist():
-                out.add_paragraph(text)
-        else:
-            for _, row in redacted_df.iterrows():
-                out.add_paragraph(" | ".join([str(value) for value in row.values]))
-        out.save(redacted_path)
-    elif ext == ".html":
-        if list(redacted_df.columns) != ["text"]:
-            html_out = redacted_df.to_html(index=False)
-        else:
-            text_blob = "\n".join(redacted_df["text"].fillna("").astype(str).tolist())
-            html_out = "<pre>" + html_lib.escape(text_blob) + "</pre>"
-        with open(redacted_path, "w", encoding="utf-8") as handle:
-            handle.write(html_out)
-    else:
-        redacted_df.to_csv(redacted_path, index=False)
+    scan_format = _output_scan_format(ext)
+    if scan_format.sanitize_formulas:
+        redacted_df = sanitize_spreadsheet_frame(redacted_df)
+    scan_format.write(redacted_df, redacted_path, scan_id)
 
 
 def _predict_pii_columns(df: pd.DataFrame, model=None) -> tuple[list[str], list[dict[str, object]]]:
     x, features = _build_feature_dataframe(df)
     active_model = model or get_scan_model()
-    predictions = active_model.predict(
-        x[
-            [
-                "length",
-                "num_underscores",
-                "num_digits",
-                "has_at",
-                "has_email_keyword",
-                "pct_email_like",
-                "pct_phone_like",
-                "pct_ssn_like",
-                "pct_ip_like",
-                "avg_digits_per_val",
-                "avg_val_len",
-                "has_dob_pattern",
-                "has_gender_term",
-                "has_street_suffix",
-                "has_city_name",
-                "has_known_name",
-                "has_zip_pattern",
-                "has_phone_pattern",
-            ]
-        ]
-    )
+    predictions = predict_column_labels(active_model, x[FEATURE_COLUMNS])
     sample_map = {column: _column_sample_values(df[column]) for column in features}
     pii_columns: list[str] = []
     detection_results: list[dict[str, object]] = []
@@ -677,7 +1105,13 @@ def _apply_redactions(
     df: pd.DataFrame,
     pii_columns: list[str],
     aggressive: bool,
+    *,
+    workers: int = 1,
+    block_rows: int = SCAN_CHUNK_ROWS,
 ) -> tuple[pd.DataFrame, int, int, dict[str, int]]:
+    if workers > 1 and pii_columns and (len(pii_columns) > 1 or len(df) > block_rows):
+        return redact_frame_in_parallel(df, pii_columns, aggressive, workers=workers, block_rows=block_rows)
+
     redacted_df = df.copy()
     total_redacted = 0
     total_values = 0
@@ -690,26 +1124,20 @@ def _apply_redactions(
         redacted_df[col] = redacted_col
         total_redacted += redacted_count
         total_values += col_total
-        for label, count in column_type_counts.items():
-            redacted_type_counts[label] = redacted_type_counts.get(label, 0) + count
+        merge_type_counts(redacted_type_counts, column_type_counts)
 
     return redacted_df, total_redacted, total_values, redacted_type_counts
 
 
-def _collect_chunked_metadata(
+def _iter_limited_chunks(
     *,
     source_path: str,
     ext: str,
     limits: ScanLimits,
-) -> tuple[list[str], dict[str, list[str]], int, int]:
-    iterator = (
-        _iter_csv_like_chunks(source_path=source_path, ext=ext, chunk_rows=limits.chunk_rows)
-        if ext in {".csv", ".tsv"}
-        else _iter_text_chunks(source_path=source_path, chunk_rows=limits.chunk_rows)
-    )
+) -> Iterator[pd.DataFrame]:
+    iterator = _iter_source_chunks(source_path=source_path, ext=ext, limits=limits)
 
     features: list[str] | None = None
-    sample_map: dict[str, list[str]] = {}
     total_rows = 0
     total_cells = 0
 
@@ -720,7 +1148,6 @@ def _collect_chunked_metadata(
             features = chunk.columns.tolist()
             if len(features) > limits.max_columns:
                 _raise_scan_limit("Uploaded file exceeds allowed processing limits")
-            sample_map = {column: [] for column in features}
         elif chunk.columns.tolist() != features:
             raise ValueError("Malformed tabular file.")
 
@@ -729,18 +1156,39 @@ def _collect_chunked_metadata(
         total_cells += chunk_rows * len(features)
         if total_rows > limits.max_rows or total_cells > limits.max_cells:
             _raise_scan_limit("Uploaded file exceeds allowed processing limits")
-
-        for column in features:
-            current_samples = sample_map[column]
-            if len(current_samples) >= MAX_FEATURE_SAMPLE_VALUES:
-                continue
-            values = chunk[column].dropna().astype(str).tolist()
-            remaining = MAX_FEATURE_SAMPLE_VALUES - len(current_samples)
-            current_samples.extend(values[:remaining])
+        yield chunk
 
     if not features or total_rows == 0:
         raise ValueError("File is empty or not supported.")
-    return features, sample_map, total_rows, total_cells
+
+
+def _extend_sample_map(sample_map: dict[str, list[str]], chunk: pd.DataFrame) -> bool:
+    """Top up per-column samples from ``chunk``; returns True once every column is full."""
+    full = True
+    for column in chunk.columns:
+        current_samples = sample_map.setdefault(column, [])
+        remaining = MAX_FEATURE_SAMPLE_VALUES - len(current_samples)
+        if remaining > 0:
+            current_samples.extend(chunk[column].dropna().astype(str).tolist()[:remaining])
+        if len(current_samples) < MAX_FEATURE_SAMPLE_VALUES:
+            full = False
+    return full
+
+
+def _cancellable_chunks(
+    chunks: Iterable[pd.DataFrame],
+    cancellation: ScanCancellationToken | None,
+) -> Iterator[pd.DataFrame]:
+    for chunk in chunks:
+        if cancellation is not None:
+            cancellation.raise_if_canceled()
+        yield chunk
+
+
+def _replay_buffered_chunks(buffered: deque[pd.DataFrame], remaining: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    while buffered:
+        yield buffered.popleft()
+    yield from remaining
 
 
 def _predict_pii_columns_from_sample_map(
@@ -751,30 +1199,7 @@ def _predict_pii_columns_from_sample_map(
 ) -> tuple[list[str], list[dict[str, object]]]:
     feature_frame = _build_feature_dataframe_from_samples(features, [sample_map.get(column, []) for column in features])
     active_model = model or get_scan_model()
-    predictions = active_model.predict(
-        feature_frame[
-            [
-                "length",
-                "num_underscores",
-                "num_digits",
-                "has_at",
-                "has_email_keyword",
-                "pct_email_like",
-                "pct_phone_like",
-                "pct_ssn_like",
-                "pct_ip_like",
-                "avg_digits_per_val",
-                "avg_val_len",
-                "has_dob_pattern",
-                "has_gender_term",
-                "has_street_suffix",
-                "has_city_name",
-                "has_known_name",
-                "has_zip_pattern",
-                "has_phone_pattern",
-            ]
-        ]
-    )
+    predictions = predict_column_labels(active_model, feature_frame[FEATURE_COLUMNS])
     pii_columns: list[str] = []
     detection_results: list[dict[str, object]] = []
     for column, is_pii in zip(features, predictions):
@@ -787,48 +1212,184 @@ def _predict_pii_columns_from_sample_map(
     return pii_columns, detection_results
 
 
+@contextmanager
+def _delimited_chunk_sink(redacted_path: str, ext: str) -> Iterator[Callable[[pd.DataFrame], None]]:
+    first_chunk = True
+    with open_text_output(redacted_path, "w", newline="") as handle:
+
+        def write(chunk: pd.DataFrame) -> None:
+            nonlocal first_chunk
+            chunk.to_csv(handle, index=False, sep="\t" if ext == ".tsv" else ",", header=first_chunk)
+            first_chunk = False
+
+        yield write
+
+
+@contextmanager
+def _xlsx_chunk_sink(redacted_path: str) -> Iterator[Callable[[pd.DataFrame], None]]:
+    # Write-only workbooks spool rows to a temporary file, so memory stays bounded by the chunk size.
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Sheet1")
+    header_written = False
+
+    def write(chunk: pd.DataFrame) -> None:
+        nonlocal header_written
+        if not header_written:
+            worksheet.append([str(column) for column in chunk.columns])
+            header_written = True
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            worksheet.append(list(row))
+
+    yield write
+    workbook.save(redacted_path)
+
+
+def _output_scan_format(ext: str) -> ScanFormat:
+    try:
+        return get_scan_format(ext)
+    except ValueError:
+        return get_scan_format(".csv")
+
+
+def _open_chunk_sink(redacted_path: str, ext: str, source_path: str | None = None):
+    scan_format = _output_scan_format(ext)
+    if scan_format.open_sink is None:
+        raise ValueError(f"Format does not support streaming output: {ext}")
+    return scan_format.open_sink(redacted_path, source_path)
+
+
 def _write_chunked_redacted_output(
     *,
-    source_path: str,
+    chunks: Iterable[pd.DataFrame],
     ext: str,
     redacted_path: str,
     pii_columns: list[str],
     limits: ScanLimits,
     aggressive: bool,
+    source_path: str | None = None,
+    progress: ScanProgressReporter | None = None,
+    cancellation: ScanCancellationToken | None = None,
 ) -> tuple[int, int, dict[str, int]]:
-    iterator = (
-        _iter_csv_like_chunks(source_path=source_path, ext=ext, chunk_rows=limits.chunk_rows)
-        if ext in {".csv", ".tsv"}
-        else _iter_text_chunks(source_path=source_path, chunk_rows=limits.chunk_rows)
-    )
     total_redacted = 0
     total_values = 0
     redacted_type_counts: dict[str, int] = {}
-    first_chunk = True
-
-    for chunk in iterator:
-        redacted_chunk, redacted_count, chunk_total_values, chunk_type_counts = _apply_redactions(
-            chunk,
+    # Checked before each chunk is read, so a canceled scan also stops feeding the redaction pool.
+    chunks = _cancellable_chunks(chunks, cancellation)
+    # Redacted chunks come back in input order, so each one pops the source position of its input.
+    source_positions: deque[int | None] = deque()
+    if progress is not None:
+        chunks = track_source_positions(chunks, source_positions)
+
+    if limits.redaction_workers > 1 and pii_columns:
+        redacted_chunks = redact_chunks_in_parallel(
+            chunks,
             pii_columns,
             aggressive,
+            workers=limits.redaction_workers,
         )
-        total_redacted += redacted_count
-        total_values += chunk_total_values
-        for label, count in chunk_type_counts.items():
-            redacted_type_counts[label] = redacted_type_counts.get(label, 0) + count
-
-        redacted_chunk.to_csv(
-            redacted_path,
-            index=False,
-            sep="\t" if ext == ".tsv" else ",",
-            mode="w" if first_chunk else "a",
-            header=first_chunk,
-        )
-        first_chunk = False
+    else:
+        redacted_chunks = (_apply_redactions(chunk, pii_columns, aggressive) for chunk in chunks)
+
+    sanitize_formulas = _output_scan_format(ext).sanitize_formulas
+    with _open_chunk_sink(redacted_path, ext, source_path) as write_chunk:
+        for redacted_chunk, redacted_count, chunk_total_values, chunk_type_counts in redacted_chunks:
+            total_redacted += redacted_count
+            total_values += chunk_total_values
+            merge_type_counts(redacted_type_counts, chunk_type_counts)
+
+            if sanitize_formulas:
+                redacted_chunk = sanitize_spreadsheet_frame(redacted_chunk)
+            write_chunk(redacted_chunk)
+            if progress is not None:
+                progress.advance(rows=len(redacted_chunk), source_byte_stop=source_positions.popleft())
 
     return total_redacted, total_values, redacted_type_counts
 
 
+def _restrict_to_redactable_columns(
+    *,
+    ext: str,
+    source: str | bytes,
+    pii_columns: list[str],
+    detection_results: list[dict[str, object]],
+) -> tuple[list[str], list[dict[str, object]]]:
+    redactable_columns = get_scan_format(ext).redactable_columns
+    if redactable_columns is None:
+        return pii_columns, detection_results
+    allowed_columns = redactable_columns(source)
+    return (
+        [column for column in pii_columns if column in allowed_columns],
+        [result for result in detection_results if result["column"] in allowed_columns],
+    )
+
+
+def _run_single_pass_chunked_scan(
+    *,
+    source_path: str,
+    ext: str,
+    redacted_path: str,
+    limits: ScanLimits,
+    aggressive: bool,
+    model=None,
+    progress: ScanProgressReporter | None = None,
+    cancellation: ScanCancellationToken | None = None,
+) -> tuple[list[str], list[dict[str, object]], int, int, dict[str, int]]:
+    """Classify from the leading rows, then redact those rows and stream the rest in the same read."""
+    chunks = _iter_limited_chunks(source_path=source_path, ext=ext, limits=limits)
+    buffered: deque[pd.DataFrame] = deque()
+    buffered_rows = 0
+    sample_map: dict[str, list[str]] = {}
+    exhausted = True
+
+    for chunk in _cancellable_chunks(chunks, cancellation):
+        buffered.append(chunk)
+        buffered_rows += len(chunk)
+        if _extend_sample_map(sample_map, chunk) or buffered_rows >= limits.sample_buffer_rows:
+            exhausted = False
+            break
+
+    pii_columns, detection_results = _predict_pii_columns_from_sample_map(
+        features=list(sample_map),
+        sample_map=sample_map,
+        model=model,
+    )
+    pii_columns, detection_results = _restrict_to_redactable_columns(
+        ext=ext,
+        source=source_path,
+        pii_columns=pii_columns,
+        detection_results=detection_results,
+    )
+    if progress is not None:
+        estimated_rows, rows_exact = _estimate_row_count(
+            scan_format=get_scan_format(ext),
+            source_path=source_path,
+            sample=pd.concat(buffered, ignore_index=True),
+            size_bytes=estimate_payload_bytes(source_path)[0],
+            exhausted=exhausted,
+            indexed_rows=buffered[0].attrs.get(SOURCE_LINE_COUNT_ATTR) if buffered else None,
+        )
+        progress.begin_redaction(estimated_total_rows=estimated_rows, rows_exact=rows_exact)
+    try:
+        total_redacted, total_values, redacted_type_counts = _write_chunked_redacted_output(
+            chunks=_replay_buffered_chunks(buffered, chunks),
+            ext=ext,
+            redacted_path=redacted_path,
+            pii_columns=pii_columns,
+            limits=limits,
+            aggressive=aggressive,
+            source_path=source_path,
+            progress=progress,
+            cancellation=cancellation,
+        )
+    except Exception:
+        # Limits and cancellation are enforced while streaming, so a rejected file may already have a
+        # partial output on disk.
+        if os.path.exists(redacted_path):
+            os.remove(redacted_path)
+        raise
+    return pii_columns, detection_results, total_redacted, total_values, redacted_type_counts
+
+
 def _persist_scan_result(
     *,
     context: ScanContext,
@@ -924,6 +1485,27 @@ def _persist_scan_result(
             db.close()
 
 
+def _resolve_source_format(
+    *,
+    filename: str,
+    source_path: str | None,
+    file_bytes: bytes | None = None,
+) -> tuple[str, str | None, ScanFormat]:
+    compression = compression_for_filename(filename)
+    format_filename = filename
+    if compression is not None:
+        compressed_source = source_path or io.BytesIO(file_bytes or b"")
+        format_filename = compressed_member_name(compressed_source, compression, filename)
+    ext = os.path.splitext(format_filename)[1].lower()
+    try:
+        scan_format = get_scan_format(ext)
+    except ValueError as exc:
+        raise ValueError("Unsupported file type.") from exc
+    if compression is not None and not scan_format.accepts_compressed:
+        raise ValueError("Compressed uploads are not supported for this file type.")
+    return ext, compression, scan_format
+
+
 def run_scan_pipeline(
     *,
     file_bytes: bytes | None = None,
@@ -933,66 +1515,123 @@ def run_scan_pipeline(
     model=None,
     limits: ScanLimits | None = None,
     aggressive: bool = False,
+    compress_output: bool = False,
+    progress: ScanProgressReporter | None = None,
+    cancellation: ScanCancellationToken | None = None,
 ) -> ScanPipelineResult:
-    ext = os.path.splitext(filename)[1].lower()
-    if ext not in SUPPORTED_EXTENSIONS:
-        raise ValueError("Unsupported file type.")
+    ext, compression, scan_format = _resolve_source_format(
+        filename=filename,
+        source_path=source_path,
+        file_bytes=file_bytes,
+    )
+    stream_from_disk = bool(source_path) and scan_format.streaming
+    output_suffix = ""
+    if compress_output and scan_format.accepts_compressed:
+        output_suffix = OUTPUT_EXTENSION_BY_COMPRESSION[compression or GZIP]
 
     os.makedirs("redacted", exist_ok=True)
     effective_limits = limits or ScanLimits()
+    if model is None:
+        refresh_scan_model_if_changed()
+        model = get_scan_model()
 
     file_id = str(uuid.uuid4())
-    redacted_path = os.path.join("redacted", f"redacted_{file_id}{ext}")
-    if source_path and ext in {".csv", ".tsv", ".txt", ".log"}:
-        features, sample_map, _, _ = _collect_chunked_metadata(
-            source_path=source_path,
-            ext=ext,
-            limits=effective_limits,
-        )
-        pii_columns, detection_results = _predict_pii_columns_from_sample_map(
-            features=features,
-            sample_map=sample_map,
-            model=model,
-        )
-        total_redacted, total_values, redacted_type_counts = _write_chunked_redacted_output(
-            source_path=source_path,
-            ext=ext,
-            redacted_path=redacted_path,
-            pii_columns=pii_columns,
-            limits=effective_limits,
-            aggressive=aggressive,
-        )
-    else:
-        df = _parse_to_dataframe(
-            file_bytes=file_bytes,
-            source_path=source_path,
-            filename=filename,
-            ext=ext,
-            limits=effective_limits,
-        )
-        pii_columns, detection_results = _predict_pii_columns(df, model=model)
-        redacted_df, total_redacted, total_values, redacted_type_counts = _apply_redactions(
-            df,
-            pii_columns,
-            aggressive,
-        )
+    redacted_path = os.path.join("redacted", f"redacted_{file_id}{ext}{output_suffix}")
+    if progress is not None:
+        progress.start(total_bytes=os.path.getsize(source_path) if source_path else len(file_bytes or b""))
+    with redaction_cache_scope() as redaction_cache:
+        if stream_from_disk:
+            (
+                pii_columns,
+                detection_results,
+                total_redacted,
+                total_values,
+                redacted_type_counts,
+            ) = _run_single_pass_chunked_scan(
+                source_path=source_path,
+                ext=ext,
+                redacted_path=redacted_path,
+                limits=effective_limits,
+                aggressive=aggressive,
+                model=model,
+                progress=progress,
+                cancellation=cancellation,
+            )
+        else:
+            df = _parse_to_dataframe(
+                file_bytes=file_bytes,
+                source_path=source_path,
+                filename=filename,
+                ext=ext,
+                limits=effective_limits,
+                compression=compression,
+            )
+            pii_columns, detection_results = _predict_pii_columns(df, model=model)
+            pii_columns, detection_results = _restrict_to_redactable_columns(
+                ext=ext,
+                source=source_path or file_bytes or b"",
+                pii_columns=pii_columns,
+                detection_results=detection_results,
+            )
+            if cancellation is not None:
+                cancellation.raise_if_canceled()
+            if progress is not None:
+                progress.begin_redaction(estimated_total_rows=len(df), rows_exact=True)
+            redacted_df, total_redacted, total_values, redacted_type_counts = _apply_redactions(
+                df,
+                pii_columns,
+                aggressive,
+                workers=effective_limits.redaction_workers,
+                block_rows=effective_limits.chunk_rows,
+            )
+            if progress is not None:
+                progress.advance(rows=len(df))
+
+    cache_stats = redaction_cache.stats()
+    logger.info(
+        "Redaction cache file=%s hits=%s misses=%s evictions=%s entries=%s",
+        filename,
+        cache_stats["hits"],
+        cache_stats["misses"],
+        cache_stats["evictions"],
+        cache_stats["entries"],
+    )
+
+    if cancellation is not None:
+        # Last chance to stop before a scan result is recorded; later stages are not interruptible.
+        try:
+            cancellation.raise_if_canceled()
+        except ScanCanceledError:
+            if os.path.exists(redacted_path):
+                os.remove(redacted_path)
+            raise
 
     risk_score = min(round((total_redacted / total_values) * 100), 100) if total_values > 0 else 0
+    if progress is not None:
+        progress.finalizing()
 
-    scan_id = _persist_scan_result(
-        context=context,
-        filename=filename,
-        ext=ext,
-        risk_score=risk_score,
-        pii_columns=pii_columns,
-        total_redacted=total_redacted,
-        redacted_type_counts=redacted_type_counts,
-        detection_results=detection_results,
-        public_redacted_path=redacted_path,
-    )
+    try:
+        scan_id = _persist_scan_result(
+            context=context,
+            filename=filename,
+            ext=ext,
+            risk_score=risk_score,
+            pii_columns=pii_columns,
+            total_redacted=total_redacted,
+            redacted_type_counts=redacted_type_counts,
+            detection_results=detection_results,
+            public_redacted_path=redacted_path,
+        )
+    except Exception:
+        # A streamed output is still unfinished here (JSON lacks its closing scan_id), so it must not outlive the scan.
+        if os.path.exists(redacted_path):
+            os.remove(redacted_path)
+        raise
 
-    if not (source_path and ext in {".csv", ".tsv", ".txt", ".log"}):
+    if not stream_from_disk:
         _write_redacted_file(redacted_df=redacted_df, redacted_path=redacted_path, ext=ext, scan_id=scan_id)
+    elif scan_format.finalize_output is not None:
+        scan_format.finalize_output(redacted_path, scan_id)
 
     logger.info(
         "Completed scan id=%s user_id=%s file=%s redacted_total=%s",
@@ -1013,3 +1652,315 @@ def run_scan_pipeline(
         detection_results=detection_results,
         scan_id=scan_id,
     )
+
+
+def estimate_scan_seconds(
+    *,
+    scan_format: ScanFormat,
+    size_bytes: int,
+    estimated_rows: int = 0,
+    pii_column_count: int = 0,
+    redaction_workers: int = 1,
+) -> float:
+    """Rough wall-clock projection: format parsing cost plus per-value redaction spread over the workers."""
+    parse_seconds = scan_format.estimate_cost(size_bytes) * SCAN_SECONDS_PER_COST_UNIT
+    redaction_seconds = estimated_rows * pii_column_count * SCAN_SECONDS_PER_REDACTED_VALUE
+    return round(parse_seconds + redaction_seconds / max(1, redaction_workers), 2)
+
+
+def estimate_payload_bytes(source_path: str) -> tuple[int, bool]:
+    """Bytes a scan will parse, and whether that is exact; compressed uploads report their payload size."""
+    size_bytes = os.path.getsize(source_path)
+    compression = compression_for_filename(source_path)
+    if compression is None:
+        return size_bytes, True
+    try:
+        return estimate_decompressed_size(source_path, compression)
+    except ValueError:
+        # Unreadable or unsafe payloads are rejected by the scan itself; the estimate just falls back.
+        return size_bytes, False
+
+
+def _estimate_row_count(
+    *,
+    scan_format: ScanFormat,
+    source_path: str,
+    sample: pd.DataFrame,
+    size_bytes: int,
+    exhausted: bool,
+    indexed_rows: int | None = None,
+) -> tuple[int, bool]:
+    if indexed_rows is not None:
+        return int(indexed_rows), True
+    if scan_format.count_rows is not None:
+        counted = scan_format.count_rows(source_path)
+        if counted is not None:
+            return int(counted), True
+    if exhausted or sample.empty:
+        return len(sample), True
+    # Extrapolate from the average width of the sampled rows rendered as delimited text; ``size_bytes``
+    # must be the decompressed payload size, since that is what the sampled rows were measured against.
+    sample_bytes = len(sample.to_csv(index=False, header=False).encode("utf-8"))
+    average_row_bytes = max(1.0, sample_bytes / len(sample))
+    return max(len(sample), round(size_bytes / average_row_bytes)), False
+
+
+def probe_scan_source(
+    *,
+    source_path: str,
+    filename: str,
+    model=None,
+    limits: ScanLimits | None = None,
+) -> ScanProbeResult:
+    """Classify columns from the header and a bounded leading sample without redacting or persisting.
+
+    Streaming formats stop reading once every column has a full sample or ``sample_buffer_rows``
+    rows were read; XML and JSON still parse the whole file once to fix their column set.
+    """
+    ext, _, scan_format = _resolve_source_format(filename=filename, source_path=source_path)
+    effective_limits = limits or ScanLimits()
+    if model is None:
+        refresh_scan_model_if_changed()
+        model = get_scan_model()
+    size_bytes = os.path.getsize(source_path)
+    payload_bytes, _ = estimate_payload_bytes(source_path)
+
+    sample_map: dict[str, list[str]] = {}
+    sampled: list[pd.DataFrame] = []
+    exhausted = True
+    if scan_format.streaming:
+        # Limits are reported rather than enforced, so the reader itself must not stop on them.
+        reading_limits = replace(
+            effective_limits,
+            max_rows=sys.maxsize,
+            max_cells=sys.maxsize,
+            max_columns=sys.maxsize,
+            max_pdf_pages=sys.maxsize,
+        )
+        chunks = _iter_source_chunks(source_path=source_path, ext=ext, limits=reading_limits)
+        try:
+            sampled_rows = 0
+            for chunk in chunks:
+                if chunk.empty:
+                    continue
+                sampled.append(chunk)
+                sampled_rows += len(chunk)
+                if _extend_sample_map(sample_map, chunk) or sampled_rows >= effective_limits.sample_buffer_rows:
+                    # One more chunk tells a small file (exact count) apart from one that must be extrapolated.
+                    next_chunk = next(chunks, None)
+                    if next_chunk is not None:
+                        sampled.append(next_chunk)
+                        exhausted = False
+                    break
+        finally:
+            close_chunks = getattr(chunks, "close", None)
+            if close_chunks is not None:
+                close_chunks()
+    else:
+        frame = _parse_to_dataframe(
+            file_bytes=None,
+            source_path=source_path,
+            filename=filename,
+            ext=ext,
+            limits=replace(effective_limits, max_rows=sys.maxsize, max_cells=sys.maxsize),
+        )
+        sampled.append(frame)
+        _extend_sample_map(sample_map, frame)
+
+    sample = pd.concat(sampled, ignore_index=True) if sampled else pd.DataFrame()
+    if sample.empty:
+        raise ValueError("File is empty or not supported.")
+    columns = [str(column) for column in sample.columns]
+    pii_columns, detection_results = _predict_pii_columns_from_sample_map(
+        features=list(sample_map),
+        sample_map=sample_map,
+        model=model,
+    )
+    pii_columns, detection_results = _restrict_to_redactable_columns(
+        ext=ext,
+        source=source_path,
+        pii_columns=pii_columns,
+        detection_results=detection_results,
+    )
+    estimated_rows, row_count_exact = _estimate_row_count(
+        scan_format=scan_format,
+        source_path=source_path,
+        sample=sample,
+        size_bytes=payload_bytes,
+        exhausted=exhausted,
+        indexed_rows=sampled[0].attrs.get(SOURCE_LINE_COUNT_ATTR) if sampled else None,
+    )
+    within_limits = (
+        len(columns) <= effective_limits.max_columns
+        and estimated_rows <= effective_limits.max_rows
+        and estimated_rows * max(len(columns), 1) <= effective_limits.max_cells
+    )
+    return ScanProbeResult(
+        filename=filename,
+        file_type=ext.lstrip("."),
+        size_bytes=size_bytes,
+        columns=columns,
+        pii_columns=pii_columns,
+        detection_results=detection_results,
+        sampled_rows=len(sample),
+        estimated_rows=estimated_rows,
+        row_count_exact=row_count_exact,
+        within_limits=within_limits,
+        estimated_scan_seconds=estimate_scan_seconds(
+            scan_format=scan_format,
+            size_bytes=payload_bytes,
+            estimated_rows=estimated_rows,
+            pii_column_count=len(pii_columns),
+            redaction_workers=effective_limits.redaction_workers,
+        ),
+    )
+
+
+def _register_builtin_scan_formats() -> None:
+    # Lambdas resolve the module-level helpers at call time so they stay patchable.
+    def delimited_sink(ext: str):
+        return lambda redacted_path, source_path=None: _delimited_chunk_sink(redacted_path, ext)
+
+    def csv_like_chunks(ext: str):
+        return lambda source_path, limits: _iter_csv_like_chunks(
+            source_path=source_path, ext=ext, chunk_rows=limits.chunk_rows
+        )
+
+    def text_chunks(source_path: str, limits: ScanLimits) -> Iterator[pd.DataFrame]:
+        return _iter_text_chunks(
+            source_path=source_path,
+            chunk_rows=limits.chunk_rows,
+            max_rows=min(limits.max_rows, limits.max_cells),
+        )
+
+    def columnar_format(name: str, kind: str, extensions: tuple[str, ...], sniff) -> ScanFormat:
+        # Only string columns are redacted and every other column is written back with its source type.
+        return ScanFormat(
+            name=name,
+            extensions=extensions,
+            sniff=sniff,
+            parse=lambda source_bytes, limits: read_columnar_bytes(source_bytes, kind),
+            iter_chunks=lambda source_path, limits: iter_columnar_frames(
+                source_path, kind, chunk_rows=limits.chunk_rows
+            ),
+            open_sink=lambda redacted_path, source_path=None: columnar_chunk_sink(
+                redacted_path,
+                kind,
+                schema=read_columnar_schema(source_path, kind) if source_path else None,
+            ),
+            redactable_columns=lambda source: string_column_names(source, kind),
+            count_rows=lambda source_path: columnar_row_count(source_path, kind),
+            cost_per_mb=0.5,
+        )
+
+    for scan_format in (
+        ScanFormat(
+            name="csv",
+            extensions=(".csv",),
+            sniff=sniff_text,
+            parse=lambda source_bytes, limits: pd.read_csv(io.BytesIO(source_bytes)),
+            iter_chunks=csv_like_chunks(".csv"),
+            open_sink=delimited_sink(".csv"),
+            sanitize_formulas=True,
+            accepts_compressed=True,
+        ),
+        ScanFormat(
+            name="tsv",
+            extensions=(".tsv",),
+            sniff=sniff_text,
+            parse=lambda source_bytes, limits: pd.read_csv(io.BytesIO(source_bytes), sep="\t"),
+            iter_chunks=csv_like_chunks(".tsv"),
+            open_sink=delimited_sink(".tsv"),
+            sanitize_formulas=True,
+            accepts_compressed=True,
+        ),
+        ScanFormat(
+            name="text",
+            extensions=(".txt", ".log"),
+            sniff=sniff_text,
+            parse=lambda source_bytes, limits: _parse_text_bytes(source_bytes, limits),
+            iter_chunks=text_chunks,
+            open_sink=delimited_sink(".txt"),
+            accepts_compressed=True,
+        ),
+        ScanFormat(
+            name="xlsx",
+            extensions=(".xlsx",),
+            sniff=sniff_zip_container,
+            parse=lambda source_bytes, limits: pd.read_excel(io.BytesIO(source_bytes)),
+            iter_chunks=lambda source_path, limits: _iter_xlsx_chunks(
+                source_path=source_path, chunk_rows=limits.chunk_rows
+            ),
+            open_sink=lambda redacted_path, source_path=None: _xlsx_chunk_sink(redacted_path),
+            sanitize_formulas=True,
+            cost_per_mb=3.0,
+        ),
+        ScanFormat(
+            # Legacy BIFF workbooks cannot be read row by row, so they stay on the in-memory path.
+            name="xls",
+            extensions=(".xls",),
+            sniff=sniff_ole2,
+            parse=lambda source_bytes, limits: pd.read_excel(io.BytesIO(source_bytes)),
+            write_frame=lambda frame, redacted_path, scan_id: frame.to_excel(redacted_path, index=False),
+            sanitize_formulas=True,
+            cost_per_mb=4.0,
+        ),
+        ScanFormat(
+            name="json",
+            extensions=(".json",),
+            sniff=sniff_json,
+            parse=lambda source_bytes, limits: _parse_json_bytes(source_bytes, limits),
+            iter_chunks=lambda source_path, limits: _iter_json_chunks(source_path=source_path, limits=limits),
+            open_sink=lambda redacted_path, source_path=None: _json_chunk_sink(redacted_path),
+            finalize_output=lambda redacted_path, scan_id: _finalize_json_output(redacted_path, scan_id),
+            cost_per_mb=1.5,
+            accepts_compressed=True,
+        ),
+        ScanFormat(
+            name="xml",
+            extensions=(".xml",),
+            sniff=sniff_xml,
+            parse=lambda source_bytes, limits: pd.DataFrame(list(_iter_xml_records(io.BytesIO(source_bytes)))),
+            iter_chunks=lambda source_path, limits: _iter_xml_chunks(source_path=source_path, limits=limits),
+            open_sink=lambda redacted_path, source_path=None: _xml_chunk_sink(redacted_path),
+            cost_per_mb=2.0,
+            accepts_compressed=True,
+        ),
+        ScanFormat(
+            name="pdf",
+            extensions=(".pdf",),
+            sniff=sniff_pdf,
+            parse=lambda source_bytes, limits: _parse_pdf_bytes(source_bytes, limits),
+            iter_chunks=lambda source_path, limits: _iter_pdf_chunks(source_path=source_path, limits=limits),
+            open_sink=delimited_sink(".pdf"),
+            count_rows=lambda source_path: count_pdf_pages(source_path),
+            cost_per_mb=8.0,
+        ),
+        ScanFormat(
+            name="docx",
+            extensions=(".docx",),
+            sniff=sniff_zip_container,
+            parse=lambda source_bytes, limits: pd.DataFrame(
+                {"text": list(iter_docx_text_blocks(io.BytesIO(source_bytes)))}
+            ),
+            iter_chunks=lambda source_path, limits: _iter_docx_chunks(
+                source_path=source_path, chunk_rows=limits.chunk_rows
+            ),
+            open_sink=lambda redacted_path, source_path=None: _docx_chunk_sink(redacted_path),
+            cost_per_mb=2.0,
+        ),
+        ScanFormat(
+            name="html",
+            extensions=(".html",),
+            sniff=sniff_html,
+            parse=lambda source_bytes, limits: _parse_html_bytes(source_bytes, limits),
+            write_frame=lambda frame, redacted_path, scan_id: _write_redacted_html_output(frame, redacted_path, scan_id),
+            cost_per_mb=1.5,
+        ),
+        columnar_format("parquet", PARQUET, (".parquet",), sniff_parquet),
+        columnar_format("arrow", ARROW_IPC, (".arrow", ".feather"), sniff_arrow_ipc),
+    ):
+        register_scan_format(scan_format, replace=True)
+
+
+_register_builtin_scan_formats()
@@ -0,0 +1,201 @@
+"""Standalone scan worker that drains the durable ``scan_jobs`` queue.
+
+Run one or more of these next to the API with ``SCAN_QUEUE_BACKEND=database``::
+
+    python -m services.scan_worker --concurrency 2
+
+API nodes then only accept uploads, and scan capacity scales with the number of workers. The
+database is the broker: workers lease rows, heartbeat while scanning and release on completion,
+so a job whose worker dies is picked up again once its lease expires.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+import threading
+import uuid
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from database.database import SessionLocal
+from services import startup_validation
+from services.redaction_executor import shutdown_redaction_pools
+from services.scan_cancellation import ScanCanceledError
+from services.scan_job_service import (
+    SCAN_JOB_LEASE_SECONDS,
+    claim_next_scan_job,
+    fail_exhausted_scan_job,
+    process_scan_job,
+    queued_job_arguments,
+    release_scan_job_lease,
+    renew_scan_job_lease,
+)
+
+logger = logging.getLogger(__name__)
+
+SCAN_WORKER_POLL_SECONDS = max(0.1, float(os.getenv("SCAN_WORKER_POLL_SECONDS", "2")))
+SCAN_WORKER_CONCURRENCY = max(1, int(os.getenv("SCAN_WORKER_CONCURRENCY", "1")))
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def load_scan_model():
+    """Load and validate the scan model before claiming anything, as API startup does.
+
+    Without it every claimed job would fail in ``get_scan_model``; a missing or mismatched
+    artifact should stop the worker instead.
+    """
+    return startup_validation._validate_model_loading()
+
+
+def _heartbeat_until_stopped(
+    *,
+    job_id: int,
+    worker_id: str,
+    lease_seconds: float,
+    stop: threading.Event,
+    session_factory: Callable[[], Session],
+) -> None:
+    interval = max(0.05, lease_seconds / 3)
+    while not stop.wait(interval):
+        db = session_factory()
+        try:
+            if not renew_scan_job_lease(db, job_id=job_id, worker_id=worker_id, lease_seconds=lease_seconds):
+                logger.warning("Lost lease on scan job %s held by %s.", job_id, worker_id)
+                return
+        except Exception:
+            logger.warning("Failed to renew lease on scan job %s.", job_id, exc_info=True)
+        finally:
+            db.close()
+
+
+def run_next_scan_job(
+    *,
+    worker_id: str,
+    lease_seconds: float = SCAN_JOB_LEASE_SECONDS,
+    session_factory: Callable[[], Session] = SessionLocal,
+    run_job: Callable[..., object] = process_scan_job,
+) -> bool:
+    """Claim and run one queued job; returns False when the queue was empty."""
+    db = session_factory()
+    try:
+        job = claim_next_scan_job(db, worker_id=worker_id, lease_seconds=lease_seconds)
+        if job is None:
+            return False
+        if fail_exhausted_scan_job(db, job):
+            logger.error("Scan job %s exceeded its attempt limit and was failed.", job.id)
+            return True
+        job_id = job.id
+        job_arguments = queued_job_arguments(job)
+    finally:
+        db.close()
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat_until_stopped,
+        kwargs={
+            "job_id": job_id,
+            "worker_id": worker_id,
+            "lease_seconds": lease_seconds,
+            "stop": stop,
+            "session_factory": session_factory,
+        },
+        name=f"scan-job-{job_id}-heartbeat",
+        daemon=True,
+    )
+    heartbeat.start()
+    try:
+        job_db = session_factory()
+        try:
+            run_job(**job_arguments, db_session=job_db)
+        finally:
+            job_db.close()
+    except ScanCanceledError:
+        logger.info("Scan job %s was canceled on worker %s.", job_id, worker_id)
+    except Exception:
+        # process_scan_job has already recorded the failure on the job row.
+        logger.warning("Scan job %s failed on worker %s.", job_id, worker_id, exc_info=True)
+    finally:
+        stop.set()
+        heartbeat.join()
+        db = session_factory()
+        try:
+            release_scan_job_lease(db, job_id=job_id, worker_id=worker_id)
+        finally:
+            db.close()
+    return True
+
+
+def _worker_loop(worker_id: str, *, poll_seconds: float, lease_seconds: float, stop: threading.Event) -> None:
+    while not stop.is_set():
+        try:
+            ran_job = run_next_scan_job(worker_id=worker_id, lease_seconds=lease_seconds)
+        except Exception:
+            logger.exception("Scan worker %s failed to claim a job.", worker_id)
+            ran_job = False
+        if not ran_job:
+            stop.wait(poll_seconds)
+
+
+def run_worker(
+    *,
+    concurrency: int = SCAN_WORKER_CONCURRENCY,
+    poll_seconds: float = SCAN_WORKER_POLL_SECONDS,
+    lease_seconds: float = SCAN_JOB_LEASE_SECONDS,
+    stop: threading.Event | None = None,
+) -> None:
+    stop = stop or threading.Event()
+    load_scan_model()
+    base_worker_id = default_worker_id()
+    threads = [
+        threading.Thread(
+            target=_worker_loop,
+            args=(f"{base_worker_id}/{slot}",),
+            kwargs={"poll_seconds": poll_seconds, "lease_seconds": lease_seconds, "stop": stop},
+            name=f"scan-worker-{slot}",
+        )
+        for slot in range(max(1, concurrency))
+    ]
+    logger.info("Scan worker %s started with %s slot(s).", base_worker_id, len(threads))
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1.0)
+    except KeyboardInterrupt:
+        logger.info("Scan worker %s stopping; in-flight jobs will finish first.", base_worker_id)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        shutdown_redaction_pools()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run queued scan jobs from the scan_jobs table.")
+    parser.add_argument("--concurrency", type=int, default=SCAN_WORKER_CONCURRENCY, help="jobs to run at once")
+    parser.add_argument("--poll-seconds", type=float, default=SCAN_WORKER_POLL_SECONDS, help="idle poll interval")
+    parser.add_argument("--once", action="store_true", help="drain the queue once and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    if args.once:
+        load_scan_model()
+        worker_id = default_worker_id()
+        try:
+            while run_next_scan_job(worker_id=worker_id):
+                pass
+        finally:
+            shutdown_redaction_pools()
+        return
+    run_worker(concurrency=args.concurrency, poll_seconds=args.poll_seconds)
+
+
+if __name__ == "__main__":
+    main()
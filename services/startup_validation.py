@@ -8,13 +8,13 @@ from sqlalchemy import inspect, text
 
 from database.database import ENV, engine
 from services.compliance_service import ensure_default_company_and_employee
-from services.scan_service import initialize_scan_model
+from services.scan_service import MODEL_PATH, get_active_model_artifact, initialize_scan_model
+from utils.constants import COLUMNAR_SUPPORT_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 MIGRATIONS_DIR = BASE_DIR / "migrations" / "versions"
-MODEL_PATH = BASE_DIR / "models" / "xgboost_model.pkl"
 FONT_PATH = BASE_DIR / "DejaVuSans.ttf"
 REQUIRED_DIRS = (
     BASE_DIR / "uploads",
@@ -26,7 +26,21 @@ REQUIRED_SCHEMA = {
     "pending_registrations": {"id", "email", "webauthn_user_handle", "challenge", "expires_at"},
     "refresh_sessions": {"id", "user_id", "refresh_jti_hash", "revoked", "created_at", "device_info"},
     "scan_results": {"id", "user_id", "company_id", "filename", "redacted_type_counts", "report_html_path", "report_pdf_path"},
-    "scan_jobs": {"id", "company_id", "user_id", "scan_result_id", "status", "created_at"},
+    "scan_jobs": {
+        "id",
+        "company_id",
+        "user_id",
+        "scan_result_id",
+        "status",
+        "created_at",
+        "payload_json",
+        "lease_owner",
+        "lease_expires_at",
+        "attempts",
+        "tier",
+        "progress_json",
+        "cancel_requested_at",
+    },
     "organization_memberships": {"id", "company_id", "user_id", "role", "status", "created_at"},
     "api_keys": {"id", "company_id", "created_by_user_id", "hashed_key", "created_at", "usage_count"},
     "security_events": {"id", "company_id", "user_id", "event_type", "severity", "created_at"},
@@ -264,7 +278,16 @@ def _validate_assets() -> None:
 
 def _validate_model_loading():
     model = initialize_scan_model(MODEL_PATH)
-    logger.info("Startup validation: XGBoost model loaded successfully from %s", MODEL_PATH)
+    artifact = get_active_model_artifact()
+    if artifact is not None:
+        logger.info(
+            "Startup validation: XGBoost model loaded successfully from %s (format=%s sha256=%s)",
+            artifact.path,
+            artifact.format,
+            artifact.sha256[:12],
+        )
+    else:
+        logger.info("Startup validation: XGBoost model loaded successfully from %s", MODEL_PATH)
     return model
 
 
@@ -287,6 +310,17 @@ def _validate_pdf_support() -> None:
     )
 
 
+def _validate_columnar_support() -> None:
+    if COLUMNAR_SUPPORT_AVAILABLE:
+        logger.info("Startup validation: Parquet and Arrow scans enabled via pyarrow.")
+        return
+
+    logger.warning(
+        "Startup validation: pyarrow not installed; .parquet, .arrow and .feather are left out of the "
+        "supported extensions and such uploads are refused as unsupported file types."
+    )
+
+
 def run_startup_validations():
     """
     Central startup validation entrypoint.
@@ -307,6 +341,7 @@ def run_startup_validations():
     _validate_assets()
     model = _validate_model_loading()
     _validate_pdf_support()
+    _validate_columnar_support()
     logger.info("Startup validation completed successfully.")
     return model
 
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import mmap
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+
+INDEX_BLOCK_BYTES = 1 << 24
+NEWLINE = 0x0A
+# Chunks built from an indexed file carry their byte range so workers can read the lines themselves.
+SOURCE_RANGE_ATTR = "source_byte_range"
+# ...and the file's total line count, so row estimates reuse the scan's index instead of rebuilding it.
+SOURCE_LINE_COUNT_ATTR = "source_line_count"
+
+
+@dataclass(frozen=True)
+class LineIndex:
+    ranges: list[tuple[int, int]]
+    line_count: int
+    size_bytes: int
+
+
+@contextmanager
+def _mapped(source_path: str) -> Iterator[mmap.mmap | bytes]:
+    with open(source_path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _scan_newlines(mapped, size: int, lines_per_range: int) -> tuple[list[int], int, bool]:
+    # Kept in its own frame so every NumPy view of the mapping is released before it closes.
+    data = np.frombuffer(mapped, dtype=np.uint8)
+    boundaries: list[int] = []
+    newline_count = 0
+    for block_start in range(0, size, INDEX_BLOCK_BYTES):
+        line_ends = np.flatnonzero(data[block_start : block_start + INDEX_BLOCK_BYTES] == NEWLINE) + (block_start + 1)
+        first_boundary = (-newline_count - 1) % lines_per_range
+        boundaries.extend(line_ends[first_boundary::lines_per_range].tolist())
+        newline_count += len(line_ends)
+    return boundaries, newline_count, bool(data[-1] == NEWLINE)
+
+
+def build_line_index(source_path: str, *, lines_per_range: int) -> LineIndex:
+    """Split a text file into byte ranges of ``lines_per_range`` lines in one vectorized pass.
+
+    Only range boundaries are kept, so the index stays small however many lines the file has.
+    Boundaries fall just after a ``\\n`` byte, which never occurs inside a multi-byte UTF-8
+    sequence, so every range decodes on its own.
+    """
+    lines_per_range = max(1, int(lines_per_range))
+    with _mapped(source_path) as mapped:
+        size = len(mapped)
+        if size == 0:
+            return LineIndex(ranges=[], line_count=0, size_bytes=0)
+
+        boundaries, newline_count, ends_with_newline = _scan_newlines(mapped, size, lines_per_range)
+
+    if not boundaries or boundaries[-1] < size:
+        boundaries.append(size)
+    starts = [0, *boundaries[:-1]]
+    line_count = newline_count + (0 if ends_with_newline else 1)
+    return LineIndex(ranges=list(zip(starts, boundaries)), line_count=line_count, size_bytes=size)
+
+
+def _decode_lines(raw: bytes) -> list[str]:
+    # Same line splitting as a text-mode file with universal newlines.
+    text = raw.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def read_line_range(source_path: str, start: int, stop: int) -> list[str]:
+    with _mapped(source_path) as mapped:
+        return _decode_lines(mapped[start:stop])
+
+
+def iter_line_ranges(source_path: str, ranges: list[tuple[int, int]]) -> Iterator[list[str]]:
+    with _mapped(source_path) as mapped:
+        for start, stop in ranges:
+            yield _decode_lines(mapped[start:stop])
@@ -8,7 +8,6 @@ from pathlib import Path
 
 import pandas as pd
 
-from routers import scans as scans_router
 from services import scan_service
 
 
@@ -83,15 +82,53 @@ def test_sanitize_xml_tag_normalizes_invalid_names():
     assert scan_service.sanitize_xml_tag("$$$") == "field"
 
 
-def test_csv_output_sanitization_prefixes_spreadsheet_formulas():
+def test_streaming_spreadsheet_writers_prefix_formulas_chunk_by_chunk():
     base = _make_local_test_dir()
-    output_path = base / "redacted.csv"
-    output_path.write_text("value\n=1+1\n", encoding="utf-8")
+    chunks = [pd.DataFrame({"value": ["=1+1", "plain"]}), pd.DataFrame({"value": ["@SUM(A1)", "-2"]})]
 
     try:
-        scans_router._sanitize_redacted_output_file(file_path=str(output_path))
-        frame = pd.read_csv(output_path, dtype=str, keep_default_na=False)
+        outputs = {}
+        for ext in (".csv", ".tsv", ".xlsx"):
+            output_path = base / f"redacted{ext}"
+            scan_service._write_chunked_redacted_output(
+                chunks=iter(chunks),
+                ext=ext,
+                redacted_path=str(output_path),
+                pii_columns=[],
+                limits=scan_service.ScanLimits(),
+                aggressive=False,
+            )
+            if ext == ".xlsx":
+                outputs[ext] = pd.read_excel(output_path, dtype=str)["value"].tolist()
+            else:
+                separator = "\t" if ext == ".tsv" else ","
+                outputs[ext] = pd.read_csv(output_path, dtype=str, sep=separator)["value"].tolist()
+
+        expected = ["'=1+1", "plain", "'@SUM(A1)", "'-2"]
+        assert outputs == {".csv": expected, ".tsv": expected, ".xlsx": expected}
+        assert scan_service.sanitize_spreadsheet_frame(chunks[0])["value"].tolist() == expected[:2]
+        assert chunks[0]["value"].tolist() == ["=1+1", "plain"]
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
 
-        assert frame.iloc[0]["value"] == "'=1+1"
+def test_spreadsheet_writers_prefix_formulas_without_post_processing():
+    base = _make_local_test_dir()
+    frame = pd.DataFrame({"value": ["=1+1", "plain", None, " @cmd"], "amount": [-5, 3, 4, 7]})
+
+    try:
+        csv_path = base / "redacted.csv"
+        scan_service._write_redacted_file(frame, str(csv_path), ".csv")
+        csv_frame = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+
+        xlsx_path = base / "redacted.xlsx"
+        scan_service._write_redacted_file(frame, str(xlsx_path), ".xlsx")
+        xlsx_frame = pd.read_excel(xlsx_path)
+
+        assert csv_frame["value"].tolist() == ["'=1+1", "plain", "", "' @cmd"]
+        assert csv_frame["amount"].tolist() == ["'-5", "3", "4", "7"]
+        assert xlsx_frame["value"].tolist()[:2] == ["'=1+1", "plain"]
+        assert xlsx_frame["amount"].tolist()[1:] == [3, 4, 7]
+        assert frame["value"].tolist()[0] == "=1+1"
     finally:
         shutil.rmtree(base, ignore_errors=True)
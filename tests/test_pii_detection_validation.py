@@ -31,6 +31,7 @@ class _HeuristicModel:
                 or float(row["pct_ssn_like"]) > 0
                 or float(row["pct_ip_like"]) > 0
                 or bool(row["has_street_suffix"])
+                or bool(row["has_zip_pattern"])
                 or bool(row["has_known_name"])
             )
             predictions.append(0 if looks_like_pii else 1)
@@ -140,6 +141,60 @@ def test_detection_scores_are_reproducible_for_identical_input():
     assert first_detections == second_detections
 
 
+def test_feature_matrix_matches_per_column_definitions():
+    features = ["customer_email", "notes", "empty"]
+    samples = [
+        ["ada@example.com", "call 555-123-4567", "John lives on Main St"],
+        ["born 1990-01-02", "Miami", "female", "zip 12345"],
+        [],
+    ]
+
+    frame = scan_service._build_feature_dataframe_from_samples(features, samples)
+
+    assert frame["length"].tolist() == [14, 5, 5]
+    assert frame["num_underscores"].tolist() == [1, 0, 0]
+    assert frame["has_email_keyword"].tolist() == [1, 0, 0]
+    assert frame["pct_email_like"].tolist() == [1 / 3, 0.0, 0.0]
+    assert frame["pct_phone_like"].tolist() == [1 / 3, 0.0, 0.0]
+    assert frame["avg_digits_per_val"].tolist() == [10 / 3, 13 / 4, 0.0]
+    assert frame["avg_val_len"].tolist() == [(15 + 17 + 21) / 3, (15 + 5 + 6 + 9) / 4, 0.0]
+    assert frame["has_known_name"].tolist() == [True, False, False]
+    # The model was trained on whole-value suffix matching, so "Main St" inside a sentence is not a hit.
+    assert frame["has_street_suffix"].tolist() == [False, False, False]
+    assert frame["has_dob_pattern"].tolist() == [False, True, False]
+    assert frame["has_city_name"].tolist() == [False, True, False]
+    assert frame["has_zip_pattern"].tolist() == [False, True, False]
+    assert frame["has_gender_term"].tolist() == [False, True, False]
+    assert frame["has_phone_pattern"].tolist() == [True, False, False]
+    assert frame["parsed_values"].tolist() == samples
+    assert frame["has_dob_pattern"].dtype == bool
+    assert frame["pct_email_like"].dtype == float
+
+
+def test_model_keyword_features_match_the_training_definitions():
+    from models.pii_features import build_feature_frame
+
+    cases = {
+        "has_street_suffix": (["St"], [" Ave "], ["Main St"], ["42 Elm Blvd."]),
+        "has_city_name": (["Miami"], ["new york"], [" miami"], ["Chicago"]),
+        "has_known_name": (["Bob Marley"], ["jane doe"], ["Bob, Marley"], ["Smith"]),
+        "has_gender_term": ([" Female "], ["Non-Binary"], ["girl"], ["female."]),
+        "has_dob_pattern": (["x1/2/19901"], ["1990-01-02"], ["1990"], ["12.01.1990"]),
+    }
+    for feature, (hit, other_hit, miss, other_miss) in cases.items():
+        frame = build_feature_frame(["c1", "c2", "c3", "c4"], [hit, other_hit, miss, other_miss])
+        assert frame[feature].tolist() == [True, True, False, False], feature
+
+
+def test_keyword_features_use_shared_dictionaries_and_match_modes():
+    assert scan_service._contains_gender_term(["Non-Binary"])
+    assert not scan_service._contains_gender_term(["other options available"])
+    assert scan_service._contains_street_suffix(["42 Elm Blvd."])
+    assert not scan_service._contains_street_suffix(["latest status"])
+    assert scan_service._contains_known_name(["Bob Marley"])
+    assert not scan_service._contains_known_name(["Johnson & Johnson"])
+
+
 def test_report_includes_detection_reasoning_section():
     detection_results = [
         {
@@ -184,7 +239,7 @@ def test_redactions_include_taxonomy_placeholder(monkeypatch):
     class _FakeResult:
         entity_type = "EMAIL_ADDRESS"
 
-    monkeypatch.setattr(redaction.analyzer, "analyze", lambda text, language="en": [_FakeResult()])
+    monkeypatch.setattr(redaction.analyzer, "analyze", lambda text, language="en", **kwargs: [_FakeResult()])
     monkeypatch.setattr(
         redaction.anonymizer,
         "anonymize",
@@ -207,6 +262,139 @@ def test_redactions_include_taxonomy_placeholder(monkeypatch):
     assert type_counts[PII_EMAIL] == 1
 
 
+def test_column_redaction_analyzes_all_cells_in_one_batch(monkeypatch):
+    class _FakeResult:
+        entity_type = "EMAIL_ADDRESS"
+
+    batches: list[list[str]] = []
+
+    def _fake_analyze_iterator(texts, language="en", **kwargs):
+        batches.append(list(texts))
+        return [[_FakeResult()] if "@" in text else [] for text in texts]
+
+    monkeypatch.setattr(redaction.batch_analyzer, "analyze_iterator", _fake_analyze_iterator)
+    monkeypatch.setattr(
+        redaction.anonymizer,
+        "anonymize",
+        lambda text, analyzer_results, operators: type(
+            "_Result",
+            (),
+            {"text": operators["EMAIL_ADDRESS"].params["new_value"]},
+        )(),
+    )
+
+    series = pd.Series(["write to ada@example.com", None, "plain note", "cc grace@example.com"])
+    redacted_series, redacted_count, total_values, _, type_counts = redaction.scan_and_redact_column_with_details(
+        series,
+        "contact",
+    )
+
+    assert batches == [["write to ada@example.com", "plain note", "cc grace@example.com"]]
+    assert redacted_series.tolist()[0] == "[REDACTED_PII_EMAIL]"
+    assert pd.isna(redacted_series.iloc[1])
+    assert redacted_series.iloc[2] == "plain note"
+    assert redacted_count == 2
+    assert total_values == 4
+    assert type_counts == {PII_EMAIL: 2}
+
+
+def test_column_redaction_routes_cells_through_detection_tiers(monkeypatch):
+    nlp_batches: list[list[str]] = []
+
+    def _fake_analyze_iterator(texts, language="en", **kwargs):
+        nlp_batches.append(list(texts))
+        return [[] for _ in texts]
+
+    monkeypatch.setattr(redaction.batch_analyzer, "analyze_iterator", _fake_analyze_iterator)
+    redaction.reset_redaction_tier_counts()
+
+    series = pd.Series(["ada@example.com", "123-45-6789", "10.0.0.1", "", "42", "true", "met Ada downtown"])
+    redacted_series, redacted_count, _, _, type_counts = redaction.scan_and_redact_column_with_details(series, "contact")
+
+    assert nlp_batches == [["met Ada downtown"]]
+    assert redacted_series.tolist() == [
+        "[REDACTED_PII_EMAIL]",
+        "[REDACTED_PII_SSN]",
+        "[REDACTED_PII_IP_ADDRESS]",
+        "",
+        "42",
+        "true",
+        "met Ada downtown",
+    ]
+    assert redacted_count == 3
+    assert type_counts == {PII_EMAIL: 1, "PII_SSN": 1, "PII_IP_ADDRESS": 1}
+    assert redaction.get_redaction_tier_counts() == {"skipped": 3, "cached": 0, "deterministic": 3, "nlp": 1}
+
+
+def test_bare_ten_digit_numbers_need_phone_context_for_the_deterministic_tier(monkeypatch):
+    nlp_batches: list[list[str]] = []
+
+    def _fake_analyze_iterator(texts, language="en", **kwargs):
+        nlp_batches.append(list(texts))
+        return [[] for _ in texts]
+
+    monkeypatch.setattr(redaction.batch_analyzer, "analyze_iterator", _fake_analyze_iterator)
+    redaction.reset_redaction_tier_counts()
+
+    order_refs, _, _, _, order_types = redaction.scan_and_redact_column_with_details(
+        pd.Series(["4155550123", "(415) 555-0123"]),
+        "order_ref",
+    )
+    phones, _, _, _, phone_types = redaction.scan_and_redact_column_with_details(
+        pd.Series(["4155550123"]),
+        "mobile_phone",
+    )
+
+    assert nlp_batches == [["4155550123"]]
+    assert order_refs.tolist() == ["4155550123", "[REDACTED_PII_PHONE]"]
+    assert order_types == {PII_PHONE: 1}
+    assert phones.tolist() == ["[REDACTED_PII_PHONE]"]
+    assert phone_types == {PII_PHONE: 1}
+    assert redaction.get_redaction_tier_counts() == {"skipped": 0, "cached": 0, "deterministic": 2, "nlp": 1}
+
+
+def test_column_redaction_memoizes_repeated_values_within_cache_scope(monkeypatch):
+    nlp_batches: list[list[str]] = []
+
+    class _FakeResult:
+        entity_type = "PERSON"
+        start = 0
+        end = 3
+        score = 0.85
+
+    def _fake_analyze_iterator(texts, language="en", **kwargs):
+        nlp_batches.append(list(texts))
+        return [[_FakeResult()] for _ in texts]
+
+    monkeypatch.setattr(redaction.batch_analyzer, "analyze_iterator", _fake_analyze_iterator)
+    monkeypatch.setattr(
+        redaction.anonymizer,
+        "anonymize",
+        lambda text, analyzer_results, operators: type(
+            "_Result",
+            (),
+            {"text": operators["PERSON"].params["new_value"] + text[3:]},
+        )(),
+    )
+
+    with redaction.redaction_cache_scope(redaction.RedactionCache(max_entries=1)) as cache:
+        first, first_count, _, _, first_types = redaction.scan_and_redact_column_with_details(
+            pd.Series(["Ada Lovelace", "Ada Lovelace", "Bob Smith"]),
+            "name",
+        )
+        second, second_count, _, _, second_types = redaction.scan_and_redact_column_with_details(
+            pd.Series(["Bob Smith", "Ada Lovelace"]),
+            "name",
+        )
+
+    assert nlp_batches == [["Ada Lovelace", "Bob Smith"], ["Ada Lovelace"]]
+    assert first.tolist() == ["[REDACTED_PII_NAME] Lovelace", "[REDACTED_PII_NAME] Lovelace", "[REDACTED_PII_NAME] Smith"]
+    assert second.tolist() == ["[REDACTED_PII_NAME] Smith", "[REDACTED_PII_NAME] Lovelace"]
+    assert first_count == 3 and first_types == {"PII_NAME": 3}
+    assert second_count == 2 and second_types == {"PII_NAME": 2}
+    assert cache.stats() == {"hits": 1, "misses": 3, "evictions": 2, "entries": 1, "max_entries": 1}
+
+
 def test_validation_suite_can_record_individual_detection_result():
     session = _tracking_session()
     company = Company(company_name="Acme")
@@ -1,10 +1,22 @@
 import importlib
+import json
+import os
+import shutil
+from pathlib import Path
 
+import joblib
 import pandas as pd
 import pytest
 from sqlalchemy import create_engine, text
 
 import database.database as database_module
+from models.pii_features import (
+    FEATURE_COLUMNS,
+    FeatureSchemaMismatchError,
+    feature_schema,
+    read_model_feature_schema,
+    stamp_model_feature_schema,
+)
 import services.scan_service as scan_service
 import services.startup_validation as startup_validation
 
@@ -29,6 +41,31 @@ def test_scan_service_does_not_load_model_during_import(monkeypatch):
     assert reloaded._xgb_model is None
 
 
+def test_columnar_extensions_are_not_advertised_without_pyarrow(monkeypatch, caplog):
+    import utils.constants as constants
+
+    original_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        importlib.util,
+        "find_spec",
+        lambda name, *args: None if name == "pyarrow" else original_find_spec(name, *args),
+    )
+    try:
+        importlib.reload(constants)
+        monkeypatch.setattr(startup_validation, "COLUMNAR_SUPPORT_AVAILABLE", constants.COLUMNAR_SUPPORT_AVAILABLE)
+        with caplog.at_level("WARNING", logger=startup_validation.logger.name):
+            startup_validation._validate_columnar_support()
+
+        assert constants.COLUMNAR_EXTENSIONS.isdisjoint(constants.SUPPORTED_EXTENSIONS)
+        assert ".csv" in constants.SUPPORTED_EXTENSIONS
+        assert "refused as unsupported file types" in caplog.text
+    finally:
+        monkeypatch.undo()
+        importlib.reload(constants)
+
+    assert constants.COLUMNAR_EXTENSIONS <= constants.SUPPORTED_EXTENSIONS
+
+
 def test_startup_validation_loads_model_successfully(monkeypatch):
     sentinel_model = object()
     monkeypatch.setattr(startup_validation, "_validate_environment", lambda: None)
@@ -143,3 +180,203 @@ def test_predict_pii_columns_uses_initialized_model():
     assert pii_columns == ["email"]
     assert detection_results[0]["detected_type"] == "PII_EMAIL"
     assert model.calls == 1
+
+
+def _train_tiny_booster():
+    import numpy as np
+    import xgboost as xgb
+
+    frame = pd.DataFrame(np.eye(len(FEATURE_COLUMNS))[:4], columns=FEATURE_COLUMNS)
+    return xgb.XGBClassifier(n_estimators=2, max_depth=2).fit(frame, [0, 1, 0, 1])
+
+
+def test_model_loading_refuses_artifacts_with_mismatched_feature_schema(tmp_path):
+    model = _train_tiny_booster()
+    stamp_model_feature_schema(model)
+    stamped_path = tmp_path / "stamped.pkl"
+    joblib.dump(model, stamped_path)
+
+    loaded = scan_service._load_xgboost_model(stamped_path)
+    assert read_model_feature_schema(loaded) == feature_schema()
+
+    model.get_booster().set_attr(pii_feature_schema=json.dumps({"version": 1, "fingerprint": "legacy"}))
+    stale_path = tmp_path / "stale.pkl"
+    joblib.dump(model, stale_path)
+
+    with pytest.raises(FeatureSchemaMismatchError):
+        scan_service._load_xgboost_model(stale_path)
+    with pytest.raises(FeatureSchemaMismatchError):
+        scan_service.set_scan_model(joblib.load(stale_path))
+
+
+def _isolate_model_registry(monkeypatch):
+    from collections import OrderedDict
+
+    monkeypatch.setattr(scan_service, "_xgb_model", None)
+    monkeypatch.setattr(scan_service, "_active_model_artifact", None)
+    monkeypatch.setattr(scan_service, "_model_cache", OrderedDict())
+    monkeypatch.setattr(scan_service, "MODEL_REFRESH_SECONDS", 0.0)
+
+
+def test_model_registry_prefers_native_export_and_caches_by_content_hash(monkeypatch, tmp_path):
+    _isolate_model_registry(monkeypatch)
+    model = _train_tiny_booster()
+    stamp_model_feature_schema(model)
+    joblib.dump(model, tmp_path / "xgboost_model.pkl")
+    model.save_model(tmp_path / "xgboost_model.ubj")
+
+    first = scan_service.load_model_artifact(tmp_path / "xgboost_model.pkl")
+    second = scan_service.load_model_artifact(tmp_path / "xgboost_model.ubj")
+
+    assert first.format == "ubj"
+    assert first is second
+    assert read_model_feature_schema(first.model) == feature_schema()
+    frame = pd.DataFrame([[0.0] * len(FEATURE_COLUMNS)], columns=FEATURE_COLUMNS)
+    assert list(first.model.predict(frame)) == list(model.predict(frame))
+
+
+def test_model_registry_hot_swaps_changed_artifact_without_disturbing_held_model(monkeypatch, tmp_path):
+    _isolate_model_registry(monkeypatch)
+    model_path = tmp_path / "xgboost_model.json"
+    original = _train_tiny_booster()
+    stamp_model_feature_schema(original)
+    original.save_model(model_path)
+
+    in_flight_model = scan_service.initialize_scan_model(model_path)
+    original_sha = scan_service.get_active_model_artifact().sha256
+
+    replacement = _train_tiny_booster()
+    replacement.set_params(n_estimators=3)
+    replacement.fit(pd.DataFrame([[1.0] * len(FEATURE_COLUMNS)] * 2, columns=FEATURE_COLUMNS), [0, 1])
+    stamp_model_feature_schema(replacement)
+    staged_path = tmp_path / "staged.json"
+    replacement.save_model(staged_path)
+    staged_path.replace(model_path)
+
+    scan_service.refresh_scan_model_if_changed()
+
+    assert scan_service.get_active_model_artifact().sha256 != original_sha
+    assert scan_service.get_scan_model() is not in_flight_model
+    frame = pd.DataFrame([[0.0] * len(FEATURE_COLUMNS)], columns=FEATURE_COLUMNS)
+    assert len(in_flight_model.predict(frame)) == 1
+
+
+def test_touched_or_copied_artifact_is_hashed_once_and_keeps_its_cached_model(monkeypatch, tmp_path):
+    _isolate_model_registry(monkeypatch)
+    model_path = tmp_path / "xgboost_model.json"
+    model = _train_tiny_booster()
+    stamp_model_feature_schema(model)
+    model.save_model(model_path)
+    loaded_model = scan_service.initialize_scan_model(model_path)
+
+    loads: list[Path] = []
+    original_load = scan_service.load_model_artifact
+
+    def _counting_load(path=scan_service.MODEL_PATH):
+        loads.append(Path(path))
+        return original_load(path)
+
+    monkeypatch.setattr(scan_service, "load_model_artifact", _counting_load)
+    stat = model_path.stat()
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    scan_service.refresh_scan_model_if_changed()
+    scan_service.refresh_scan_model_if_changed()
+
+    active = scan_service.get_active_model_artifact()
+    assert loads == [model_path]
+    assert active.mtime_ns == model_path.stat().st_mtime_ns
+    assert active.model is loaded_model
+
+    copied_path = tmp_path / "copied.json"
+    shutil.copyfile(model_path, copied_path)
+    copied = original_load(copied_path)
+    assert copied.path == str(copied_path)
+    assert copied.mtime_ns == copied_path.stat().st_mtime_ns
+    assert copied.model is loaded_model
+
+
+def test_prediction_batcher_coalesces_concurrent_scans_into_one_booster_call(monkeypatch):
+    import threading
+
+    import numpy as np
+
+    from services.prediction_batcher import PredictionBatcher
+
+    model = _train_tiny_booster()
+    booster = model.get_booster()
+    batcher = PredictionBatcher(max_wait_ms=200, max_batch_rows=12)
+    requests = [np.roll(np.eye(len(FEATURE_COLUMNS))[:3], shift, axis=1) for shift in range(4)]
+    expected = [model.predict(pd.DataFrame(features, columns=FEATURE_COLUMNS)).tolist() for features in requests]
+    calls: list[tuple[int, ...]] = []
+    original_inplace_predict = booster.inplace_predict
+
+    def recording_inplace_predict(data, **kwargs):
+        assert data.dtype == np.float32 and data.flags["C_CONTIGUOUS"]
+        calls.append(data.shape)
+        return original_inplace_predict(data, **kwargs)
+
+    monkeypatch.setattr(booster, "inplace_predict", recording_inplace_predict)
+    monkeypatch.setattr(model, "get_booster", lambda: booster)
+
+    results: dict[int, np.ndarray] = {}
+    threads = [
+        threading.Thread(target=lambda index=index: results.__setitem__(index, batcher.predict(model, requests[index])))
+        for index in range(len(requests))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == [(12, len(FEATURE_COLUMNS))]
+    assert [results[index].tolist() for index in range(len(requests))] == expected
+    stats = batcher.stats()
+    assert stats["rows_per_batch"]["count"] == 1
+    assert stats["rows_per_batch"]["buckets"]["16"] == 1
+    assert stats["rows_per_batch"]["buckets"]["8"] == 0
+    assert stats["requests_per_batch"]["sum"] == 4
+
+
+def test_prediction_batcher_fails_every_waiter_when_a_batch_cannot_be_assembled():
+    import threading
+
+    import numpy as np
+
+    from services.prediction_batcher import PredictionBatcher
+
+    model = _train_tiny_booster()
+    batcher = PredictionBatcher(max_wait_ms=200, max_batch_rows=64, result_timeout=5)
+    # Rows of different widths cannot be stacked into one matrix.
+    requests = [np.zeros((2, len(FEATURE_COLUMNS))), np.zeros((2, len(FEATURE_COLUMNS) + 1))]
+    errors: dict[int, BaseException] = {}
+
+    def _predict(index: int) -> None:
+        try:
+            batcher.predict(model, requests[index])
+        except BaseException as exc:
+            errors[index] = exc
+
+    threads = [threading.Thread(target=_predict, args=(index,)) for index in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert sorted(errors) == [0, 1]
+    assert all(isinstance(error, ValueError) for error in errors.values())
+    # The dispatcher thread survived and still serves later requests.
+    assert batcher.predict(model, np.zeros((1, len(FEATURE_COLUMNS)))).shape == (1,)
+
+
+def test_prediction_batcher_times_out_instead_of_waiting_forever(monkeypatch):
+    import numpy as np
+
+    from services.prediction_batcher import PredictionBatcher
+
+    batcher = PredictionBatcher(max_wait_ms=1, result_timeout=0.2)
+    monkeypatch.setattr(batcher, "_dispatch", lambda batch: None)
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        batcher.predict(_train_tiny_booster(), np.zeros((1, len(FEATURE_COLUMNS))))
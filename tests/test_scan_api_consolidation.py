@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gzip
 import shutil
 import uuid
 import zipfile
@@ -86,7 +87,6 @@ def test_post_scans_creates_scan_and_legacy_predict_route_is_not_mounted(monkeyp
     monkeypatch.setattr(scans_router, "reserve_scan_quota", lambda *args, **kwargs: True)
     monkeypatch.setattr(scans_router, "release_scan_quota_reservation", lambda *args, **kwargs: None)
     monkeypatch.setattr(scans_router, "extract_request_security_context", lambda request: {})
-    monkeypatch.setattr(scans_router, "_sanitize_redacted_output_file", lambda **kwargs: kwargs["file_path"])
 
     async def _inline_run_in_threadpool(func):
         return func()
@@ -261,7 +261,6 @@ def test_post_scans_accepts_xls_when_backend_supports_it(monkeypatch):
     monkeypatch.setattr(scans_router, "reserve_scan_quota", lambda *args, **kwargs: True)
     monkeypatch.setattr(scans_router, "release_scan_quota_reservation", lambda *args, **kwargs: None)
     monkeypatch.setattr(scans_router, "extract_request_security_context", lambda request: {})
-    monkeypatch.setattr(scans_router, "_sanitize_redacted_output_file", lambda **kwargs: kwargs["file_path"])
 
     async def _inline_run_in_threadpool(func):
         return func()
@@ -309,7 +308,6 @@ def test_post_scans_converts_xls_pipeline_output_to_xlsx_without_changing_displa
     monkeypatch.setattr(scans_router, "reserve_scan_quota", lambda *args, **kwargs: True)
     monkeypatch.setattr(scans_router, "release_scan_quota_reservation", lambda *args, **kwargs: None)
     monkeypatch.setattr(scans_router, "extract_request_security_context", lambda request: {})
-    monkeypatch.setattr(scans_router, "_sanitize_redacted_output_file", lambda **kwargs: kwargs["file_path"])
 
     async def _inline_run_in_threadpool(func):
         return func()
@@ -405,3 +403,124 @@ def test_post_scans_rejects_unsafe_archive_structure(monkeypatch):
         assert response.json()["detail"]["error_code"] == "validation_error"
     finally:
         shutil.rmtree(base, ignore_errors=True)
+
+
+def test_post_scans_accepts_compressed_csv_and_forwards_output_compression(monkeypatch):
+    base = _make_local_test_dir()
+    session_factory = _session()
+    app = _build_app(session_factory)
+    client = TestClient(app)
+
+    captured = {}
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scans_router, "record_audit_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scan_job_service, "record_audit_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scan_job_service, "record_security_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scans_router, "register_scan_activity", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scans_router, "reserve_scan_quota", lambda *args, **kwargs: True)
+    monkeypatch.setattr(scans_router, "release_scan_quota_reservation", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scans_router, "extract_request_security_context", lambda request: {})
+
+    async def _inline_run_in_threadpool(func):
+        return func()
+
+    def _capturing_pipeline(**kwargs):
+        captured.update(kwargs)
+        return ScanPipelineResult(
+            filename="export.csv.gz",
+            pii_columns=[],
+            redacted_file="redacted/redacted_export.csv.gz",
+            risk_score=0,
+            redacted_count=0,
+            total_values=0,
+            redacted_type_counts={},
+            detection_results=[],
+            scan_id=98,
+        )
+
+    monkeypatch.setattr(scans_router, "run_in_threadpool", _inline_run_in_threadpool)
+    monkeypatch.setattr(scan_job_service, "run_scan_pipeline", _capturing_pipeline)
+
+    try:
+        response = client.post(
+            "/scans?compress_output=true",
+            files={"file": ("export.csv.gz", gzip.compress(b"email\nada@example.com\n"), "application/gzip")},
+        )
+        assert response.status_code == 200
+        assert captured["filename"] == "export.csv.gz"
+        assert captured["source_path"].endswith(".gz")
+        assert captured["compress_output"] is True
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_post_scans_checks_compressed_payload_type_and_content(monkeypatch):
+    session_factory = _session()
+    app = _build_app(session_factory)
+    client = TestClient(app)
+    monkeypatch.setattr(scans_router, "record_audit_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scans_router, "extract_request_security_context", lambda request: {})
+
+    unsupported = client.post(
+        "/scans",
+        files={"file": ("report.pdf.gz", gzip.compress(b"%PDF-1.4"), "application/gzip")},
+    )
+    unsafe_xml = client.post(
+        "/scans",
+        files={
+            "file": (
+                "sample.xml.gz",
+                gzip.compress(b'<!DOCTYPE foo [<!ENTITY xxe "bad">]><root><item>ok</item></root>'),
+                "application/gzip",
+            )
+        },
+    )
+    mislabeled = client.post(
+        "/scans",
+        files={"file": ("export.csv.gz", b"email\nada@example.com\n", "application/gzip")},
+    )
+
+    assert unsupported.status_code == 400
+    assert unsupported.json()["detail"]["error_code"] == "unsupported_file_type"
+    assert unsafe_xml.status_code == 400
+    assert unsafe_xml.json()["detail"]["error_code"] == "validation_error"
+    assert mislabeled.status_code == 400
+    assert mislabeled.json()["detail"]["error_code"] == "unsupported_file_type"
+
+
+def test_probe_endpoint_reports_schema_and_estimates_without_reserving_quota(monkeypatch):
+    base = _make_local_test_dir()
+    session_factory = _session()
+    app = _build_app(session_factory)
+
+    class _FlagFirstColumnModel:
+        def predict(self, frame):
+            return [0 if index == 0 else 1 for index in range(len(frame))]
+
+    app.state.pii_model = _FlagFirstColumnModel()
+    client = TestClient(app)
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(
+        scans_router,
+        "reserve_scan_quota",
+        lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("probe must not reserve quota")),
+    )
+
+    try:
+        rows = "".join(f"user{index}@example.com,note-{index}\n" for index in range(50))
+        response = client.post(
+            "/scans/probe",
+            files={"file": ("contacts.csv", f"email,notes\n{rows}".encode("utf-8"), "text/csv")},
+        )
+
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload["filename"] == "contacts.csv"
+        assert payload["columns"] == ["email", "notes"]
+        assert payload["pii_columns"] == ["email"]
+        assert payload["estimated_rows"] == 50
+        assert payload["row_count_exact"] is True
+        assert payload["recommended_mode"] == "sync"
+        assert not any((base / "uploads").iterdir())
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
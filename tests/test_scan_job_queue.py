@@ -0,0 +1,717 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from database.database import Base, get_db
+from database.models.audit_event import AuditEvent
+from database.models.audit_log import AuditLog
+from database.models.company import Company
+from database.models.company_settings import CompanySettings
+from database.models.scan_job import ScanJob
+from database.models.scan_quota_counter import ScanQuotaCounter
+from database.models.scan_results import ScanResult
+from database.models.security_event import SecurityEvent
+from database.models.user import User
+from dependencies.tier_guard import get_current_user_context
+from routers import scan_jobs as scan_jobs_router
+from routers import scans as scans_router
+from services import scan_job_service, scan_scheduler, scan_service, scan_worker, startup_validation
+from services.scan_job_events import ScanJobNotifier
+from services.scan_progress import clear_progress, publish_progress
+from services.scan_scheduler import QueuedScanJob, rank_queued_jobs
+from services.scan_service import ScanPipelineResult
+
+
+def _fake_redactor(series, column_name="", aggressive=False):
+    redacted = series.astype(str).map(lambda value: "[REDACTED_PII_EMAIL]" if value else value)
+    count = int(series.notna().sum())
+    return redacted, count, len(series), 1.0 if len(series) else 0.0, {"PII_EMAIL": count}
+
+
+def _make_local_test_dir() -> Path:
+    base = Path(__file__).resolve().parents[1] / ".test_tmp" / f"scan_queue_{uuid.uuid4().hex}"
+    base.mkdir(parents=True, exist_ok=True)
+    return base
+
+
+def _session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[
+            Company.__table__,
+            CompanySettings.__table__,
+            User.__table__,
+            ScanResult.__table__,
+            ScanJob.__table__,
+            ScanQuotaCounter.__table__,
+            SecurityEvent.__table__,
+            AuditEvent.__table__,
+            AuditLog.__table__,
+        ],
+    )
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def _pooled_session(path: Path):
+    # A single pooled connection: any request that holds one while checking out another times out.
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.5,
+    )
+    Base.metadata.create_all(bind=engine, tables=[ScanResult.__table__, ScanJob.__table__])
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def _queued_job(
+    session_factory,
+    source_path: str = "uploads/missing.csv",
+    *,
+    company_id: int = 1,
+    tier: str = "pro",
+) -> int:
+    db = session_factory()
+    try:
+        job = scan_job_service.create_scan_job(
+            db,
+            company_id=company_id,
+            user_id=1,
+            filename="sample.csv",
+            file_type="csv",
+            tier=tier,
+        )
+        scan_job_service.persist_queued_scan_job(
+            db,
+            job_id=job.id,
+            source_path=source_path,
+            pipeline_filename="sample.csv",
+            context_data={"user_id": 1, "company_id": 1, "tier": "pro"},
+        )
+        return job.id
+    finally:
+        db.close()
+
+
+def test_database_backend_leaves_upload_queued_for_a_worker(monkeypatch):
+    base = _make_local_test_dir()
+    session_factory = _session()
+    app = FastAPI()
+    app.state.pii_model = object()
+    app.include_router(scans_router.router)
+    app.dependency_overrides[get_current_user_context] = lambda: {
+        "user_id": 1,
+        "company_id": 1,
+        "role": "organization_admin",
+        "tier": "pro",
+    }
+
+    def _get_test_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_test_db
+    client = TestClient(app)
+
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_job_service, "SCAN_QUEUE_BACKEND", scan_job_service.QUEUE_BACKEND_DATABASE)
+    monkeypatch.setattr(scans_router, "should_run_async", lambda _size: True)
+    monkeypatch.setattr(scans_router, "record_audit_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scan_job_service, "record_audit_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scan_job_service, "record_security_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scans_router, "register_scan_activity", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scans_router, "reserve_scan_quota", lambda *args, **kwargs: True)
+    monkeypatch.setattr(scans_router, "release_scan_quota_reservation", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scans_router, "extract_request_security_context", lambda request: {})
+    captured = {}
+
+    def _capturing_pipeline(**kwargs):
+        captured.update(kwargs)
+        return ScanPipelineResult(
+            filename="sample.csv",
+            pii_columns=["email"],
+            redacted_file=None,
+            risk_score=40,
+            redacted_count=1,
+            total_values=1,
+            redacted_type_counts={},
+            detection_results=[],
+            scan_id=77,
+        )
+
+    monkeypatch.setattr(scan_job_service, "run_scan_pipeline", _capturing_pipeline)
+
+    try:
+        response = client.post(
+            "/scans?aggressive=true",
+            files={"file": ("sample.csv", b"email\nada@example.com\n", "text/csv")},
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert captured == {}
+
+        db = session_factory()
+        try:
+            job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+            payload = json.loads(job.payload_json)
+            assert job.status == scan_job_service.JOB_QUEUED
+            assert job.lease_owner is None
+            assert payload["aggressive"] is True
+            assert payload["tier"] == "pro"
+            assert os.path.exists(payload["source_path"])
+        finally:
+            db.close()
+
+        assert scan_worker.run_next_scan_job(worker_id="worker-a", session_factory=session_factory) is True
+        assert scan_worker.run_next_scan_job(worker_id="worker-a", session_factory=session_factory) is False
+
+        db = session_factory()
+        try:
+            job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+            assert job.status == scan_job_service.JOB_COMPLETED
+            assert job.scan_result_id == 77
+            assert job.attempts == 1
+            assert job.lease_owner is None
+        finally:
+            db.close()
+        assert captured["aggressive"] is True
+        assert captured["context"].tier == "pro"
+        assert not os.path.exists(payload["source_path"])
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def _write_stamped_model(path: Path) -> None:
+    import joblib
+    import numpy as np
+    import xgboost as xgb
+
+    from models.pii_features import FEATURE_COLUMNS, stamp_model_feature_schema
+
+    features = np.array([[index % 2] * len(FEATURE_COLUMNS) for index in range(8)])
+    model = xgb.XGBClassifier(n_estimators=2, max_depth=2, eval_metric="logloss")
+    model.fit(pd.DataFrame(features, columns=FEATURE_COLUMNS), [index % 2 for index in range(8)])
+    stamp_model_feature_schema(model)
+    joblib.dump(model, path)
+
+
+def test_worker_loads_the_scan_model_before_claiming_and_runs_real_jobs(monkeypatch):
+    base = _make_local_test_dir()
+    model_path = base / "xgboost_model.pkl"
+    _write_stamped_model(model_path)
+    source_path = base / "queued.csv"
+    source_path.write_text("email,notes\nada@example.com,ok\n", encoding="utf-8")
+    session_factory = _session()
+    job_id = _queued_job(session_factory, str(source_path))
+
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(startup_validation, "MODEL_PATH", model_path)
+    monkeypatch.setattr(scan_service, "_xgb_model", None)
+    monkeypatch.setattr(scan_service, "_active_model_artifact", None)
+    monkeypatch.setattr(scan_service, "SessionLocal", session_factory)
+    monkeypatch.setattr(scan_job_service, "SessionLocal", session_factory)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    calls: list[str] = []
+    real_load = scan_worker.load_scan_model
+    monkeypatch.setattr(scan_worker, "load_scan_model", lambda: calls.append("load") or real_load())
+
+    real_run_next = scan_worker.run_next_scan_job
+
+    def _run_next(**kwargs):
+        calls.append("claim")
+        return real_run_next(**kwargs, session_factory=session_factory)
+
+    monkeypatch.setattr(scan_worker, "run_next_scan_job", _run_next)
+
+    try:
+        scan_worker.main(["--once"])
+
+        assert calls == ["load", "claim", "claim"]
+        db = session_factory()
+        try:
+            job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+            assert job.status == scan_job_service.JOB_COMPLETED, job.error_message
+            scan = db.query(ScanResult).filter(ScanResult.id == job.scan_result_id).one()
+            assert os.path.exists(scan.redacted_file_path)
+        finally:
+            db.close()
+        assert not source_path.exists()
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_claim_leases_each_job_to_one_worker_until_the_lease_expires():
+    session_factory = _session()
+    job_id = _queued_job(session_factory)
+    db = session_factory()
+    try:
+        claimed = scan_job_service.claim_next_scan_job(db, worker_id="worker-a", lease_seconds=60)
+        assert claimed.id == job_id
+        assert claimed.lease_owner == "worker-a"
+        assert scan_job_service.claim_next_scan_job(db, worker_id="worker-b", lease_seconds=60) is None
+        assert scan_job_service.renew_scan_job_lease(db, job_id=job_id, worker_id="worker-b") is False
+        assert scan_job_service.renew_scan_job_lease(db, job_id=job_id, worker_id="worker-a") is True
+
+        # A worker that stops heartbeating loses the job to the next claimant.
+        claimed.status = scan_job_service.JOB_RUNNING
+        claimed.lease_expires_at = scan_job_service._utcnow() - timedelta(seconds=1)
+        db.add(claimed)
+        db.commit()
+        reclaimed = scan_job_service.claim_next_scan_job(db, worker_id="worker-b", lease_seconds=60)
+        assert reclaimed.id == job_id
+        assert reclaimed.lease_owner == "worker-b"
+        assert reclaimed.attempts == 2
+        assert scan_job_service.renew_scan_job_lease(db, job_id=job_id, worker_id="worker-a") is False
+    finally:
+        db.close()
+
+
+def test_worker_fails_jobs_that_exhaust_their_attempts(monkeypatch):
+    session_factory = _session()
+    job_id = _queued_job(session_factory)
+    monkeypatch.setattr(scan_job_service, "SCAN_JOB_MAX_ATTEMPTS", 1)
+    db = session_factory()
+    try:
+        job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+        job.attempts = 1
+        db.add(job)
+        db.commit()
+    finally:
+        db.close()
+
+    def _unexpected_run(**_kwargs):
+        raise AssertionError("exhausted jobs must not run again")
+
+    assert scan_worker.run_next_scan_job(worker_id="worker-a", session_factory=session_factory, run_job=_unexpected_run)
+
+    db = session_factory()
+    try:
+        job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+        assert job.status == scan_job_service.JOB_FAILED
+        assert job.lease_owner is None
+        assert "attempts" in job.error_message
+    finally:
+        db.close()
+
+
+def _queued(job_id: int, tenant: str, tier: str, created_at) -> QueuedScanJob:
+    return QueuedScanJob(job_id=job_id, tenant_key=tenant, tier=tier, created_at=created_at)
+
+
+def test_fair_share_interleaves_tenants_and_respects_concurrency_caps():
+    now = scan_job_service._utcnow()
+    flood = [_queued(job_id, "company:1", "pro", now - timedelta(seconds=60 - job_id)) for job_id in range(1, 6)]
+    late_arrival = _queued(100, "company:2", "pro", now)
+
+    ranked = rank_queued_jobs([*flood, late_arrival], {}, now=now)
+
+    # The flooding tenant's backlog does not delay the other tenant, and the pro cap of two
+    # concurrent scans stops the rest of the backlog from being handed out at all.
+    assert ranked == [1, 100, 2]
+    assert rank_queued_jobs(flood, {"company:1": 2}, now=now) == []
+
+
+def test_tier_weight_orders_tenants_and_aging_prevents_starvation(monkeypatch):
+    now = scan_job_service._utcnow()
+    monkeypatch.setattr(scan_scheduler, "SCAN_SCHEDULER_AGING_SECONDS", 60.0)
+    free_job = _queued(1, "company:1", "free", now - timedelta(seconds=30))
+    business_job = _queued(2, "company:2", "business", now)
+
+    assert rank_queued_jobs([free_job, business_job], {}, now=now) == [2, 1]
+
+    starved_free_job = _queued(1, "company:1", "free", now - timedelta(seconds=600))
+    assert rank_queued_jobs([starved_free_job, business_job], {}, now=now) == [1, 2]
+
+
+def test_claim_follows_fair_share_and_queue_metrics_report_per_tier():
+    session_factory = _session()
+    flood_ids = [_queued_job(session_factory, company_id=1) for _ in range(3)]
+    other_id = _queued_job(session_factory, company_id=2, tier="business")
+
+    db = session_factory()
+    try:
+        first = scan_job_service.claim_next_scan_job(db, worker_id="worker-a", lease_seconds=60)
+        second = scan_job_service.claim_next_scan_job(db, worker_id="worker-b", lease_seconds=60)
+        # The business tenant outweighs the pro tenant's earlier backlog, which still runs next.
+        assert first.id == other_id
+        assert second.id == flood_ids[0]
+
+        metrics = scan_job_service.queue_metrics(db)["tiers"]
+        assert metrics["pro"]["queued"] == 2
+        assert metrics["pro"]["running"] == 1
+        assert metrics["business"]["running"] == 1
+        assert metrics["business"]["queued"] == 0
+        assert metrics["free"] == {"queued": 0, "running": 0, "oldest_wait_seconds": 0.0, "mean_wait_seconds": 0.0}
+        assert metrics["pro"]["oldest_wait_seconds"] >= metrics["pro"]["mean_wait_seconds"] >= 0
+    finally:
+        db.close()
+
+
+def test_one_tenant_backlog_cannot_hide_other_tenants_from_the_scheduler(monkeypatch):
+    monkeypatch.setattr(scan_scheduler, "SCAN_SCHEDULER_WINDOW", 5)
+    session_factory = _session()
+    backlog_ids = [_queued_job(session_factory, company_id=1, tier="free") for _ in range(7)]
+    other_id = _queued_job(session_factory, company_id=2, tier="business")
+
+    db = session_factory()
+    try:
+        first = scan_job_service.claim_next_scan_job(db, worker_id="worker-a", lease_seconds=60)
+        second = scan_job_service.claim_next_scan_job(db, worker_id="worker-b", lease_seconds=60)
+        # The free tenant is at its one-scan cap, so only the other company's job is claimable.
+        third = scan_job_service.claim_next_scan_job(db, worker_id="worker-c", lease_seconds=60)
+        assert {first.id, second.id} == {other_id, backlog_ids[0]}
+        assert third is None
+    finally:
+        db.close()
+
+
+def _jobs_client(session_factory) -> TestClient:
+    app = FastAPI()
+    app.include_router(scan_jobs_router.router)
+    app.dependency_overrides[get_current_user_context] = lambda: {
+        "user_id": 1,
+        "company_id": 1,
+        "role": "organization_admin",
+        "tier": "pro",
+    }
+
+    def _get_test_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_test_db
+    return TestClient(app)
+
+
+def _set_status(session_factory, job_id: int, status: str) -> None:
+    db = session_factory()
+    try:
+        job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+        job.status = status
+        db.add(job)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _fresh_notifier(monkeypatch) -> ScanJobNotifier:
+    # In-memory databases reuse job ids across tests, so each test gets its own bus.
+    notifier = ScanJobNotifier()
+    monkeypatch.setattr(scan_job_service, "scan_job_notifier", notifier)
+    monkeypatch.setattr(scan_jobs_router, "scan_job_notifier", notifier)
+    return notifier
+
+
+def test_queue_metrics_endpoint_is_limited_to_admins():
+    session_factory = _session()
+    _queued_job(session_factory)
+    client = _jobs_client(session_factory)
+
+    admin_response = client.get("/scan-jobs/queue")
+    client.app.dependency_overrides[get_current_user_context] = lambda: {
+        "user_id": 2,
+        "company_id": 1,
+        "role": "user",
+        "tier": "pro",
+    }
+    member_response = client.get("/scan-jobs/queue")
+
+    assert admin_response.status_code == 200
+    assert admin_response.json()["tiers"]["pro"]["queued"] == 1
+    assert member_response.status_code == 403
+
+
+def test_job_status_and_event_stream_serve_live_progress(monkeypatch):
+    _fresh_notifier(monkeypatch)
+    session_factory = _session()
+    job_id = _queued_job(session_factory)
+    _set_status(session_factory, job_id, scan_job_service.JOB_RUNNING)
+    client = _jobs_client(session_factory)
+    monkeypatch.setattr(scan_jobs_router, "PROGRESS_STREAM_TICK_SECONDS", 0.01)
+    monkeypatch.setattr(scan_jobs_router, "PROGRESS_STREAM_DB_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(scan_jobs_router, "PROGRESS_STREAM_MAX_SECONDS", 0.2)
+    snapshot = {"stage": "redacting", "percent": 41, "rows_processed": 400, "eta_seconds": 12.5}
+    publish_progress(job_id, snapshot)
+
+    try:
+        status = client.get(f"/scan-jobs/{job_id}").json()
+        assert status["progress"] == 41
+        assert status["progress_detail"]["rows_processed"] == 400
+
+        running_stream = client.get(f"/scan-jobs/{job_id}/events")
+        assert running_stream.headers["content-type"].startswith("text/event-stream")
+        events = [line for line in running_stream.text.splitlines() if line.startswith("event: ")]
+        assert events == ["event: progress", "event: timeout"]
+
+        _set_status(session_factory, job_id, scan_job_service.JOB_FAILED)
+        finished_stream = client.get(f"/scan-jobs/{job_id}/events")
+        assert finished_stream.text.startswith("event: failed\n")
+        assert json.loads(finished_stream.text.split("data: ", 1)[1])["status"] == scan_job_service.JOB_FAILED
+    finally:
+        clear_progress(job_id)
+
+
+def test_notifier_wakes_waiters_from_worker_threads_and_remembers_finished_jobs():
+    notifier = ScanJobNotifier()
+
+    async def _scenario():
+        timer = threading.Timer(0.05, notifier.publish, args=(5, scan_job_service.JOB_COMPLETED))
+        timer.start()
+        started = time.monotonic()
+        woken = await notifier.wait(5, timeout=5)
+        elapsed = time.monotonic() - started
+        late = await notifier.wait(5, timeout=5)
+        unrelated = await notifier.wait(6, timeout=0.01)
+        return woken, elapsed, late, unrelated
+
+    woken, elapsed, late, unrelated = asyncio.run(_scenario())
+    assert woken == scan_job_service.JOB_COMPLETED
+    assert elapsed < 1
+    assert late == scan_job_service.JOB_COMPLETED
+    assert unrelated is None
+
+
+def test_long_poll_returns_when_the_job_finishes_without_polling_the_database(monkeypatch):
+    notifier = _fresh_notifier(monkeypatch)
+    monkeypatch.setattr(scan_jobs_router, "PROGRESS_STREAM_DB_POLL_SECONDS", 30.0)
+    session_factory = _session()
+    job_id = _queued_job(session_factory)
+    _set_status(session_factory, job_id, scan_job_service.JOB_RUNNING)
+    client = _jobs_client(session_factory)
+
+    timed_out = client.get(f"/scan-jobs/{job_id}/wait?timeout=0.05")
+    assert timed_out.json()["status"] == scan_job_service.JOB_RUNNING
+
+    # A rolled-back terminal update must not wake anyone.
+    db = session_factory()
+    try:
+        job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+        scan_job_service._mark_job_failed(job, error_message="discarded")
+        db.rollback()
+    finally:
+        db.close()
+    assert notifier.finished_status(job_id) is None
+
+    def _complete_job():
+        db = session_factory()
+        try:
+            job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+            scan_job_service._mark_job_completed(job, scan_result_id=None)
+            db.commit()
+        finally:
+            db.close()
+
+    timer = threading.Timer(0.1, _complete_job)
+    timer.start()
+    started = time.monotonic()
+    finished = client.get(f"/scan-jobs/{job_id}/wait?timeout=20")
+    timer.join()
+
+    assert finished.json()["status"] == scan_job_service.JOB_COMPLETED
+    assert time.monotonic() - started < 5
+
+
+def test_canceling_a_queued_job_releases_quota_and_skips_the_scan(monkeypatch):
+    notifier = _fresh_notifier(monkeypatch)
+    base = _make_local_test_dir()
+    source_path = base / "queued.csv"
+    source_path.write_text("email\nuser@example.com\n", encoding="utf-8")
+    released: list[int] = []
+    monkeypatch.setattr(scan_job_service, "release_scan_quota_reservation", lambda _db, user_id, day=None: released.append(user_id))
+    monkeypatch.setattr(scan_job_service, "record_audit_event", lambda *args, **kwargs: None)
+
+    def _unexpected_scan(**kwargs):
+        raise AssertionError("canceled jobs must not be scanned")
+
+    monkeypatch.setattr(scan_job_service, "run_scan_pipeline", _unexpected_scan)
+    session_factory = _session()
+    job_id = _queued_job(session_factory, str(source_path))
+    client = _jobs_client(session_factory)
+
+    try:
+        canceled = client.post(f"/scan-jobs/{job_id}/cancel")
+        assert canceled.status_code == 200
+        assert canceled.json()["status"] == scan_job_service.JOB_CANCELED
+        assert canceled.json()["progress"] == 100
+        assert released == [1]
+        assert notifier.finished_status(job_id) == scan_job_service.JOB_CANCELED
+        assert not source_path.exists()
+
+        again = client.post(f"/scan-jobs/{job_id}/cancel")
+        assert again.status_code == 409
+
+        # Workers that already held the job in hand still skip it without refunding twice.
+        db = session_factory()
+        try:
+            job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+            skipped = scan_job_service.process_scan_job(
+                **scan_job_service.queued_job_arguments(job),
+                db_session=db,
+            )
+        finally:
+            db.close()
+        assert skipped["status"] == scan_job_service.JOB_CANCELED
+        assert released == [1]
+        assert client.get(f"/scan-jobs/{job_id}/events").text.startswith("event: canceled\n")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_canceling_a_job_refunds_the_quota_day_it_was_reserved_on(monkeypatch):
+    _fresh_notifier(monkeypatch)
+    monkeypatch.setattr(scan_job_service, "record_audit_event", lambda *args, **kwargs: None)
+    session_factory = _session()
+    job_id = _queued_job(session_factory)
+    client = _jobs_client(session_factory)
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+
+    db = session_factory()
+    try:
+        job = db.query(ScanJob).filter(ScanJob.id == job_id).one()
+        job.created_at = datetime(yesterday.year, yesterday.month, yesterday.day, 23, 30).astimezone(timezone.utc)
+        db.add_all(
+            [
+                ScanQuotaCounter(user_id=1, day=yesterday, count=1),
+                ScanQuotaCounter(user_id=1, day=today, count=1),
+            ]
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    assert client.post(f"/scan-jobs/{job_id}/cancel").status_code == 200
+
+    db = session_factory()
+    try:
+        counts = {record.day: record.count for record in db.query(ScanQuotaCounter).all()}
+    finally:
+        db.close()
+    assert counts == {yesterday: 0, today: 1}
+
+
+def test_canceling_a_running_job_stops_its_chunk_loop(monkeypatch):
+    notifier = _fresh_notifier(monkeypatch)
+    released: list[int] = []
+    monkeypatch.setattr(scan_job_service, "release_scan_quota_reservation", lambda _db, user_id, day=None: released.append(user_id))
+    monkeypatch.setattr(scan_job_service, "record_audit_event", lambda *args, **kwargs: None)
+    session_factory = _session()
+    job_id = _queued_job(session_factory)
+    client = _jobs_client(session_factory)
+    chunks_scanned: list[int] = []
+
+    def _chunked_scan(*, cancellation, **kwargs):
+        for chunk in range(100):
+            cancellation.raise_if_canceled()
+            chunks_scanned.append(chunk)
+            if chunk == 2:
+                response = client.post(f"/scan-jobs/{job_id}/cancel")
+                assert response.json()["status"] == scan_job_service.JOB_RUNNING
+        raise AssertionError("scan was not canceled")
+
+    monkeypatch.setattr(scan_job_service, "run_scan_pipeline", _chunked_scan)
+
+    db = session_factory()
+    try:
+        job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+        arguments = scan_job_service.queued_job_arguments(job)
+        arguments["cleanup_source"] = False
+        try:
+            scan_job_service.process_scan_job(**arguments, db_session=db)
+        except scan_job_service.ScanCanceledError:
+            pass
+        else:
+            raise AssertionError("process_scan_job should re-raise the cancellation")
+    finally:
+        db.close()
+
+    assert chunks_scanned == [0, 1, 2]
+    assert released == [1]
+    assert notifier.finished_status(job_id) == scan_job_service.JOB_CANCELED
+    status = client.get(f"/scan-jobs/{job_id}").json()
+    assert status["status"] == scan_job_service.JOB_CANCELED
+    assert status["completed_at"] is not None
+    assert client.post(f"/scan-jobs/{job_id}/cancel").status_code == 409
+
+
+def test_progress_is_persisted_without_committing_the_job_session(monkeypatch):
+    session_factory = _session()
+    job_id = _queued_job(session_factory)
+
+    def _untouchable():
+        raise AssertionError("progress must not commit or roll back the job's session")
+
+    job_db = session_factory()
+    try:
+        job_db.query(ScanJob).filter(ScanJob.id == job_id).one()
+        monkeypatch.setattr(job_db, "commit", _untouchable)
+        monkeypatch.setattr(job_db, "rollback", _untouchable)
+        side_sessions = scan_job_service._side_session_factory(job_db)
+        persist = scan_job_service._persist_progress_callback(side_sessions)
+        cancel_requested = scan_job_service._cancel_requested_callback(side_sessions, job_id)
+
+        persist(job_id, {"phase": "redacting", "rows_processed": 5})
+        persist(job_id, {"phase": "redacting", "rows_processed": 10})
+
+        assert cancel_requested() is False
+    finally:
+        job_db.close()
+
+    db = session_factory()
+    try:
+        stored = db.query(ScanJob).filter(ScanJob.id == job_id).one().progress_json
+    finally:
+        db.close()
+    assert json.loads(stored) == {"phase": "redacting", "rows_processed": 10}
+
+
+def test_long_poll_and_event_stream_do_not_hold_the_request_connection(monkeypatch):
+    _fresh_notifier(monkeypatch)
+    base = _make_local_test_dir()
+    session_factory = _pooled_session(base / "pool.db")
+    job_id = _queued_job(session_factory)
+    _set_status(session_factory, job_id, scan_job_service.JOB_RUNNING)
+    client = _jobs_client(session_factory)
+    monkeypatch.setattr(scan_jobs_router, "PROGRESS_STREAM_TICK_SECONDS", 0.01)
+    monkeypatch.setattr(scan_jobs_router, "PROGRESS_STREAM_DB_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(scan_jobs_router, "PROGRESS_STREAM_MAX_SECONDS", 0.1)
+
+    try:
+        waited = client.get(f"/scan-jobs/{job_id}/wait?timeout=0.1")
+        assert waited.status_code == 200
+        assert waited.json()["status"] == scan_job_service.JOB_RUNNING
+
+        streamed = client.get(f"/scan-jobs/{job_id}/events")
+        assert streamed.text.rstrip().splitlines()[0] == "event: timeout"
+        assert session_factory.kw["bind"].pool.checkedout() == 0
+    finally:
+        session_factory.kw["bind"].dispose()
+        shutil.rmtree(base, ignore_errors=True)
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
 import asyncio
+import bz2
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
 import shutil
 import uuid
+import xml.etree.ElementTree as ET
+import zipfile
 
 import pandas as pd
 import pytest
 from fastapi import BackgroundTasks, HTTPException, Response, UploadFile
 
 from routers import scans as scans_router
-from services import scan_service
+from services import pdf_extraction, redaction_executor, scan_formats, scan_service
+from utils import redaction
 
 
 class _FakeModel:
@@ -92,6 +100,35 @@ def test_chunked_scan_pipeline_rejects_files_over_row_limit():
         shutil.rmtree(base, ignore_errors=True)
 
 
+def test_single_pass_scan_removes_partial_output_when_limit_is_hit_mid_stream(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+
+    try:
+        input_path = base / "late_overflow.csv"
+        _write_csv(input_path, rows=7)
+
+        with pytest.raises(scan_service.ScanLimitError):
+            scan_service.run_scan_pipeline(
+                source_path=str(input_path),
+                filename="late_overflow.csv",
+                context=scan_service.ScanContext(user_id=10),
+                model=_FakeModel(),
+                limits=scan_service.ScanLimits(
+                    max_rows=6,
+                    max_cells=100,
+                    max_columns=5,
+                    chunk_rows=2,
+                    sample_buffer_rows=2,
+                ),
+            )
+
+        assert list((base / "redacted").iterdir()) == []
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
 def test_chunked_scan_pipeline_uses_multiple_chunks_for_large_csv(monkeypatch):
     base = _make_local_test_dir()
     monkeypatch.chdir(base)
@@ -121,12 +158,806 @@ def test_chunked_scan_pipeline_uses_multiple_chunks_for_large_csv(monkeypatch):
         )
 
         assert result.redacted_count == 450
+        assert sum(observed_chunk_sizes) == 450
         assert len(observed_chunk_sizes) > 1
         assert max(observed_chunk_sizes) <= 100
     finally:
         shutil.rmtree(base, ignore_errors=True)
 
 
+def test_chunked_scan_pipeline_streams_xlsx_through_read_only_workbook(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 212)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    monkeypatch.setattr(
+        scan_service,
+        "_parse_to_dataframe",
+        lambda **kwargs: pytest.fail("xlsx uploads should not be materialized as a full DataFrame"),
+    )
+
+    try:
+        input_path = base / "large.xlsx"
+        frame = pd.DataFrame(
+            {
+                "email": [f"user{index}@example.com" for index in range(250)],
+                "notes": ["@SUM(1+1)" if index == 3 else f"note-{index}" for index in range(250)],
+            }
+        )
+        frame.to_excel(input_path, index=False)
+
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename="large.xlsx",
+            context=scan_service.ScanContext(user_id=12),
+            model=_FakeModel(),
+            limits=scan_service.ScanLimits(max_rows=500, max_cells=2000, max_columns=5, chunk_rows=100),
+        )
+
+        redacted_frame = pd.read_excel(result.redacted_file)
+        assert result.pii_columns == ["email"]
+        assert result.redacted_count == 250
+        assert redacted_frame["email"].tolist() == ["[REDACTED_PII_EMAIL]"] * 250
+        assert redacted_frame["notes"].iloc[3] == "'@SUM(1+1)"
+        assert redacted_frame["notes"].iloc[249] == "note-249"
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_chunked_scan_pipeline_streams_xml_records_with_late_columns(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 213)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    monkeypatch.setattr(
+        scan_service,
+        "_parse_to_dataframe",
+        lambda **kwargs: pytest.fail("xml uploads should not be materialized as a full DataFrame"),
+    )
+
+    try:
+        input_path = base / "records.xml"
+        records = "".join(
+            f"<record><email>user{index}@example.com</email><notes>note-{index}</notes></record>" for index in range(5)
+        )
+        records += "<record><email>late@example.com</email><phone>555-0100</phone></record>"
+        input_path.write_text(f"<?xml version='1.0'?><records>{records}</records>", encoding="utf-8")
+
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename="records.xml",
+            context=scan_service.ScanContext(user_id=13),
+            model=_FakeModel(),
+            limits=scan_service.ScanLimits(max_rows=10, max_cells=100, max_columns=5, chunk_rows=2),
+        )
+
+        items = ET.parse(result.redacted_file).getroot().findall("./item")
+        assert result.pii_columns == ["email"]
+        assert result.redacted_count == 6
+        assert len(items) == 6
+        assert [item.findtext("email") for item in items] == ["[REDACTED_PII_EMAIL]"] * 6
+        assert items[5].findtext("phone") == "555-0100"
+        assert items[0].find("phone").attrib["original"] == "phone"
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_xml_stream_rejects_record_count_over_limit_before_writing(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+
+    try:
+        input_path = base / "many.xml"
+        records = "".join(f"<record><email>user{index}@example.com</email></record>" for index in range(6))
+        input_path.write_text(f"<records>{records}</records>", encoding="utf-8")
+
+        with pytest.raises(scan_service.ScanLimitError):
+            scan_service.run_scan_pipeline(
+                source_path=str(input_path),
+                filename="many.xml",
+                context=scan_service.ScanContext(user_id=14),
+                model=_FakeModel(),
+                limits=scan_service.ScanLimits(max_rows=5, max_cells=100, max_columns=5, chunk_rows=2),
+            )
+
+        assert not (base / "redacted").exists() or list((base / "redacted").iterdir()) == []
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+@pytest.mark.parametrize("layout", ["array", "ndjson"])
+def test_chunked_scan_pipeline_streams_json_records_with_normalized_columns(monkeypatch, layout):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 214)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    monkeypatch.setattr(
+        scan_service,
+        "_parse_to_dataframe",
+        lambda **kwargs: pytest.fail("json uploads should not be materialized as a full DataFrame"),
+    )
+
+    try:
+        records = [
+            {"contact": {"email": f"user{index}@example.com"}, "id": index} for index in range(5)
+        ] + [{"contact": {"email": "late@example.com", "phone": "555-0100"}, "id": 5}]
+        input_path = base / "records.json"
+        if layout == "array":
+            input_path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+        else:
+            input_path.write_text("\n".join(json.dumps(record) for record in records) + "\n", encoding="utf-8")
+
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename="records.json",
+            context=scan_service.ScanContext(user_id=15),
+            model=_FakeModel(),
+            limits=scan_service.ScanLimits(max_rows=10, max_cells=100, max_columns=5, chunk_rows=2),
+        )
+
+        with open(result.redacted_file, encoding="utf-8") as handle:
+            payload = json.load(handle)
+        assert list(pd.json_normalize(records).columns) == ["id", "contact.email", "contact.phone"]
+        assert result.pii_columns == ["id"]
+        assert payload["scan_id"] == 214
+        assert len(payload["results"]) == 6
+        assert [row["id"] for row in payload["results"]] == ["[REDACTED_PII_EMAIL]"] * 6
+        assert payload["results"][5]["contact.phone"] == "555-0100"
+        assert payload["results"][0]["contact.email"] == "user0@example.com"
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_streamed_json_output_is_removed_when_persisting_the_scan_fails(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+
+    def _failing_persist(**kwargs):
+        assert os.path.exists(kwargs["public_redacted_path"])
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(scan_service, "_persist_scan_result", _failing_persist)
+
+    try:
+        input_path = base / "records.json"
+        input_path.write_text(json.dumps([{"email": f"user{index}@example.com"} for index in range(3)]), encoding="utf-8")
+
+        with pytest.raises(RuntimeError, match="database unavailable"):
+            scan_service.run_scan_pipeline(
+                source_path=str(input_path),
+                filename="records.json",
+                context=scan_service.ScanContext(user_id=16),
+                model=_FakeModel(),
+                limits=scan_service.ScanLimits(chunk_rows=2),
+            )
+
+        assert list((base / "redacted").iterdir()) == []
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def _write_pdf(path: Path, pages: int) -> None:
+    from reportlab.pdfgen import canvas
+
+    document = canvas.Canvas(str(path))
+    for index in range(pages):
+        document.drawString(72, 720, f"Page {index} contact user{index}@example.com")
+        document.showPage()
+    document.save()
+
+
+def test_pdf_pages_stream_in_order_from_parallel_page_workers(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 215)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    monkeypatch.setattr(scan_service, "SCAN_PDF_PAGES_PER_CHUNK", 3)
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(pdf_extraction, "get_pdf_page_pool", lambda workers: pool)
+
+    try:
+        input_path = base / "contract.pdf"
+        _write_pdf(input_path, pages=10)
+        limits = scan_service.ScanLimits(max_rows=50, max_cells=100, max_columns=5, chunk_rows=100, pdf_page_workers=2)
+
+        chunks = list(scan_service._iter_pdf_chunks(source_path=str(input_path), limits=limits))
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename="contract.pdf",
+            context=scan_service.ScanContext(user_id=16),
+            model=_FakeModel(),
+            limits=limits,
+        )
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+        page_texts = pd.concat(chunks, ignore_index=True)["text"].tolist()
+        assert [text.startswith(f"Page {index} ") for index, text in enumerate(page_texts)] == [True] * 10
+        assert result.pii_columns == ["text"]
+        assert result.redacted_count == 10
+    finally:
+        pool.shutdown(wait=True)
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_pdf_page_limit_is_enforced_before_text_extraction(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(
+        pdf_extraction,
+        "_extract_page_texts",
+        lambda *args, **kwargs: pytest.fail("page text should not be extracted past the page limit"),
+    )
+
+    try:
+        input_path = base / "long.pdf"
+        _write_pdf(input_path, pages=6)
+
+        with pytest.raises(scan_service.ScanLimitError):
+            scan_service.run_scan_pipeline(
+                source_path=str(input_path),
+                filename="long.pdf",
+                context=scan_service.ScanContext(user_id=17),
+                model=_FakeModel(),
+                limits=scan_service.ScanLimits(max_pdf_pages=5),
+            )
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_chunked_scan_pipeline_streams_docx_paragraphs_and_table_cells(monkeypatch):
+    from docx import Document
+
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 216)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    monkeypatch.setattr(
+        scan_service,
+        "_parse_to_dataframe",
+        lambda **kwargs: pytest.fail("docx uploads should not be materialized as a full DataFrame"),
+    )
+
+    try:
+        source = Document()
+        for index in range(5):
+            source.add_paragraph(f"Clause {index} for user{index}@example.com")
+        source.add_paragraph("   ")
+        table = source.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = "Signer"
+        table.cell(0, 1).text = "Ada\tLovelace"
+        input_path = base / "contract.docx"
+        source.save(input_path)
+
+        chunks = list(scan_service._iter_docx_chunks(source_path=str(input_path), chunk_rows=3))
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename="contract.docx",
+            context=scan_service.ScanContext(user_id=18),
+            model=_FakeModel(),
+            limits=scan_service.ScanLimits(max_rows=20, max_cells=20, max_columns=5, chunk_rows=3),
+        )
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert pd.concat(chunks)["text"].tolist()[-2:] == ["Signer", "Ada\tLovelace"]
+        paragraphs = [paragraph.text for paragraph in Document(result.redacted_file).paragraphs]
+        assert result.redacted_count == 7
+        assert paragraphs == ["[REDACTED_PII_EMAIL]"] * 7
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_scan_format_registry_covers_supported_extensions_and_sniffs_content():
+    from utils.constants import SUPPORTED_EXTENSIONS
+
+    assert SUPPORTED_EXTENSIONS <= scan_formats.registered_scan_extensions()
+    streaming = {ext for ext in SUPPORTED_EXTENSIONS if scan_formats.get_scan_format(ext).streaming}
+    assert streaming == {
+        ".csv", ".tsv", ".txt", ".log", ".xlsx", ".xml", ".json", ".pdf", ".docx", ".parquet", ".arrow", ".feather"
+    }
+    assert scan_formats.get_scan_format(".pdf").estimate_cost(1024 * 1024) > scan_formats.get_scan_format(
+        ".csv"
+    ).estimate_cost(1024 * 1024)
+    assert scan_formats.resolve_scan_format(ext=".JSON", sample_bytes=b'  [{"a": 1}]', source_path="") is not None
+    assert scan_formats.resolve_scan_format(ext=".json", sample_bytes=b"<xml/>", source_path="") is None
+    assert scan_formats.resolve_scan_format(ext=".exe", sample_bytes=b"MZ", source_path="") is None
+
+
+def test_registered_format_streams_through_pipeline_without_pipeline_changes(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 217)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    monkeypatch.setattr(scan_formats, "_formats_by_extension", dict(scan_formats._formats_by_extension))
+
+    def _iter_pipe_chunks(source_path, limits):
+        yield from pd.read_csv(source_path, sep="|", chunksize=limits.chunk_rows)
+
+    scan_formats.register_scan_format(
+        scan_formats.ScanFormat(
+            name="psv",
+            extensions=(".psv",),
+            sniff=scan_formats.sniff_text,
+            parse=lambda source_bytes, limits: pd.read_csv(BytesIO(source_bytes), sep="|"),
+            iter_chunks=_iter_pipe_chunks,
+            open_sink=lambda redacted_path, source_path=None: scan_service._delimited_chunk_sink(redacted_path, ".csv"),
+        )
+    )
+
+    try:
+        input_path = base / "sample.psv"
+        input_path.write_text("email|notes\nada@example.com|one\nbob@example.com|two\n", encoding="utf-8")
+
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename="sample.psv",
+            context=scan_service.ScanContext(user_id=19),
+            model=_FakeModel(),
+            limits=scan_service.ScanLimits(chunk_rows=1),
+        )
+
+        assert result.redacted_count == 2
+        assert pd.read_csv(result.redacted_file)["notes"].tolist() == ["one", "two"]
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+class _FlagAllModel:
+    def predict(self, frame):
+        return [0] * len(frame)
+
+
+@pytest.mark.parametrize("filename", ["accounts.parquet", "accounts.feather"])
+def test_columnar_scan_redacts_only_string_columns_and_preserves_schema(monkeypatch, filename):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 218)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    monkeypatch.setattr(
+        scan_service,
+        "_parse_to_dataframe",
+        lambda **kwargs: pytest.fail("columnar uploads should not be materialized as a full DataFrame"),
+    )
+
+    try:
+        table = pa.table(
+            {
+                "account_id": pa.array(range(5), type=pa.int64()),
+                "email": [f"user{index}@example.com" for index in range(5)],
+                "balance": pa.array([1.5, None, 3.0, 4.25, 5.0], type=pa.float64()),
+            }
+        )
+        input_path = base / filename
+        if filename.endswith(".parquet"):
+            pq.write_table(table, input_path, row_group_size=2)
+        else:
+            feather.write_feather(table, input_path, chunksize=2)
+
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename=filename,
+            context=scan_service.ScanContext(user_id=20),
+            model=_FlagAllModel(),
+            limits=scan_service.ScanLimits(chunk_rows=2),
+        )
+
+        output = pq.read_table(result.redacted_file) if filename.endswith(".parquet") else feather.read_table(
+            result.redacted_file
+        )
+        assert result.pii_columns == ["email"]
+        assert result.redacted_count == 5
+        assert output.schema.equals(table.schema)
+        assert output.column("account_id").equals(table.column("account_id"))
+        assert output.column("balance").equals(table.column("balance"))
+        assert output.column("email").to_pylist() == ["[REDACTED_PII_EMAIL]"] * 5
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_in_memory_columnar_scan_also_redacts_only_string_columns(monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 219)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+
+    try:
+        table = pa.table(
+            {
+                "account_id": pa.array(range(5), type=pa.int64()),
+                "email": [f"user{index}@example.com" for index in range(5)],
+            }
+        )
+        buffer = BytesIO()
+        pq.write_table(table, buffer)
+
+        result = scan_service.run_scan_pipeline(
+            file_bytes=buffer.getvalue(),
+            filename="accounts.parquet",
+            context=scan_service.ScanContext(user_id=21),
+            model=_FlagAllModel(),
+        )
+
+        output = pq.read_table(result.redacted_file)
+        assert result.pii_columns == ["email"]
+        assert [entry["column"] for entry in result.detection_results] == ["email"]
+        assert output.column("account_id").to_pylist() == list(range(5))
+        assert output.column("email").to_pylist() == ["[REDACTED_PII_EMAIL]"] * 5
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".zst"])
+def test_compressed_csv_streams_through_pipeline_and_writes_compressed_output(monkeypatch, suffix):
+    from services import compressed_input
+
+    if suffix == ".zst":
+        zstandard = pytest.importorskip("zstandard")
+        compress = zstandard.ZstdCompressor().compress
+    else:
+        compress = {".gz": gzip.compress, ".bz2": bz2.compress}[suffix]
+
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 219)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    monkeypatch.setattr(
+        scan_service,
+        "_parse_to_dataframe",
+        lambda **kwargs: pytest.fail("compressed uploads should be decompressed as a stream"),
+    )
+
+    try:
+        plain_path = base / "plain.csv"
+        _write_csv(plain_path, rows=25)
+        input_path = base / f"upload{suffix}"
+        input_path.write_bytes(compress(plain_path.read_bytes()))
+
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename=f"export.csv{suffix}",
+            context=scan_service.ScanContext(user_id=21),
+            model=_FakeModel(),
+            limits=scan_service.ScanLimits(chunk_rows=10),
+            compress_output=True,
+        )
+
+        assert result.redacted_file.endswith(f".csv{suffix}")
+        with compressed_input.open_scan_source(result.redacted_file) as handle:
+            output = pd.read_csv(handle)
+        assert result.redacted_count == 25
+        assert output["email"].tolist() == ["[REDACTED_PII_EMAIL]"] * 25
+        assert output["notes"].tolist() == [f"note-{index}" for index in range(25)]
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_single_entry_zip_json_uses_the_entry_format(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 220)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+
+    try:
+        input_path = base / "upload.zip"
+        with zipfile.ZipFile(input_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("records.json", json.dumps([{"email": "ada@example.com"}, {"email": "bob@example.com"}]))
+
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename="export.zip",
+            context=scan_service.ScanContext(user_id=22),
+            model=_FakeModel(),
+        )
+
+        with open(result.redacted_file, encoding="utf-8") as handle:
+            payload = json.load(handle)
+        assert result.redacted_file.endswith(".json")
+        assert payload == {"results": [{"email": "[REDACTED_PII_EMAIL]"}] * 2, "scan_id": 220}
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_compressed_stream_guards_reject_bombs_and_multi_entry_archives(monkeypatch):
+    from services import compressed_input
+
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 221)
+
+    try:
+        bomb_path = base / "bomb.gz"
+        bomb_path.write_bytes(gzip.compress(b"text\n" + b"A" * 200_000))
+        with pytest.raises(ValueError, match="safe processing limits"):
+            with compressed_input.open_decompressed(str(bomb_path), compressed_input.GZIP) as handle:
+                handle.read()
+
+        multi_path = base / "multi.zip"
+        with zipfile.ZipFile(multi_path, "w") as archive:
+            archive.writestr("a.csv", "email\nada@example.com\n")
+            archive.writestr("b.csv", "email\nbob@example.com\n")
+        with pytest.raises(ValueError, match="exactly one file"):
+            scan_service.run_scan_pipeline(
+                source_path=str(multi_path),
+                filename="export.zip",
+                context=scan_service.ScanContext(user_id=23),
+                model=_FakeModel(),
+            )
+
+        pdf_path = base / "report.gz"
+        pdf_path.write_bytes(gzip.compress(b"%PDF-1.4"))
+        with pytest.raises(ValueError, match="not supported"):
+            scan_service.run_scan_pipeline(
+                source_path=str(pdf_path),
+                filename="report.pdf.gz",
+                context=scan_service.ScanContext(user_id=24),
+                model=_FakeModel(),
+            )
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_probe_reads_a_bounded_sample_and_estimates_rows_without_redacting(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(
+        scan_service,
+        "scan_and_redact_column_with_details",
+        lambda *args, **kwargs: pytest.fail("probing should not redact"),
+    )
+    read_chunks = []
+    original_iter = scan_service._iter_csv_like_chunks
+
+    def _counting_iter(**kwargs):
+        for chunk in original_iter(**kwargs):
+            read_chunks.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(scan_service, "_iter_csv_like_chunks", _counting_iter)
+
+    try:
+        csv_path = base / "wide.csv"
+        _write_csv(csv_path, rows=5000)
+        log_path = base / "app.log"
+        log_path.write_text("".join(f"user{index}@example.com\n" for index in range(120)), encoding="utf-8")
+        limits = scan_service.ScanLimits(max_rows=1000, chunk_rows=100, sample_buffer_rows=200)
+
+        csv_probe = scan_service.probe_scan_source(
+            source_path=str(csv_path), filename="wide.csv", model=_FakeModel(), limits=limits
+        )
+        log_probe = scan_service.probe_scan_source(
+            source_path=str(log_path), filename="app.log", model=_FakeModel(), limits=limits
+        )
+
+        assert read_chunks == [100, 100]
+        assert csv_probe.columns == ["email", "notes"]
+        assert csv_probe.pii_columns == ["email"]
+        assert csv_probe.row_count_exact is False
+        assert 4000 <= csv_probe.estimated_rows <= 6500
+        assert csv_probe.within_limits is False
+        assert csv_probe.estimated_scan_seconds > 0
+        assert (log_probe.estimated_rows, log_probe.row_count_exact, log_probe.within_limits) == (120, True, True)
+        assert not (base / "redacted").exists() or not any((base / "redacted").iterdir())
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_parallel_redaction_preserves_chunk_order_and_merges_counts(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 303)
+    monkeypatch.setattr(redaction, "scan_and_redact_column_with_details", _fake_redactor)
+    pool = ThreadPoolExecutor(max_workers=3)
+    submitted_columns = []
+    original_submit = pool.submit
+
+    def _recording_submit(fn, *args):
+        submitted_columns.append(args[0].columns.tolist())
+        return original_submit(fn, *args)
+
+    monkeypatch.setattr(pool, "submit", _recording_submit)
+    monkeypatch.setattr(redaction_executor, "get_redaction_pool", lambda workers: pool)
+
+    try:
+        input_path = base / "parallel.csv"
+        _write_csv(input_path, rows=250)
+
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename="parallel.csv",
+            context=scan_service.ScanContext(user_id=13),
+            model=_FakeModel(),
+            limits=scan_service.ScanLimits(
+                max_rows=500,
+                max_cells=2000,
+                max_columns=5,
+                chunk_rows=100,
+                redaction_workers=3,
+            ),
+        )
+
+        redacted_frame = pd.read_csv(result.redacted_file)
+
+        assert submitted_columns == [["email"]] * 3
+        assert result.redacted_count == 250
+        assert result.total_values == 250
+        assert result.redacted_type_counts == {"PII_EMAIL": 250}
+        assert redacted_frame["email"].tolist() == ["[REDACTED_PII_EMAIL]"] * 250
+        assert redacted_frame["notes"].tolist() == [f"note-{index}" for index in range(250)]
+    finally:
+        pool.shutdown(wait=True)
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_indexed_log_scan_hands_byte_ranges_to_workers_in_offset_order(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 304)
+
+    def _upper_redactor(series, column_name="", aggressive=False):
+        return series.str.upper(), len(series), len(series), 1.0, {"PII_EMAIL": len(series)}
+
+    monkeypatch.setattr(redaction, "scan_and_redact_column_with_details", _upper_redactor)
+    pool = ThreadPoolExecutor(max_workers=3)
+    submitted = []
+    original_submit = pool.submit
+
+    def _recording_submit(fn, *args):
+        submitted.append((fn.__name__, args[:3]))
+        return original_submit(fn, *args)
+
+    monkeypatch.setattr(pool, "submit", _recording_submit)
+    monkeypatch.setattr(redaction_executor, "get_redaction_pool", lambda workers: pool)
+
+    try:
+        lines = [f"user{index}@example.com caf\u00e9" for index in range(23)]
+        input_path = base / "app.log"
+        input_path.write_bytes(("\r\n".join(lines[:10]) + "\n" + "\n".join(lines[10:])).encode("utf-8"))
+
+        chunks = list(scan_service._iter_text_chunks(source_path=str(input_path), chunk_rows=5))
+        result = scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename="app.log",
+            context=scan_service.ScanContext(user_id=25),
+            model=_FakeModel(),
+            limits=scan_service.ScanLimits(chunk_rows=5, redaction_workers=3),
+        )
+
+        assert [len(chunk) for chunk in chunks] == [5, 5, 5, 5, 3]
+        assert chunks[-1].attrs["source_byte_range"][2] == input_path.stat().st_size
+        assert {name for name, _ in submitted} == {"_redact_text_range_task"}
+        assert [args[1] for _, args in submitted] == [chunk.attrs["source_byte_range"][1] for chunk in chunks]
+        assert result.redacted_count == 23
+        assert pd.read_csv(result.redacted_file)["text"].tolist() == [line.upper() for line in lines]
+    finally:
+        pool.shutdown(wait=True)
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_text_line_limit_is_enforced_from_the_index_before_decoding(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(
+        scan_service,
+        "iter_line_ranges",
+        lambda *args, **kwargs: pytest.fail("lines should not be decoded past the row limit"),
+    )
+
+    try:
+        input_path = base / "big.txt"
+        input_path.write_text("line\n" * 12, encoding="utf-8")
+
+        with pytest.raises(scan_service.ScanLimitError):
+            scan_service.run_scan_pipeline(
+                source_path=str(input_path),
+                filename="big.txt",
+                context=scan_service.ScanContext(user_id=26),
+                model=_FakeModel(),
+                limits=scan_service.ScanLimits(max_rows=10),
+            )
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_parallel_frame_redaction_reassembles_column_blocks_in_order(monkeypatch):
+    monkeypatch.setattr(redaction, "scan_and_redact_column_with_details", _fake_redactor)
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(redaction_executor, "get_redaction_pool", lambda workers: pool)
+    frame = pd.DataFrame(
+        {
+            "email": [f"user{index}@example.com" for index in range(5)],
+            "contact": [f"alt{index}@example.com" for index in range(5)],
+            "notes": [f"note-{index}" for index in range(5)],
+        }
+    )
+
+    try:
+        redacted_df, total_redacted, total_values, type_counts = scan_service._apply_redactions(
+            frame,
+            ["email", "contact"],
+            False,
+            workers=2,
+            block_rows=2,
+        )
+    finally:
+        pool.shutdown(wait=True)
+
+    assert total_redacted == 10
+    assert total_values == 10
+    assert type_counts == {"PII_EMAIL": 10}
+    assert redacted_df.index.tolist() == list(range(5))
+    assert redacted_df["email"].tolist() == ["[REDACTED_PII_EMAIL]"] * 5
+    assert redacted_df["notes"].tolist() == frame["notes"].tolist()
+
+
+def test_probe_extrapolates_compressed_uploads_from_the_decompressed_size(monkeypatch):
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+
+    try:
+        csv_path = base / "wide.csv"
+        _write_csv(csv_path, rows=50000)
+        gz_path = base / "wide.csv.gz"
+        gz_path.write_bytes(gzip.compress(csv_path.read_bytes()))
+        limits = scan_service.ScanLimits(max_rows=100000, chunk_rows=100, sample_buffer_rows=200)
+
+        payload_bytes, payload_exact = scan_service.estimate_payload_bytes(str(gz_path))
+        probe = scan_service.probe_scan_source(
+            source_path=str(gz_path), filename="wide.csv.gz", model=_FakeModel(), limits=limits
+        )
+        plain_probe = scan_service.probe_scan_source(
+            source_path=str(csv_path), filename="wide.csv", model=_FakeModel(), limits=limits
+        )
+
+        assert payload_exact is False
+        assert abs(payload_bytes - csv_path.stat().st_size) < csv_path.stat().st_size * 0.2
+        assert probe.size_bytes == gz_path.stat().st_size
+        assert probe.row_count_exact is False
+        assert 40000 <= probe.estimated_rows <= 65000
+        assert abs(probe.estimated_scan_seconds - plain_probe.estimated_scan_seconds) <= (
+            plain_probe.estimated_scan_seconds * 0.2
+        )
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_spawned_redaction_workers_report_cache_and_tier_counts_to_the_scan():
+    frame = pd.DataFrame({"email": ["ada@example.com", "bob@example.com"] * 4})
+    redaction.reset_redaction_tier_counts()
+
+    try:
+        with redaction.redaction_cache_scope(redaction.RedactionCache()) as cache:
+            redacted_df, total_redacted, total_values, type_counts = redaction_executor.redact_frame_in_parallel(
+                frame,
+                ["email"],
+                False,
+                workers=2,
+                block_rows=2,
+            )
+    finally:
+        redaction_executor.shutdown_redaction_pools()
+
+    cache_stats = cache.stats()
+    tier_counts = redaction.get_redaction_tier_counts()
+
+    assert redacted_df["email"].tolist() == ["[REDACTED_PII_EMAIL]"] * 8
+    assert (total_redacted, total_values, type_counts) == (8, 8, {"PII_EMAIL": 8})
+    assert cache_stats["hits"] + cache_stats["misses"] == 8
+    assert cache_stats["hits"] > 0
+    assert tier_counts == {
+        "skipped": 0,
+        "cached": cache_stats["hits"],
+        "deterministic": cache_stats["misses"],
+        "nlp": 0,
+    }
+
+
 def test_predict_returns_payload_too_large_for_scan_limit(monkeypatch):
     base = _make_local_test_dir()
     monkeypatch.chdir(base)
@@ -184,3 +1015,108 @@ def test_predict_returns_payload_too_large_for_scan_limit(monkeypatch):
         assert exc.value.detail["error_code"] == "file_too_large"
     finally:
         shutil.rmtree(base, ignore_errors=True)
+
+
+@pytest.mark.parametrize("filename", ["progress.csv", "progress.txt"])
+def test_pipeline_reports_rows_chunks_and_source_bytes_to_progress_reporter(monkeypatch, filename):
+    from services.scan_progress import STAGE_DONE, STAGE_REDACTING, ScanProgressReporter
+
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: 220)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    published: list[dict] = []
+    persisted: list[dict] = []
+    indexed_paths: list[str] = []
+    original_build_line_index = scan_service.build_line_index
+
+    def _counting_build_line_index(source_path, **kwargs):
+        indexed_paths.append(source_path)
+        return original_build_line_index(source_path, **kwargs)
+
+    monkeypatch.setattr(scan_service, "build_line_index", _counting_build_line_index)
+
+    try:
+        input_path = base / filename
+        if filename.endswith(".csv"):
+            _write_csv(input_path, rows=450)
+        else:
+            input_path.write_text("".join(f"contact user{index}@example.com\n" for index in range(450)), encoding="utf-8")
+        reporter = ScanProgressReporter(
+            7,
+            publish=lambda _job_id, snapshot: published.append(snapshot),
+            persist=lambda _job_id, snapshot: persisted.append(snapshot),
+            min_interval=0.0,
+            persist_interval=3600.0,
+        )
+
+        scan_service.run_scan_pipeline(
+            source_path=str(input_path),
+            filename=filename,
+            context=scan_service.ScanContext(user_id=11),
+            model=_FlagAllModel(),
+            limits=scan_service.ScanLimits(max_rows=500, max_cells=2000, max_columns=5, chunk_rows=100, sample_buffer_rows=100),
+            progress=reporter,
+        )
+        reporter.finish()
+
+        redacting = [snapshot for snapshot in published if snapshot["stage"] == STAGE_REDACTING]
+        assert [snapshot["rows_processed"] for snapshot in redacting[1:]] == [100, 200, 300, 400, 450]
+        assert [snapshot["percent"] for snapshot in published] == sorted(snapshot["percent"] for snapshot in published)
+        assert redacting[-1]["chunks_done"] == 5
+        size_bytes = input_path.stat().st_size
+        if filename.endswith(".txt"):
+            # Indexed text chunks report the exact end of their source byte range.
+            assert 0 < redacting[1]["bytes_processed"] < size_bytes
+            assert redacting[-1]["bytes_processed"] == size_bytes
+            assert redacting[0]["estimated_total_rows"] == 450
+            # The row estimate reuses the index the scan already built.
+            assert indexed_paths == [str(input_path)]
+        else:
+            # Other formats project bytes from rows read against the sampled row-width estimate.
+            assert abs(redacting[-1]["bytes_processed"] - size_bytes) < size_bytes * 0.15
+        assert published[-1]["bytes_processed"] == size_bytes
+        assert published[-1]["stage"] == STAGE_DONE
+        assert published[-1]["percent"] == 100
+        # Throttled persistence only writes stage changes within the persist interval.
+        assert len(persisted) < len(published)
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_canceled_scan_stops_between_chunks_and_removes_partial_output(monkeypatch):
+    from services.scan_cancellation import ScanCanceledError, ScanCancellationToken
+
+    base = _make_local_test_dir()
+    monkeypatch.chdir(base)
+    persisted: list[dict] = []
+    monkeypatch.setattr(scan_service, "_persist_scan_result", lambda **kwargs: persisted.append(kwargs) or 230)
+    monkeypatch.setattr(scan_service, "scan_and_redact_column_with_details", _fake_redactor)
+    checks: list[int] = []
+
+    def _cancel_after_three_checks() -> bool:
+        checks.append(1)
+        return len(checks) > 3
+
+    try:
+        input_path = base / "cancel_me.csv"
+        _write_csv(input_path, rows=1000)
+        token = ScanCancellationToken(check_requested=_cancel_after_three_checks, poll_interval=0.0)
+
+        with pytest.raises(ScanCanceledError):
+            scan_service.run_scan_pipeline(
+                source_path=str(input_path),
+                filename="cancel_me.csv",
+                context=scan_service.ScanContext(user_id=12),
+                model=_FakeModel(),
+                limits=scan_service.ScanLimits(max_rows=2000, max_cells=5000, max_columns=5, chunk_rows=100, sample_buffer_rows=100),
+                cancellation=token,
+            )
+
+        assert token.canceled
+        # Stopped a few chunks in rather than after reading all ten.
+        assert len(checks) == 4
+        assert persisted == []
+        assert list((base / "redacted").iterdir()) == []
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
@@ -1,5 +1,10 @@
+import importlib.util
+
+COLUMNAR_EXTENSIONS = {".parquet", ".arrow", ".feather"}
+# Columnar scans need the optional pyarrow package; without it those uploads are not accepted at all.
+COLUMNAR_SUPPORT_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
 SUPPORTED_EXTENSIONS = {
     ".csv", ".tsv", ".txt", ".log", ".json", ".xml", ".docx", ".pdf", ".html",
     ".xls", ".xlsx"
-}
+} | (COLUMNAR_EXTENSIONS if COLUMNAR_SUPPORT_AVAILABLE else set())
 SUPPORTED_EXTENSIONS_SORTED = sorted(SUPPORTED_EXTENSIONS)
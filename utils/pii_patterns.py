@@ -0,0 +1,6 @@
+import re
+
+EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+PHONE_RE = re.compile(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+SSN_RE = re.compile(r"\d{3}-\d{2}-\d{4}")
+IP_RE = re.compile(r"(?:\d{1,3}\.){3}\d{1,3}")
@@ -10,6 +10,8 @@ PLAN_CONFIG = {
         "audit_visibility": False,
         "company_settings": False,
         "advanced_reporting": False,
+        "scan_priority_weight": 1,
+        "max_concurrent_scans": 1,
     },
     "pro": {
         "scan_limit_per_day": 100,
@@ -19,6 +21,8 @@ PLAN_CONFIG = {
         "audit_visibility": True,
         "company_settings": True,
         "advanced_reporting": True,
+        "scan_priority_weight": 4,
+        "max_concurrent_scans": 2,
     },
     "business": {
         "scan_limit_per_day": 500,
@@ -28,6 +32,8 @@ PLAN_CONFIG = {
         "audit_visibility": True,
         "company_settings": True,
         "advanced_reporting": True,
+        "scan_priority_weight": 8,
+        "max_concurrent_scans": 4,
     },
 }
 
@@ -1,6 +1,17 @@
+import logging
+import os
 import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterator
+from uuid import uuid4
+
 import pandas as pd
-from presidio_analyzer import AnalyzerEngine
+from presidio_analyzer import AnalyzerEngine, BatchAnalyzerEngine, RecognizerResult
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import OperatorConfig
 from utils.pii_taxonomy import (
@@ -12,11 +23,18 @@ from utils.pii_taxonomy import (
     get_display_name,
     map_presidio_entity_to_taxonomy,
 )
+from utils.pii_patterns import EMAIL_RE, IP_RE, PHONE_RE, SSN_RE
 from utils.youth_redaction import is_dob_column, calculate_age, get_age_based_redaction_labels
+
+logger = logging.getLogger(__name__)
+
 # Initialize Presidio engines
 analyzer = AnalyzerEngine()
+batch_analyzer = BatchAnalyzerEngine(analyzer_engine=analyzer)
 anonymizer  = AnonymizerEngine()
 
+ANALYZER_BATCH_SIZE = max(1, int(os.getenv("REDACTION_ANALYZER_BATCH_SIZE", "256")))
+
 HEALTH_TERMS = {
     "cancer", "diabetes", "depression", "anxiety", "hiv", "autism", "asthma",
     "covid", "bipolar", "schizophrenia", "hypertension", "ptsd", "adhd"
@@ -30,6 +48,164 @@ VETERAN_TERMS = {
 PHONE_7_RE = re.compile(r"\b\d{3}-\d{4}\b")
 PHONE_HINT_RE = re.compile(R"\b(phone|tel|telephone|mobile|cell|call)\b", re.I)
 
+# Tiered detection: cells that are provably clean skip analysis, cells that are a single
+# structured identifier are resolved by deterministic recognizers, and only the remaining
+# free text goes through the Presidio/spaCy NER tier.
+TIER_SKIPPED = "skipped"
+TIER_DETERMINISTIC = "deterministic"
+TIER_NLP = "nlp"
+TIER_CACHED = "cached"
+REDACTION_TIERS = (TIER_SKIPPED, TIER_CACHED, TIER_DETERMINISTIC, TIER_NLP)
+
+CLEAN_BOOLEAN_VALUES = {"true", "false", "yes", "no"}
+CLEAN_NUMERIC_RE = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)")
+# Presidio's shortest digit-only recognizers (driver license, bank number) need six digits.
+MAX_CLEAN_NUMERIC_DIGITS = 5
+STRUCTURED_RECOGNIZERS = (
+    ("EMAIL_ADDRESS", EMAIL_RE),
+    ("US_SSN", SSN_RE),
+    ("IP_ADDRESS", IP_RE),
+    ("PHONE_NUMBER", PHONE_RE),
+)
+
+_tier_counts_lock = threading.Lock()
+_tier_counts: dict[str, int] = {tier: 0 for tier in REDACTION_TIERS}
+
+# Bump whenever a rule above changes so memoized redactions from an older policy are not reused.
+REDACTION_POLICY_VERSION = 2
+REDACTION_CACHE_MAX_ENTRIES = max(0, int(os.getenv("REDACTION_CACHE_MAX_ENTRIES", "50000")))
+REDACTION_CACHE_SHARED = os.getenv("REDACTION_CACHE_SHARED", "false").strip().lower() == "true"
+
+
+@dataclass(frozen=True)
+class CellRedaction:
+    value: str
+    redacted_count: int
+    taxonomy_codes: tuple[str, ...]
+
+
+@dataclass
+class RedactionStats:
+    """Cache and tier counters gathered inside a worker so the scanning process can merge them."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    tier_counts: dict[str, int] = field(default_factory=lambda: {tier: 0 for tier in REDACTION_TIERS})
+
+
+# Set inside pool workers: counters land here instead of on the worker's cache and process globals,
+# which the scanning process never sees.
+_active_redaction_stats: ContextVar[RedactionStats | None] = ContextVar("active_redaction_stats", default=None)
+
+
+class RedactionCache:
+    """Bounded LRU of per-cell redaction outcomes keyed on value, column, mode and policy version."""
+
+    def __init__(self, max_entries: int = REDACTION_CACHE_MAX_ENTRIES):
+        self.max_entries = max(0, int(max_entries))
+        # Pool workers keep their own cache per scan, keyed on this id.
+        self.cache_id = uuid4().hex
+        self._entries: OrderedDict[tuple, CellRedaction] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> CellRedaction | None:
+        with self._lock:
+            outcome = self._entries.get(key)
+            stats = _active_redaction_stats.get() or self
+            if outcome is None:
+                stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            stats.hits += 1
+            return outcome
+
+    def put(self, key: tuple, outcome: CellRedaction) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = outcome
+            self._entries.move_to_end(key)
+            stats = _active_redaction_stats.get() or self
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def merge_stats(self, stats: RedactionStats) -> None:
+        with self._lock:
+            self.hits += stats.hits
+            self.misses += stats.misses
+            self.evictions += stats.evictions
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+shared_redaction_cache = RedactionCache()
+_active_redaction_cache: ContextVar[RedactionCache | None] = ContextVar("active_redaction_cache", default=None)
+
+
+@contextmanager
+def redaction_cache_scope(cache: RedactionCache | None = None) -> Iterator[RedactionCache]:
+    """Memoize cell redactions for the duration of one scan (or across scans when shared caching is on)."""
+    active_cache = cache or (shared_redaction_cache if REDACTION_CACHE_SHARED else RedactionCache())
+    token = _active_redaction_cache.set(active_cache)
+    try:
+        yield active_cache
+    finally:
+        _active_redaction_cache.reset(token)
+
+
+@contextmanager
+def redaction_stats_scope(cache: RedactionCache) -> Iterator[RedactionStats]:
+    """Redact against ``cache`` while collecting its counters and tier counts for the caller to merge."""
+    stats = RedactionStats()
+    stats_token = _active_redaction_stats.set(stats)
+    cache_token = _active_redaction_cache.set(cache)
+    try:
+        yield stats
+    finally:
+        _active_redaction_cache.reset(cache_token)
+        _active_redaction_stats.reset(stats_token)
+
+
+def merge_redaction_stats(stats: RedactionStats, cache: RedactionCache) -> None:
+    cache.merge_stats(stats)
+    with _tier_counts_lock:
+        for tier, count in stats.tier_counts.items():
+            _tier_counts[tier] += count
+
+
+def current_redaction_cache() -> RedactionCache:
+    active_cache = _active_redaction_cache.get()
+    if active_cache is not None:
+        return active_cache
+    return shared_redaction_cache if REDACTION_CACHE_SHARED else RedactionCache()
+
+
+def _cache_key(val_str: str, column_name: str, aggressive: bool) -> tuple:
+    # Youth-policy labels depend on the current age, so DOB outcomes are only reusable for one day.
+    day_marker = date.today().toordinal() if is_dob_column(column_name or "") else None
+    return (val_str, column_name, bool(aggressive), REDACTION_POLICY_VERSION, day_marker)
+
+
 def contains_sensitive_term(value: str, terms: set) -> str:
     lower = value.lower()
     for term in terms:
@@ -42,75 +218,207 @@ def _normalize_entity_label(entity_type: str | None) -> str:
     return get_display_name(map_presidio_entity_to_taxonomy(entity_type))
 
 
+def _is_missing(value) -> bool:
+    return bool(pd.isna(value))
+
+
+def _is_provably_clean(val_str: str) -> bool:
+    stripped = val_str.strip()
+    if not stripped:
+        return True
+    if stripped.lower() in CLEAN_BOOLEAN_VALUES:
+        return True
+    if CLEAN_NUMERIC_RE.fullmatch(stripped):
+        return sum(character.isdigit() for character in stripped) <= MAX_CLEAN_NUMERIC_DIGITS
+    return False
+
+
+def _is_phone_column(column_name: str) -> bool:
+    col_l = (column_name or "").lower()
+    return ("phone" in col_l) or ("tel" in col_l)
+
+
+def _is_valid_structured_match(entity_type: str, value: str, column_name: str) -> bool:
+    if entity_type == "EMAIL_ADDRESS":
+        return not any(character.isspace() for character in value)
+    if entity_type == "IP_ADDRESS":
+        return all(int(octet) <= 255 for octet in value.split("."))
+    if entity_type == "PHONE_NUMBER":
+        # A bare run of ten digits is as likely an account or order number; without phone
+        # punctuation or a phone column it is left to the NLP tier.
+        return not value.isdigit() or _is_phone_column(column_name)
+    return True
+
+
+def _match_structured_value(val_str: str, column_name: str = "") -> list[RecognizerResult] | None:
+    stripped = val_str.strip()
+    start = len(val_str) - len(val_str.lstrip())
+    for entity_type, pattern in STRUCTURED_RECOGNIZERS:
+        if pattern.fullmatch(stripped) and _is_valid_structured_match(entity_type, stripped, column_name):
+            return [RecognizerResult(entity_type=entity_type, start=start, end=start + len(stripped), score=1.0)]
+    return None
+
+
+def _record_tier_counts(column_name: str, tier_counts: dict[str, int]) -> None:
+    stats = _active_redaction_stats.get()
+    if stats is not None:
+        for tier, count in tier_counts.items():
+            stats.tier_counts[tier] += count
+    else:
+        with _tier_counts_lock:
+            for tier, count in tier_counts.items():
+                _tier_counts[tier] += count
+    logger.debug(
+        "Column redaction tiers column=%s skipped=%s cached=%s deterministic=%s nlp=%s",
+        column_name,
+        tier_counts[TIER_SKIPPED],
+        tier_counts[TIER_CACHED],
+        tier_counts[TIER_DETERMINISTIC],
+        tier_counts[TIER_NLP],
+    )
+
+
+def get_redaction_tier_counts() -> dict[str, int]:
+    with _tier_counts_lock:
+        return dict(_tier_counts)
+
+
+def reset_redaction_tier_counts() -> None:
+    with _tier_counts_lock:
+        for tier in REDACTION_TIERS:
+            _tier_counts[tier] = 0
+
+
+def _analyze_texts(texts: list[str]) -> list[list[RecognizerResult]]:
+    if not texts:
+        return []
+    # One spaCy `nlp.pipe` pass over the whole batch instead of one pipeline run per cell.
+    return batch_analyzer.analyze_iterator(texts, language="en", batch_size=ANALYZER_BATCH_SIZE)
+
+
+def _redact_analyzed_value(
+    val_str: str,
+    results: list[RecognizerResult],
+    column_name: str,
+    aggressive: bool,
+) -> CellRedaction:
+    redacted_count = 0
+    taxonomy_codes: list[str] = []
+
+    if results:
+        redacted_count += 1
+        seen_taxonomy_codes = {map_presidio_entity_to_taxonomy(result.entity_type) for result in results}
+        primary_taxonomy = sorted(seen_taxonomy_codes)[0]
+        taxonomy_codes.extend(seen_taxonomy_codes)
+        operator_map = {
+            result.entity_type: OperatorConfig(
+                "replace",
+                {"new_value": build_redaction_placeholder(map_presidio_entity_to_taxonomy(result.entity_type))},
+            )
+            for result in results
+            if result.entity_type
+        }
+        if not operator_map:
+            operator_map = {
+                "DEFAULT": OperatorConfig("replace", {"new_value": build_redaction_placeholder(primary_taxonomy)})
+            }
+        val_str = anonymizer.anonymize(text=val_str, analyzer_results=results, operators=operator_map).text
+
+    # Custom redactions
+    if contains_sensitive_term(val_str, HEALTH_TERMS):
+        return CellRedaction(
+            value=build_redaction_placeholder(SENSITIVE_HEALTH_TERM),
+            redacted_count=redacted_count + 1,
+            taxonomy_codes=(*taxonomy_codes, SENSITIVE_HEALTH_TERM),
+        )
+
+    if contains_sensitive_term(val_str, VETERAN_TERMS):
+        return CellRedaction(
+            value=build_redaction_placeholder(SENSITIVE_VETERAN_STATUS),
+            redacted_count=redacted_count + 1,
+            taxonomy_codes=(*taxonomy_codes, SENSITIVE_VETERAN_STATUS),
+        )
+
+    if PHONE_7_RE.search(val_str):
+        has_hint_in_text = bool(PHONE_HINT_RE.search(val_str))
+        has_hint_in_col = _is_phone_column(column_name)
+
+        if aggressive or has_hint_in_text or has_hint_in_col:
+            val_str = PHONE_7_RE.sub(build_redaction_placeholder(PII_PHONE), val_str)
+            redacted_count += 1
+            taxonomy_codes.append(PII_PHONE)
+
+    # DOB / youth policy logic
+    if is_dob_column(column_name):
+        age = calculate_age(val_str)
+        if age is not None:
+            labels = get_age_based_redaction_labels(age)
+            if labels:
+                return CellRedaction(
+                    value=build_redaction_placeholder(PII_DATE_OF_BIRTH, labels[0].replace("REDACTED_", "")),
+                    redacted_count=redacted_count + 1,
+                    taxonomy_codes=(*taxonomy_codes, PII_DATE_OF_BIRTH),
+                )
+    return CellRedaction(value=val_str, redacted_count=redacted_count, taxonomy_codes=tuple(taxonomy_codes))
+
+
 def scan_and_redact_column_with_details(series: pd.Series, column_name: str = "", aggressive: bool =False):
     redacted_count = 0
     total_values = len(series)
     type_counts: dict[str, int] = {}
+    tier_counts = {tier: 0 for tier in REDACTION_TIERS}
 
-    def add_type_count(label: str) -> None:
-        type_counts[label] = type_counts.get(label, 0) + 1
-
-    def redact_value(val: str) -> str:
+    def apply_outcome(position: int, outcome: CellRedaction) -> None:
         nonlocal redacted_count
-        if pd.isna(val):
-            return val
-        val_str = str(val)
-        
-        results = analyzer.analyze(text=val_str, language='en')
-        if results:
-            redacted_count += 1
-            seen_taxonomy_codes = {map_presidio_entity_to_taxonomy(result.entity_type) for result in results}
-            primary_taxonomy = sorted(seen_taxonomy_codes)[0]
-            for taxonomy_code in seen_taxonomy_codes:
-                add_type_count(taxonomy_code)
-            operator_map = {
-                result.entity_type: OperatorConfig(
-                    "replace",
-                    {"new_value": build_redaction_placeholder(map_presidio_entity_to_taxonomy(result.entity_type))},
-                )
-                for result in results
-                if result.entity_type
-            }
-            if not operator_map:
-                operator_map = {
-                    "DEFAULT": OperatorConfig("replace", {"new_value": build_redaction_placeholder(primary_taxonomy)})
-                }
-            val_str = anonymizer.anonymize(text=val_str, analyzer_results=results, operators=operator_map).text
-
-        # Custom redactions
-        if contains_sensitive_term(val_str, HEALTH_TERMS):
-            redacted_count += 1
-            add_type_count(SENSITIVE_HEALTH_TERM)
-            return build_redaction_placeholder(SENSITIVE_HEALTH_TERM)
+        values[position] = outcome.value
+        redacted_count += outcome.redacted_count
+        for taxonomy_code in outcome.taxonomy_codes:
+            type_counts[taxonomy_code] = type_counts.get(taxonomy_code, 0) + 1
 
-        if contains_sensitive_term(val_str, VETERAN_TERMS):
-            redacted_count += 1
-            add_type_count(SENSITIVE_VETERAN_STATUS)
-            return build_redaction_placeholder(SENSITIVE_VETERAN_STATUS)
-        
-        
-        if PHONE_7_RE.search(val_str):
-            has_hint_in_text = bool(PHONE_HINT_RE.search(val_str))
-            col_l = (column_name or "").lower()
-            has_hint_in_col = ("phone" in col_l) or ("tel" in col_l)
-
-            if aggressive or has_hint_in_text or has_hint_in_col:
-                val_str = PHONE_7_RE.sub(build_redaction_placeholder(PII_PHONE), val_str)
-                redacted_count += 1
-                add_type_count(PII_PHONE)
-        
-        # DOB / youth policy logic
-        if is_dob_column(column_name):
-            age = calculate_age(val_str)
-            if age is not None:
-                labels = get_age_based_redaction_labels(age)
-                if labels:
-                    redacted_count += 1
-                    add_type_count(PII_DATE_OF_BIRTH)
-                    return build_redaction_placeholder(PII_DATE_OF_BIRTH, labels[0].replace("REDACTED_", ""))
-        return val_str
-    
-    redacted_series = series.apply(redact_value)
+    cache = current_redaction_cache()
+    values = series.tolist()
+    present_positions: list[int] = []
+    nlp_pending: dict[str, list[int]] = {}
+    for position, value in enumerate(values):
+        if _is_missing(value):
+            continue
+        present_positions.append(position)
+        val_str = str(value)
+        if _is_provably_clean(val_str):
+            tier_counts[TIER_SKIPPED] += 1
+            values[position] = val_str
+            continue
+        if val_str in nlp_pending:
+            tier_counts[TIER_CACHED] += 1
+            nlp_pending[val_str].append(position)
+            continue
+        cache_key = _cache_key(val_str, column_name, aggressive)
+        cached_outcome = cache.get(cache_key)
+        if cached_outcome is not None:
+            tier_counts[TIER_CACHED] += 1
+            apply_outcome(position, cached_outcome)
+            continue
+        structured_results = _match_structured_value(val_str, column_name)
+        if structured_results is not None:
+            tier_counts[TIER_DETERMINISTIC] += 1
+            outcome = _redact_analyzed_value(val_str, structured_results, column_name, aggressive)
+            cache.put(cache_key, outcome)
+            apply_outcome(position, outcome)
+            continue
+        tier_counts[TIER_NLP] += 1
+        nlp_pending[val_str] = [position]
+
+    nlp_texts = list(nlp_pending)
+    for val_str, results in zip(nlp_texts, _analyze_texts(nlp_texts)):
+        outcome = _redact_analyzed_value(val_str, results, column_name, aggressive)
+        cache.put(_cache_key(val_str, column_name, aggressive), outcome)
+        for position in nlp_pending[val_str]:
+            apply_outcome(position, outcome)
+
+    _record_tier_counts(column_name, tier_counts)
+    redacted_series = (
+        pd.Series(values, index=series.index, name=series.name) if present_positions else series.copy()
+    )
     risk_score = redacted_count / total_values if total_values > 0 else 0.0
     return redacted_series, redacted_count, total_values, round(risk_score,2), type_counts
 
@@ -72,10 +72,10 @@ def reserve_scan_quota(db: Session, user_id: int | str, tier: str) -> bool:
         return False
 
 
-def release_scan_quota_reservation(db: Session, user_id: int | str) -> None:
-    today = date.today()
+def release_scan_quota_reservation(db: Session, user_id: int | str, day: date | None = None) -> None:
+    # ``day`` is the date the scan was reserved on; a release that happens later must not refund today.
     try:
-        record = _get_or_create_counter(db, int(user_id), today)
+        record = _get_or_create_counter(db, int(user_id), day or date.today())
         if record.count > 0:
             record.count -= 1
             db.add(record)